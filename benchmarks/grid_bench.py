@@ -0,0 +1,141 @@
+"""Benchmark de la détection de victoire par taille de plateau (``engine.grid``).
+
+Joue ``--games`` parties aléatoires par variante (Puissance 4, Puissance N
+plus grands, Gomoku 15×15 et 19×19) et, après chaque coup, vérifie si le
+joueur qui vient de jouer a gagné avec trois méthodes :
+
+- ``boucles`` : parcours de toutes les cases et des quatre directions en
+  Python, comme les anciennes boucles ``range(4)`` du plateau 6×7 ;
+- ``bitboard`` : ``has_alignment``, tout le plateau par décalages d'entiers ;
+- ``dernier coup`` : ``GridBoard.wins_at``, comptage depuis la pièce posée.
+
+Les trois doivent donner le même résultat à chaque coup (le script échoue
+sinon). Affiche le coût moyen d'une vérification (µs) et d'une partie
+complète (coups + vérifications incrémentales).
+
+Usage :
+    python -m benchmarks.grid_bench [--games 50] [--seed 7]
+"""
+
+import sys
+import time
+import random
+import argparse
+
+from engine.grid import CONNECT_FOUR, GOMOKU, GridBoard, GridSpec, has_alignment
+
+VARIANTS: list[GridSpec] = [
+    CONNECT_FOUR,
+    GridSpec("Puissance 5", 8, 9, 5),
+    GridSpec("Puissance 5", 10, 10, 5),
+    GOMOKU,
+    GridSpec("Gomoku", 19, 19, 5, gravity=False),
+]
+
+
+def naive_has_won(board: GridBoard, player: int) -> bool:
+    """Référence : boucles imbriquées sur les cases (ligne 0 = haut)."""
+    spec = board.spec
+    n = spec.connect
+    for row in range(spec.rows):
+        for col in range(spec.cols):
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_row, end_col = row + dr * (n - 1), col + dc * (n - 1)
+                if not (0 <= end_row < spec.rows and 0 <= end_col < spec.cols):
+                    continue
+                if all(board.cell(row + dr * k, col + dc * k) == player for k in range(n)):
+                    return True
+    return False
+
+
+def random_log(spec: GridSpec, rng: random.Random) -> list[int]:
+    """Coups d'une partie aléatoire (indices de colonne, ou de case sans gravité)."""
+    board = GridBoard(spec)
+    if spec.gravity:
+        candidates = list(range(spec.cols))
+    else:
+        candidates = list(range(spec.size))
+        rng.shuffle(candidates)
+    log: list[int] = []
+    player = 0
+    while candidates:
+        move = rng.choice(candidates) if spec.gravity else candidates.pop()
+        board.apply(move, player)
+        log.append(move)
+        if spec.gravity and board.is_column_full(move):
+            candidates.remove(move)
+        if board.last_move_wins():
+            break
+        player ^= 1
+    return log
+
+
+def replay_checks(spec: GridSpec, log: list[int]) -> list[tuple[GridBoard, int, int]]:
+    """Positions après chaque coup : (plateau, joueur qui vient de jouer, bit posé)."""
+    positions = []
+    board = GridBoard(spec)
+    for ply, move in enumerate(log):
+        player = ply % 2
+        board.apply(move, player)
+        snapshot = GridBoard.from_bitboards(board.bitboards, spec)
+        positions.append((snapshot, player, board.last))
+    return positions
+
+
+def time_per_call(fn, positions) -> float:
+    start = time.perf_counter()
+    for args in positions:
+        fn(*args)
+    return (time.perf_counter() - start) / len(positions) * 1e6
+
+
+def bench_variant(spec: GridSpec, games: int, rng: random.Random) -> dict[str, float]:
+    logs = [random_log(spec, rng) for _ in range(games)]
+    positions = [p for log in logs for p in replay_checks(spec, log)]
+
+    for board, player, bit in positions:
+        expected = naive_has_won(board, player)
+        if has_alignment(board.bitboards[player], spec) != expected or board.wins_at(bit, player) != expected:
+            raise AssertionError(f"{spec.name} {spec.rows}×{spec.cols} : détections divergentes")
+
+    result = {
+        "plies": len(positions) / games,
+        "boucles": time_per_call(lambda b, p, _: naive_has_won(b, p), positions),
+        "bitboard": time_per_call(lambda b, p, _: has_alignment(b.bitboards[p], spec), positions),
+        "dernier coup": time_per_call(lambda b, p, bit: b.wins_at(bit, p), positions),
+    }
+
+    start = time.perf_counter()
+    for log in logs:
+        board = GridBoard(spec)
+        for ply, move in enumerate(log):
+            board.apply(move, ply % 2)
+            board.last_move_wins()
+    result["partie"] = (time.perf_counter() - start) / games * 1e6
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=50, help="parties aléatoires par variante")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{args.games} parties aléatoires par variante ; µs par vérification de victoire\n")
+    print(f"{'variante':<24}{'coups':>7}{'boucles':>10}{'bitboard':>10}{'dernier coup':>14}{'partie (µs)':>13}")
+    for spec in VARIANTS:
+        try:
+            result = bench_variant(spec, args.games, rng)
+        except AssertionError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        label = f"{spec.name} {spec.rows}×{spec.cols} ({spec.connect})"
+        print(
+            f"{label:<24}{result['plies']:>7.1f}{result['boucles']:>10.1f}{result['bitboard']:>10.2f}"
+            f"{result['dernier coup']:>14.2f}{result['partie']:>13.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
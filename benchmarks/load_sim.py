@@ -0,0 +1,682 @@
+"""Simulateur de charge de bout en bout, sans connexion à Discord.
+
+Charge les vrais cogs (``extensions.EXTENSIONS``) dans un ``commands.Bot`` dont
+la couche HTTP (API bot et webhooks d'interaction) et la passerelle sont
+remplacées par un faux Discord en mémoire. Ce faux serveur injecte une latence
+configurable et des réponses 429, puis des milliers d'interactions synthétiques
+sont envoyées : parties de ``/puissance4`` jouées jusqu'au bout (entre deux
+membres ou contre BotRonron), sélections ``/menu`` et appels ``/status``.
+
+Les plafonds de parties (``P4_MAX_*``) restent ceux par défaut : les joueurs
+sont tirés pour qu'aucun ne dépasse ``per_player`` parties simultanées, et
+les parties contre BotRonron vérifient que le bot n'est compté contre aucun
+plafond.
+
+MongoDB est remplacé par des collections en mémoire à latence configurable,
+pour que la simulation n'attende pas un serveur injoignable.
+
+Usage :
+    python -m benchmarks.load_sim --games 200 --menus 500 --status 200 --latency 80 --rate-limit 0.02
+
+Rapport : latence d'acquittement p50/p99/max par type d'interaction (le délai
+Discord est de 3 s), retard de la boucle d'événements et mémoire par partie.
+"""
+
+import os
+import re
+import gc
+import time
+import random
+import asyncio
+import logging
+import argparse
+import itertools
+from collections import defaultdict
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Optional
+
+import discord
+from discord.ext import commands
+from discord.webhook.async_ import AsyncWebhookAdapter, async_context
+
+import db
+import metrics
+from extensions import EXTENSIONS
+
+ACK_DEADLINE = 3.0
+APP_ID = 900_000_000_000_000_001
+BOT_ID = APP_ID
+TURN_RE = re.compile(r"Tour de <@(\d+)>")
+
+# =========================================
+# Utilitaires
+# =========================================
+
+_ids = itertools.count(1)
+
+
+def snowflake() -> int:
+    """Snowflake unique, dérivé de l'horloge comme ceux de Discord."""
+    return discord.utils.time_snowflake(datetime.now(timezone.utc)) + next(_ids) % 4096
+
+
+def rss_bytes() -> int:
+    """Mémoire résidente du processus (Linux), 0 si indisponible."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def user_payload(user_id: int, bot: bool = False) -> dict:
+    return {
+        "id": str(user_id),
+        "username": f"user{user_id % 100000}",
+        "discriminator": "0",
+        "global_name": None,
+        "avatar": None,
+        "bot": bot,
+    }
+
+
+def member_payload(user_id: int, bot: bool = False) -> dict:
+    return {
+        "user": user_payload(user_id, bot),
+        "roles": [],
+        "joined_at": datetime.now(timezone.utc).isoformat(),
+        "deaf": False,
+        "mute": False,
+        "flags": 0,
+        "permissions": "2147483647",
+    }
+
+
+# =========================================
+# Faux MongoDB
+# =========================================
+
+class FakeCursor:
+    def __init__(self, collection: "FakeCollection"):
+        self.collection = collection
+
+    def sort(self, *args, **kwargs) -> "FakeCursor":
+        return self
+
+    def limit(self, *args) -> "FakeCursor":
+        return self
+
+    def batch_size(self, *args) -> "FakeCursor":
+        return self
+
+    async def to_list(self, length: Optional[int] = None) -> list[dict]:
+        await self.collection.wait()
+        return []
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        raise StopAsyncIteration
+
+
+class FakeCollection:
+    """Collection en mémoire : chaque opération coûte ``latency`` secondes."""
+
+    def __init__(self, latency: float, name: str = "fake"):
+        self.latency = latency
+        self.name = name
+        self.operations = 0
+
+    async def wait(self) -> None:
+        self.operations += 1
+        await asyncio.sleep(self.latency)
+
+    def find(self, *args, **kwargs) -> FakeCursor:
+        return FakeCursor(self)
+
+    def __getattr__(self, name: str):
+        async def operation(*args, **kwargs):
+            await self.wait()
+            if name.startswith("find"):
+                return None
+            # Résultat d'écriture minimal (UpdateResult, InsertOneResult, BulkWriteResult…)
+            return SimpleNamespace(
+                acknowledged=True, matched_count=1, modified_count=1, deleted_count=1,
+                upserted_id=None, inserted_id=None, inserted_ids=[],
+            )
+        return operation
+
+
+class FakeDatabase(FakeCollection):
+    def __getitem__(self, name: str) -> FakeCollection:
+        return FakeCollection(self.latency, name)
+
+
+def install_fake_mongo(latency: float) -> None:
+    """Remplace les collections de ``db`` avant l'import des cogs."""
+    db.db = db.mongo.database = FakeDatabase(latency)  # type: ignore[assignment]
+    for name in dir(db):
+        if name.endswith("_collection"):
+            setattr(db, name, FakeCollection(latency, name.removesuffix("_collection")))
+    db.user_writes.collection = db.users_collection
+
+
+# =========================================
+# Faux Discord (HTTP + webhooks)
+# =========================================
+
+class FakeDiscord:
+    """Serveur Discord simulé : messages en mémoire, latence et 429 injectés."""
+
+    def __init__(self, latency: float, jitter: float, rate_limit: float, retry_after: float, seed: int):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+
+        self.messages: dict[int, dict] = {}
+        self.original: dict[str, int] = {}  # token → message d'origine
+        self.sent_at: dict[int, tuple[str, float]] = {}  # interaction → (type, envoi)
+        # token → (salon, serveur, message du composant cliqué)
+        self.interaction_context: dict[str, tuple[int, Optional[int], Optional[int]]] = {}
+        self.acks: dict[str, list[float]] = defaultdict(list)
+        self.requests = 0
+        self.rate_limited = 0
+
+    async def network(self) -> None:
+        """Latence réseau, plus l'attente d'un éventuel 429 (réessayé comme discord.py)."""
+        self.requests += 1
+        while self.rate_limit and self.rng.random() < self.rate_limit:
+            self.rate_limited += 1
+            await asyncio.sleep(self.latency + self.retry_after)
+        await asyncio.sleep(max(0.0, self.rng.gauss(self.latency, self.jitter)))
+
+    def message_payload(self, message_id: int, channel_id: int, guild_id: Optional[int], data: dict) -> dict:
+        return {
+            "id": str(message_id),
+            "channel_id": str(channel_id),
+            "guild_id": str(guild_id) if guild_id else None,
+            "type": 0,
+            "content": data.get("content") or "",
+            "author": user_payload(BOT_ID, bot=True),
+            "attachments": [],
+            "embeds": data.get("embeds") or [],
+            "mentions": [],
+            "mention_roles": [],
+            "mention_everyone": False,
+            "pinned": False,
+            "tts": False,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "edited_timestamp": None,
+            "flags": data.get("flags") or 0,
+            "components": data.get("components") or [],
+        }
+
+    def create_message(self, channel_id: int, guild_id: Optional[int], data: dict) -> dict:
+        message_id = snowflake()
+        payload = self.message_payload(message_id, channel_id, guild_id, data)
+        self.messages[message_id] = payload
+        return payload
+
+    def update_message(self, message_id: int, data: dict) -> dict:
+        payload = self.messages[message_id]
+        for key in ("content", "embeds", "components", "flags"):
+            if key in data:
+                payload[key] = data[key] if data[key] is not None else ([] if key != "content" else "")
+        payload["edited_timestamp"] = datetime.now(timezone.utc).isoformat()
+        return payload
+
+    # === Interactions ===
+
+    def record_ack(self, interaction_id: int) -> None:
+        sent = self.sent_at.pop(interaction_id, None)
+        if sent is not None:
+            kind, t0 = sent
+            self.acks[kind].append(time.perf_counter() - t0)
+
+    async def interaction_callback(self, interaction_id: int, token: str, payload: dict) -> dict:
+        await self.network()
+        self.record_ack(interaction_id)
+
+        response_type = payload["type"]
+        data = payload.get("data") or {}
+        channel_id, guild_id, message_id = self.interaction_context[token]
+        message = None
+        if response_type in (4, 5):
+            message = self.create_message(channel_id, guild_id, data)
+            self.original[token] = int(message["id"])
+        elif response_type == 7 and message_id:
+            message = self.update_message(message_id, data)
+
+        result: dict[str, Any] = {
+            "interaction": {
+                "id": str(interaction_id),
+                "type": response_type,
+                "response_message_id": message["id"] if message else None,
+                "response_message_loading": response_type == 5,
+                "response_message_ephemeral": bool(data.get("flags", 0) & 64),
+            },
+        }
+        if message is not None:
+            result["resource"] = {"type": response_type, "message": message}
+        return result
+
+    async def webhook_request(self, route, payload: Optional[dict]) -> Any:
+        token = route.webhook_token
+        channel_id, guild_id, _ = self.interaction_context[token]
+        await self.network()
+        if route.method == "POST":  # followup
+            return self.create_message(channel_id, guild_id, payload or {})
+        if route.path.endswith("@original"):
+            message_id = self.original.get(token)
+            if message_id is None:
+                message_id = int(self.create_message(channel_id, guild_id, {})["id"])
+                self.original[token] = message_id
+        else:
+            message_id = int(route.url.rsplit("/", 1)[-1])
+        if route.method == "PATCH":
+            return self.update_message(message_id, payload or {})
+        return self.messages[message_id]
+
+    async def http_request(self, route, **kwargs) -> Any:
+        """Remplace ``HTTPClient.request`` du bot."""
+        await self.network()
+        message_id = int(route.url.rsplit("/", 1)[-1])
+        if route.method == "PATCH" and "/messages/" in route.path:
+            return self.update_message(message_id, kwargs.get("json") or {})
+        if route.method == "GET" and "/messages/" in route.path:
+            return self.messages[message_id]
+        raise discord.NotFound(FakeResponse(404), "route non simulée")
+
+class FakeResponse:
+    def __init__(self, status: int):
+        self.status = status
+        self.reason = "simulated"
+
+
+class FakeWebhookAdapter(AsyncWebhookAdapter):
+    """Adaptateur de webhooks branché sur le faux Discord."""
+
+    def __init__(self, discord_server: FakeDiscord):
+        super().__init__()
+        self.server = discord_server
+
+    async def request(self, route, session, *, payload=None, multipart=None, files=None, **kwargs):
+        if route.path.endswith("/callback"):
+            return await self.server.interaction_callback(route.webhook_id, route.webhook_token, payload or {})
+        return await self.server.webhook_request(route, payload)
+
+
+class FakeGateway:
+    """Remplace la websocket : seule ``latency`` est lue par les cogs."""
+
+    open = False
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+
+# =========================================
+# Bot et clients synthétiques
+# =========================================
+
+class Simulation:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.server = FakeDiscord(
+            args.latency / 1000, args.jitter / 1000, args.rate_limit, args.retry_after, args.seed
+        )
+        self.rng = random.Random(args.seed)
+        self.guild_ids = [snowflake() for _ in range(args.guilds)]
+        self.users = [snowflake() for _ in range(max(2, args.users))]
+        self.loop_lag: list[float] = []
+        self.errors = 0
+        self.claimed: set[str] = set()  # invitations (ou parties contre BotRonron) déjà prises par un scénario
+        self.booked: defaultdict[int, int] = defaultdict(int)  # parties prévues par joueur
+        self.peak_games = 0
+        self.peak_rss = 0
+
+    async def setup(self) -> commands.Bot:
+        install_fake_mongo(self.args.db_latency / 1000)
+        async_context.set(FakeWebhookAdapter(self.server))
+
+        intents = discord.Intents.default()
+        intents.members = True
+        bot = commands.Bot(command_prefix="!", intents=intents, tree_cls=metrics.InstrumentedTree)
+        await bot._async_setup_hook()
+        metrics.install(bot)
+
+        state = bot._connection
+        state.user = discord.ClientUser(state=state, data=user_payload(BOT_ID, bot=True))  # type: ignore[arg-type]
+        state.application_id = APP_ID
+        bot.http.request = self.server.http_request  # type: ignore[method-assign]
+        bot.ws = FakeGateway(self.args.latency / 1000)  # type: ignore[assignment]
+
+        for guild_id in self.guild_ids:
+            guild = state._get_or_create_unavailable_guild(guild_id)
+            for user_id in self.users:
+                guild._add_member(discord.Member(data=member_payload(user_id), guild=guild, state=state))  # type: ignore[arg-type]
+            # guild.me : BotRonron, second joueur des parties contre le bot
+            guild._add_member(discord.Member(data=member_payload(BOT_ID, bot=True), guild=guild, state=state))  # type: ignore[arg-type]
+
+        for ext in EXTENSIONS:
+            await bot.load_extension(ext)
+        return bot
+
+    # === Envoi d'interactions ===
+
+    def interaction_payload(self, kind: str, user_id: int, guild_id: int, channel_id: int, data: dict,
+                            message: Optional[dict] = None) -> dict:
+        interaction_id = snowflake()
+        token = f"token-{interaction_id}"
+        self.server.interaction_context[token] = (
+            channel_id, guild_id, int(message["id"]) if message else None
+        )
+        payload = {
+            "id": str(interaction_id),
+            "application_id": str(APP_ID),
+            "type": 2 if kind.startswith("/") else 3,
+            "token": token,
+            "version": 1,
+            "guild_id": str(guild_id),
+            "channel_id": str(channel_id),
+            "channel": {
+                "id": str(channel_id), "type": 0, "guild_id": str(guild_id), "name": "général",
+                "position": 0, "permission_overwrites": [], "nsfw": False, "parent_id": None,
+            },
+            "member": member_payload(user_id),
+            "app_permissions": "2147483647",
+            "locale": "fr",
+            "guild_locale": "fr",
+            "attachment_size_limit": 8 * 1024 * 1024,
+            "entitlements": [],
+            "authorizing_integration_owners": {},
+            "data": data,
+        }
+        if message is not None:
+            payload["message"] = message
+        return payload
+
+    async def send(self, bot: commands.Bot, kind: str, payload: dict) -> None:
+        """Simule la passerelle : l'événement arrive après la latence réseau."""
+        self.server.sent_at[int(payload["id"])] = (kind, time.perf_counter())
+        await asyncio.sleep(self.args.latency / 1000)
+        bot._connection.parse_interaction_create(payload)  # type: ignore[arg-type]
+
+    async def command(self, bot: commands.Bot, name: str, user_id: int, guild_id: int, channel_id: int,
+                      options: Optional[list] = None, resolved: Optional[dict] = None) -> None:
+        data: dict[str, Any] = {"id": str(snowflake()), "name": name, "type": 1, "options": options or []}
+        if resolved:
+            data["resolved"] = resolved
+        await self.send(bot, f"/{name}", self.interaction_payload(f"/{name}", user_id, guild_id, channel_id, data))
+
+    async def click(self, bot: commands.Bot, kind: str, user_id: int, guild_id: int, message: dict,
+                    custom_id: str, component_type: int = 2, values: Optional[list] = None) -> None:
+        data: dict[str, Any] = {"custom_id": custom_id, "component_type": component_type}
+        if values is not None:
+            data["values"] = values
+        channel_id = int(message["channel_id"])
+        await self.send(bot, kind, self.interaction_payload(kind, user_id, guild_id, channel_id, data, message))
+
+    async def wait_for_message(self, predicate, timeout: float = 10.0) -> Optional[dict]:
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            for message in reversed(list(self.server.messages.values())):
+                if predicate(message):
+                    return message
+            await asyncio.sleep(0.05)
+        return None
+
+    @staticmethod
+    def components(message: dict) -> list[dict]:
+        return [c for row in message.get("components", []) for c in row.get("components", [])]
+
+    # === Scénarios ===
+
+    async def play_game(self, bot: commands.Bot, p1: int, p2: int) -> None:
+        """Une partie complète dans son propre salon (un seau de limite par salon)."""
+        guild_id, channel_id = self.rng.choice(self.guild_ids), snowflake()
+        resolved = {
+            "users": {str(p2): user_payload(p2)},
+            "members": {str(p2): {k: v for k, v in member_payload(p2).items() if k != "user"}},
+        }
+        marker = f"<@{p1}>"
+        await self.command(bot, "puissance4", p1, guild_id, channel_id, options=[
+            {"name": "jouer", "type": 1, "options": [{"name": "adversaire", "type": 6, "value": str(p2)}]},
+        ], resolved=resolved)
+
+        invite = await self.wait_for_message(
+            lambda m: m["id"] not in self.claimed and m["content"] == f"<@{p2}>" and any(
+                marker in (e.get("description") or "") for e in m["embeds"]
+            ) and any(":confirm" in c.get("custom_id", "") for c in self.components(m))
+        )
+        if invite is None:
+            self.fail(f"invitation introuvable ({p1} → {p2})")
+            return
+        self.claimed.add(invite["id"])
+        confirm = next(c["custom_id"] for c in self.components(invite) if ":confirm" in c.get("custom_id", ""))
+        await asyncio.sleep(self.args.think)
+        await self.click(bot, "p4:confirmer", p2, guild_id, invite, confirm)
+
+        await self.play_out(bot, int(invite["id"]), guild_id, p1)
+
+    async def play_bot_game(self, bot: commands.Bot, player: int) -> None:
+        """Une partie contre BotRonron (niveau facile), sans invitation."""
+        guild_id, channel_id = self.rng.choice(self.guild_ids), snowflake()
+        marker = f"<@{player}>"
+        await self.command(bot, "puissance4", player, guild_id, channel_id, options=[
+            {"name": "jouer", "type": 1, "options": [{"name": "difficulte", "type": 3, "value": "facile"}]},
+        ])
+
+        message = await self.wait_for_message(
+            lambda m: m["id"] not in self.claimed and any(
+                "Facile" in (e.get("title") or "") and marker in (e.get("description") or "") for e in m["embeds"]
+            ) and any(":col:" in c.get("custom_id", "") for c in self.components(m))
+        )
+        if message is None:
+            self.fail(f"partie contre BotRonron introuvable ({player})")
+            return
+        self.claimed.add(message["id"])
+        await self.play_out(bot, int(message["id"]), guild_id, player)
+
+    async def play_out(self, bot: commands.Bot, message_id: int, guild_id: int, p1: int) -> None:
+        """Joue la partie affichée par ``message_id`` jusqu'à la fin, puis l'arrête (``p1``)."""
+        last_seen, last_click = None, 0.0
+        deadline = time.perf_counter() + self.args.game_timeout
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(self.args.think)
+            message = self.server.messages[message_id]
+            custom_ids = [c.get("custom_id", "") for c in self.components(message)]
+            stop = next((cid for cid in custom_ids if ":stop" in cid), None)
+            if stop:
+                await self.click(bot, "p4:arrêter", p1, guild_id, message, stop)
+                return
+            description = message["embeds"][0].get("description", "") if message["embeds"] else ""
+            turn = TURN_RE.search(description)
+            columns = [
+                c["custom_id"] for c in self.components(message)
+                if ":col:" in c.get("custom_id", "") and not c.get("disabled")
+            ]
+            # Les joueurs attendent que le plateau affiché change avant de rejouer
+            # (ou réessaient si leur clic semble perdu)
+            if not turn or not columns:
+                continue
+            if description == last_seen and time.perf_counter() - last_click < self.args.retry_click:
+                continue
+            last_seen, last_click = description, time.perf_counter()
+            await self.click(bot, "p4:colonne", int(turn.group(1)), guild_id, message, self.rng.choice(columns))
+        status = (self.server.messages[message_id]["embeds"] or [{}])[0].get("description", "")[-300:], [c.get("custom_id") for c in self.components(self.server.messages[message_id])]
+        self.fail(f"partie {message_id} non terminée après {self.args.game_timeout:.0f} s : {status}")
+
+    async def use_menu(self, bot: commands.Bot, user_id: int) -> None:
+        guild_id = self.rng.choice(self.guild_ids)
+        before = set(self.server.messages)
+        await self.command(bot, "menu", user_id, guild_id, snowflake())
+        message = await self.wait_for_message(
+            lambda m: int(m["id"]) not in before and any(c.get("type") == 3 for c in self.components(m))
+        )
+        if message is None:
+            self.fail(f"menu introuvable pour {user_id}")
+            return
+        select = next(c for c in self.components(message) if c.get("type") == 3)
+        await asyncio.sleep(self.args.think)
+        await self.click(bot, "menu:sélection", user_id, guild_id, message, select["custom_id"],
+                         component_type=3, values=[self.rng.choice(select["options"])["value"]])
+
+    async def call_status(self, bot: commands.Bot, user_id: int) -> None:
+        await self.command(bot, "status", user_id, self.rng.choice(self.guild_ids), snowflake())
+
+    def fail(self, reason: str) -> None:
+        self.errors += 1
+        logging.warning(f"⚠️ Scénario en échec : {reason}")
+
+    async def monitor(self) -> None:
+        """Mesure le retard de la boucle et la mémoire au pic de parties."""
+        from commands.puissance4 import store
+
+        interval = 0.05
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            self.loop_lag.append(time.perf_counter() - start - interval)
+            active = len(store.games)
+            if active >= self.peak_games:
+                self.peak_games = active
+                self.peak_rss = max(self.peak_rss, rss_bytes())
+
+    # === Tirage des joueurs ===
+
+    def pairs(self, count: int) -> list[tuple[int, int]]:
+        """Adversaires des parties, sans défi en double ni joueur au-delà de ``per_player``."""
+        seen: set[frozenset[int]] = set()
+        result = []
+        while len(result) < count:
+            p1, p2 = self.rng.sample(self.users, 2)
+            if frozenset((p1, p2)) in seen or not self.book(p1) or not self.book(p2, undo=p1):
+                continue
+            seen.add(frozenset((p1, p2)))
+            result.append((p1, p2))
+        return result
+
+    def bot_players(self, count: int) -> list[int]:
+        """Joueurs des parties contre BotRonron (plus que ``per_player`` : le bot n'est pas plafonné)."""
+        result = []
+        while len(result) < count:
+            player = self.rng.choice(self.users)
+            if self.book(player):
+                result.append(player)
+        return result
+
+    def book(self, player: int, undo: Optional[int] = None) -> bool:
+        """Compte une partie de plus pour ``player`` si son plafond le permet (sinon rend celle de ``undo``)."""
+        from commands.puissance4 import store
+
+        cap = store.limits.per_player
+        if cap and self.booked[player] >= cap:
+            if undo is not None:
+                self.booked[undo] -= 1
+            return False
+        self.booked[player] += 1
+        return True
+
+    async def run(self) -> None:
+        bot = await self.setup()
+        gc.collect()
+        rss_before = rss_bytes()
+        monitor = asyncio.create_task(self.monitor())
+
+        from commands.puissance4 import store
+
+        cap = store.limits.per_player
+        if cap and 2 * self.args.games + self.args.bot_games > cap * len(self.users):
+            raise SystemExit(f"❌ Trop de parties pour {len(self.users)} joueurs à {cap} partie(s) chacun (P4_MAX_PER_PLAYER).")
+        jobs = []
+        for p1, p2 in self.pairs(self.args.games):
+            jobs.append(self.play_game(bot, p1, p2))
+        jobs += [self.play_bot_game(bot, player) for player in self.bot_players(self.args.bot_games)]
+        jobs += [self.use_menu(bot, self.rng.choice(self.users)) for _ in range(self.args.menus)]
+        jobs += [self.call_status(bot, self.rng.choice(self.users)) for _ in range(self.args.status)]
+        self.rng.shuffle(jobs)
+
+        async def delayed(job, delay: float):
+            await asyncio.sleep(delay)
+            try:
+                await job
+            except Exception:
+                self.errors += 1
+                logging.exception("Erreur dans un scénario")
+
+        start = time.perf_counter()
+        await asyncio.gather(*(delayed(job, self.rng.uniform(0, self.args.ramp)) for job in jobs))
+        await asyncio.sleep(1.0)  # laisse partir les dernières éditions
+        elapsed = time.perf_counter() - start
+        monitor.cancel()
+
+        self.report(elapsed, rss_before)
+        await bot.close()
+
+    def report(self, elapsed: float, rss_before: int) -> None:
+        from render_scheduler import scheduler
+
+        print(f"\nDurée : {elapsed:.1f} s | requêtes HTTP simulées : {self.server.requests} "
+              f"| 429 injectés : {self.server.rate_limited} | erreurs de scénario : {self.errors}")
+        print(f"\n{'interaction':<18}{'n':>8}{'p50 (ms)':>11}{'p99 (ms)':>11}{'max (ms)':>11}{'> 3 s':>8}")
+        for kind, values in sorted(self.server.acks.items()):
+            late = sum(v > ACK_DEADLINE for v in values)
+            print(f"{kind:<18}{len(values):>8}{percentile(values, .5) * 1000:>11.0f}"
+                  f"{percentile(values, .99) * 1000:>11.0f}{max(values) * 1000:>11.0f}{late:>8}")
+        missing: dict[str, int] = defaultdict(int)
+        for kind, _ in self.server.sent_at.values():
+            missing[kind] += 1
+        if missing:
+            detail = ", ".join(f"{kind} : {count}" for kind, count in sorted(missing.items()))
+            print(f"⚠️ Interactions jamais acquittées (« L'interaction a échoué ») : {detail}")
+
+        lag = self.loop_lag or [0.0]
+        print(f"\nRetard de boucle : p50 {percentile(lag, .5) * 1000:.1f} ms | "
+              f"p99 {percentile(lag, .99) * 1000:.1f} ms | max {max(lag) * 1000:.1f} ms")
+        if self.peak_games:
+            per_game = (self.peak_rss - rss_before) / self.peak_games
+            print(f"Parties actives au pic : {self.peak_games} | mémoire par partie ≈ {per_game / 1024:.1f} Kio")
+        print(f"Planificateur d'éditions : {scheduler.stats}")
+        if self.args.metrics:
+            print("\n" + metrics.render())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=100, help="parties de Puissance 4 simultanées")
+    parser.add_argument("--bot-games", type=int, default=20, help="parties simultanées contre BotRonron")
+    parser.add_argument("--menus", type=int, default=200, help="sélections /menu")
+    parser.add_argument("--status", type=int, default=100, help="appels /status")
+    parser.add_argument("--guilds", type=int, default=5)
+    parser.add_argument("--users", type=int, default=500, help="membres par serveur")
+    parser.add_argument("--latency", type=float, default=80.0, help="latence réseau simulée (ms)")
+    parser.add_argument("--jitter", type=float, default=20.0, help="écart-type de la latence (ms)")
+    parser.add_argument("--db-latency", type=float, default=30.0, help="latence MongoDB simulée (ms)")
+    parser.add_argument("--rate-limit", type=float, default=0.01, help="probabilité de 429 par requête")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="durée d'un 429 (s)")
+    parser.add_argument("--think", type=float, default=0.5, help="temps de réflexion entre deux clics (s)")
+    parser.add_argument("--retry-click", type=float, default=3.0, help="délai avant de recliquer sans réponse (s)")
+    parser.add_argument("--game-timeout", type=float, default=120.0, help="durée maximale d'une partie (s)")
+    parser.add_argument("--ramp", type=float, default=5.0, help="étalement du démarrage des scénarios (s)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--metrics", action="store_true", help="affiche /metrics (format Prometheus) à la fin")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(Simulation(args).run())
+
+
+if __name__ == "__main__":
+    main()
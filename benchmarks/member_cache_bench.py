@@ -0,0 +1,176 @@
+"""Comparaison mémoire / CPU du cache des membres : configuration par défaut vs ``LOW_MEMORY``.
+
+Chaque configuration tourne dans un sous-processus (RSS non pollué) avec un
+vrai ``discord.Client`` hors ligne : les ``GUILD_CREATE`` et les réponses de
+chunking sont des payloads synthétiques passés aux parseurs de discord.py
+(``chunk_guild`` puis ``parse_guild_members_chunk``), comme en production.
+Seul le temps réseau de la passerelle n'est pas simulé : le temps réel de
+démarrage est celui du log « ⏱️ Prêt en … » de ``bot.py`` (voir README).
+
+Configurations :
+    défaut      LOW_MEMORY=0 : tous les serveurs chargés au démarrage, cache complet
+    low         LOW_MEMORY=1 : aucun chargement, cache vide
+    low+besoin  LOW_MEMORY=1, puis ``--need`` des serveurs chargés au premier besoin
+
+Usage :
+    python -m benchmarks.member_cache_bench [--guilds 300] [--users 200000] [--max-size 50000] [--need 0.05]
+"""
+
+import os
+import gc
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import subprocess
+from datetime import datetime, timezone
+
+import discord
+
+BOT_ID = 900_000_000_000_000_001
+CHUNK_SIZE = 1000  # membres par GUILD_MEMBERS_CHUNK, comme Discord
+JOINED_AT = datetime(2024, 1, 1, tzinfo=timezone.utc).isoformat()
+
+CONFIGS = {
+    "défaut": ({"LOW_MEMORY": "0"}, False),
+    "low": ({"LOW_MEMORY": "1"}, False),
+    "low+besoin": ({"LOW_MEMORY": "1"}, True),
+}
+
+
+def rss_bytes() -> int:
+    """Mémoire résidente du processus (Linux), 0 si indisponible."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def user_payload(user_id: int, bot: bool = False) -> dict:
+    return {"id": str(user_id), "username": f"u{user_id % 10**6}", "discriminator": "0",
+            "global_name": None, "avatar": None, "bot": bot}
+
+
+def member_payload(user_id: int, bot: bool = False) -> dict:
+    return {"user": user_payload(user_id, bot), "roles": [], "joined_at": JOINED_AT,
+            "deaf": False, "mute": False, "flags": 0}
+
+
+def guild_sizes(args: argparse.Namespace) -> list[int]:
+    """Tailles de serveurs à longue traîne (beaucoup de petits, quelques très grands)."""
+    rng = random.Random(args.seed)
+    return [min(args.max_size, int(10 * rng.paretovariate(0.8))) for _ in range(args.guilds)]
+
+
+# =========================================
+# Sous-processus : une configuration
+# =========================================
+
+async def run_config(args: argparse.Namespace) -> dict:
+    import members  # après la lecture de LOW_MEMORY dans l'environnement du sous-processus
+
+    intents = discord.Intents.default()
+    intents.members = True
+    client = discord.Client(
+        intents=intents,
+        member_cache_flags=members.member_cache_flags(),
+        chunk_guilds_at_startup=members.CHUNK_AT_STARTUP,
+    )
+    await client._async_setup_hook()
+    state = client._connection
+    state.user = discord.ClientUser(state=state, data=user_payload(BOT_ID, bot=True))  # type: ignore[arg-type]
+
+    rng = random.Random(args.seed)
+    sizes = guild_sizes(args)
+    members_of: dict[int, list[int]] = {}
+    stats = {"chunk_requests": 0, "chunk_payloads": 0, "parse_cpu": 0.0}
+
+    async def feed(guild_id: int, nonce: str) -> None:
+        user_ids = members_of[guild_id]
+        count = max(1, -(-len(user_ids) // CHUNK_SIZE))
+        for index in range(count):
+            batch = user_ids[index * CHUNK_SIZE:(index + 1) * CHUNK_SIZE]
+            payload = {"guild_id": str(guild_id), "members": [member_payload(u) for u in batch],
+                       "chunk_index": index, "chunk_count": count, "nonce": nonce}
+            start = time.process_time()
+            state.parse_guild_members_chunk(payload)  # type: ignore[arg-type]
+            stats["parse_cpu"] += time.process_time() - start
+            stats["chunk_payloads"] += 1
+            await asyncio.sleep(0)
+
+    async def chunker(guild_id, query="", limit=0, presences=False, *, nonce=None):
+        stats["chunk_requests"] += 1
+        asyncio.create_task(feed(guild_id, nonce))
+
+    state.chunker = chunker  # type: ignore[assignment]
+
+    gc.collect()
+    baseline = rss_bytes()
+
+    # GUILD_CREATE : sans intent presences, seul le membre du bot est inclus
+    guilds = []
+    for index, size in enumerate(sizes):
+        guild_id = 10**17 + index
+        members_of[guild_id] = rng.sample(range(10**16, 10**16 + args.users), min(size, args.users))
+        payload = {"id": str(guild_id), "name": f"serveur {index}", "member_count": len(members_of[guild_id]) + 1,
+                   "members": [member_payload(BOT_ID, bot=True)], "roles": [], "channels": []}
+        guilds.append(state._add_guild_from_data(payload))  # type: ignore[arg-type]
+
+    if members.CHUNK_AT_STARTUP:
+        await asyncio.gather(*(guild.chunk(cache=True) for guild in guilds))
+    if args.need_pass:
+        needed = rng.sample(guilds, max(1, int(len(guilds) * args.need)))
+        await asyncio.gather(*(members.ensure_chunked(guild) for guild in needed))
+
+    del members_of
+    gc.collect()
+    return {
+        "rss": rss_bytes() - baseline,
+        "members": sum(len(guild._members) for guild in guilds),
+        "users": len(state._users),
+        "chunked": sum(guild.chunked for guild in guilds),
+        **stats,
+    }
+
+
+# =========================================
+# Processus principal
+# =========================================
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--guilds", type=int, default=300)
+    parser.add_argument("--users", type=int, default=200_000, help="utilisateurs uniques")
+    parser.add_argument("--max-size", type=int, default=50_000, help="taille maximale d'un serveur")
+    parser.add_argument("--need", type=float, default=0.05, help="part de serveurs chargés au premier besoin")
+    parser.add_argument("--seed", type=int, default=5)
+    parser.add_argument("--config", choices=CONFIGS, help=argparse.SUPPRESS)
+    parser.add_argument("--need-pass", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.config:
+        print(json.dumps(asyncio.run(run_config(args))))
+        return
+
+    sizes = guild_sizes(args)
+    print(f"{args.guilds} serveurs, {sum(sizes):,} appartenances (max {max(sizes):,}), "
+          f"{args.users:,} utilisateurs possibles\n")
+    print(f"{'configuration':<14}{'RSS':>11}{'membres':>11}{'users':>10}{'chargés':>9}"
+          f"{'req. chunk':>12}{'payloads':>10}{'CPU parse':>11}")
+    for name, (env, need_pass) in CONFIGS.items():
+        cmd = [sys.executable, "-m", "benchmarks.member_cache_bench", "--config", name,
+               "--guilds", str(args.guilds), "--users", str(args.users),
+               "--max-size", str(args.max_size), "--need", str(args.need), "--seed", str(args.seed)]
+        if need_pass:
+            cmd.append("--need-pass")
+        out = subprocess.run(cmd, env={**os.environ, **env}, capture_output=True, text=True, check=True)
+        r = json.loads(out.stdout.strip().splitlines()[-1])
+        print(f"{name:<14}{r['rss'] / 2**20:>7.1f} Mio{r['members']:>11,}{r['users']:>10,}{r['chunked']:>9}"
+              f"{r['chunk_requests']:>12}{r['chunk_payloads']:>10}{r['parse_cpu'] * 1000:>8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""Micro-benchmarks des chemins chauds du Puissance 4.
+
+Mesure ``Board.drop_piece``, ``Board.check_win``, ``EmbedBuilder.board_display``,
+``EmbedBuilder.game_embed`` et ``GameState.components`` sur des parties
+aléatoires et « adverses » (parties longues, où chaque coup évite de donner la
+victoire), avec des joueurs factices : aucun token Discord n'est nécessaire.
+
+Mesure aussi, pour plusieurs nombres de parties simultanées, la mémoire par
+partie et le coût d'aiguillage d'un clic (``GameButton``, jusqu'au refus d'un
+clic périmé) : les deux doivent rester plats quand le nombre de parties croît.
+
+Usage :
+    git stash && python -m benchmarks.p4_bench --save-baseline  # référence, sur le code de départ
+    git stash pop && python -m benchmarks.p4_bench              # compare la modification à la référence
+
+Les ops/s dépendent de la machine : la référence
+(``benchmarks/baselines/p4_bench.json``) est locale, ignorée par git, et
+n'a de sens que comparée sur la machine qui l'a produite. Sans référence,
+le premier lancement l'enregistre sans rien comparer. Le script échoue
+(code 1) si un benchmark est plus lent que la référence au-delà de
+``--tolerance``.
+"""
+
+import os
+import sys
+import json
+import time
+import re
+import random
+import asyncio
+import argparse
+import tracemalloc
+from typing import Callable
+
+from engine.board import COLS, possible_moves, winning_cells, column_mask
+from commands.puissance4 import (
+    CUSTOM_ID_TEMPLATE, PIECE_LIST, Board, EmbedBuilder, GameButton, GameState, store,
+)
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "p4_bench.json")
+
+# =========================================
+# Joueurs factices
+# =========================================
+
+class FakeAsset:
+    def __init__(self, user_id: int):
+        self.url = f"https://cdn.discordapp.com/embed/avatars/{user_id % 6}.png"
+
+    def replace(self, **_) -> "FakeAsset":
+        return self
+
+
+class FakeMember:
+    """Remplaçant minimal de ``discord.Member`` pour les parties."""
+
+    bot = False
+
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.mention = f"<@{user_id}>"
+        self.display_avatar = FakeAsset(user_id)
+
+    def __eq__(self, other) -> bool:
+        return getattr(other, "id", None) == self.id
+
+    def __hash__(self) -> int:
+        return self.id
+
+
+# =========================================
+# Parties
+# =========================================
+
+def random_game(rng: random.Random) -> list[int]:
+    """Suite de coups aléatoires jusqu'à la victoire ou au match nul."""
+    board, moves, player = Board(), [], 0
+    while not board.is_full():
+        col = rng.choice([c for c in range(COLS) if not board.is_column_full(c)])
+        board.play(col, player)
+        moves.append(col)
+        if board.has_won(player):
+            break
+        player ^= 1
+    return moves
+
+
+def adversarial_game(rng: random.Random) -> list[int]:
+    """Partie longue : chaque coup évite, si possible, de gagner ou d'offrir la victoire."""
+    board, moves, player = Board(), [], 0
+    while not board.is_full():
+        position, mask = board.position(player)
+        possible = possible_moves(mask)
+        opponent_wins = winning_cells(position ^ mask, mask)
+        own_wins = winning_cells(position, mask)
+        legal = [c for c in range(COLS) if possible & column_mask(c)]
+        quiet = [
+            c for c in legal
+            if not (possible & column_mask(c) & (own_wins | (opponent_wins >> 1)))
+        ]
+        col = rng.choice(quiet or legal)
+        board.play(col, player)
+        moves.append(col)
+        if board.has_won(player):
+            break
+        player ^= 1
+    return moves
+
+
+# =========================================
+# Mesures
+# =========================================
+
+def measure(fn: Callable[[], int], repeat: int, min_time: float = 0.2) -> tuple[float, float]:
+    """Retourne (opérations/s, octets alloués au pic par opération).
+
+    Chaque tour enchaîne les appels pendant au moins ``min_time`` secondes ;
+    le meilleur des ``repeat`` tours est retenu pour limiter le bruit.
+    """
+    best_rate = 0.0
+    for _ in range(repeat):
+        ops, start = 0, time.perf_counter()
+        while (elapsed := time.perf_counter() - start) < min_time:
+            ops += fn()
+        best_rate = max(best_rate, ops / elapsed)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    ops = fn()
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return best_rate, peak / max(ops, 1)
+
+
+def build_benchmarks(games: list[list[int]]) -> dict[str, Callable[[], int]]:
+    p1, p2 = FakeMember(1), FakeMember(2)
+
+    def drop_piece() -> int:
+        ops = 0
+        for moves in games:
+            board = Board()
+            for i, col in enumerate(moves):
+                board.drop_piece(col, PIECE_LIST[i % 2])
+            ops += len(moves)
+        return ops
+
+    def check_win() -> int:
+        ops = 0
+        for moves in games:
+            board = Board()
+            for i, col in enumerate(moves):
+                piece = PIECE_LIST[i % 2]
+                board.drop_piece(col, piece)
+                board.check_win(piece)
+            ops += len(moves)
+        return ops
+
+    def render(fn: Callable[[GameState], object]) -> Callable[[], int]:
+        def run() -> int:
+            ops = 0
+            for moves in games:
+                game = GameState("0", "game", (p1, p2))  # type: ignore[arg-type]
+                for i, col in enumerate(moves):
+                    game.board.drop_piece(col, PIECE_LIST[i % 2])
+                    game.last_move = col
+                    fn(game)
+                ops += len(moves)
+            return ops
+        return run
+
+    return {
+        "drop_piece": drop_piece,
+        "check_win": check_win,
+        "board_display": render(EmbedBuilder.board_display),
+        "game_embed": render(EmbedBuilder.game_embed),
+        "components": render(GameState.components),
+    }
+
+
+# =========================================
+# Parties simultanées
+# =========================================
+
+class FakeResponse:
+    async def send_message(self, *args, **kwargs) -> None:
+        pass
+
+
+class FakeInteraction:
+    def __init__(self, user: FakeMember):
+        self.user = user
+        self.response = FakeResponse()
+
+
+async def concurrent_games(count: int, clicks: int = 20_000) -> tuple[float, float]:
+    """Retourne (octets par partie, µs par clic) avec ``count`` parties en mémoire.
+
+    Les clics visent un tour déjà joué (``seq`` périmé) sur des parties tirées
+    au hasard : aiguillage par le gabarit, ``from_custom_id``, recherche dans
+    le ``GameStore`` et refus, sans écriture en base.
+    """
+    players = [FakeMember(i) for i in range(2 * count)]
+    store.games.clear()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    for i in range(count):
+        game = GameState(f"{i:08x}", "game", (players[2 * i], players[2 * i + 1]))  # type: ignore[arg-type]
+        game.seq = 1
+        store.games[game.game_id] = game
+    per_game = (tracemalloc.get_traced_memory()[0] - base) / count
+    tracemalloc.stop()
+
+    template = re.compile(CUSTOM_ID_TEMPLATE)
+    rng = random.Random(count)
+    custom_ids = [f"p4:{rng.randrange(count):08x}:col:{rng.randrange(COLS)}:0" for _ in range(clicks)]
+    interaction = FakeInteraction(players[0])
+    start = time.perf_counter()
+    for custom_id in custom_ids:
+        match = template.fullmatch(custom_id)
+        assert match is not None
+        button = await GameButton.from_custom_id(interaction, None, match)  # type: ignore[arg-type]
+        await button.callback(interaction)  # type: ignore[arg-type]
+    per_click = (time.perf_counter() - start) / clicks * 1e6
+    store.games.clear()
+    return per_game, per_click
+
+
+async def run(args: argparse.Namespace) -> dict[str, dict[str, float]]:
+    rng = random.Random(args.seed)
+    suites = {
+        "aléatoire": [random_game(rng) for _ in range(args.games)],
+        "adverse": [adversarial_game(rng) for _ in range(args.games)],
+    }
+
+    results: dict[str, dict[str, float]] = {}
+    print(f"{'benchmark':<28}{'ops/s':>14}{'octets/coup':>14}")
+    for suite, games in suites.items():
+        for name, fn in build_benchmarks(games).items():
+            ops_per_sec, bytes_per_op = measure(fn, args.repeat)
+            key = f"{name}[{suite}]"
+            results[key] = {"ops_per_sec": ops_per_sec, "bytes_per_op": bytes_per_op}
+            print(f"{key:<28}{ops_per_sec:>14,.0f}{bytes_per_op:>14,.0f}")
+
+    if args.concurrent:
+        print(f"\n{'parties simultanées':<28}{'octets/partie':>14}{'µs/clic':>14}")
+        for count in args.concurrent:
+            per_game, per_click = await concurrent_games(count)
+            print(f"{count:<28,}{per_game:>14,.0f}{per_click:>14.1f}")
+    return results
+
+
+def compare(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], tolerance: float) -> list[str]:
+    """Retourne la liste des benchmarks plus lents que la référence."""
+    regressions = []
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if reference and result["ops_per_sec"] < reference["ops_per_sec"] * (1 - tolerance):
+            ratio = result["ops_per_sec"] / reference["ops_per_sec"]
+            regressions.append(f"{key} : {ratio:.0%} de la référence")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--concurrent", type=lambda v: [int(n) for n in v.split(",") if n], default="100,1000,10000",
+                        help="nombres de parties simultanées mesurés (vide : aucun)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="baisse d'ops/s tolérée (0.25 = 25 %%)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    if args.save_baseline or not os.path.exists(args.baseline):
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        if args.save_baseline:
+            print(f"Référence enregistrée : {args.baseline}")
+        else:
+            print(f"⚠️ Aucune référence : résultats enregistrés dans {args.baseline}, rien n'a été comparé.")
+        return
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("❌ Régressions :\n- " + "\n- ".join(regressions))
+        sys.exit(1)
+    print("✅ Aucune régression par rapport à la référence.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark du solveur Puissance 4 : nœuds/s et temps par coup par difficulté.
+
+Usage :
+    python -m benchmarks.solver_bench [--positions 20] [--seed 42]
+
+Les positions sont tirées en jouant un nombre aléatoire de coups au hasard
+(sans victoire), puis chaque difficulté cherche le meilleur coup sur les
+mêmes positions, dans le processus courant.
+"""
+
+import argparse
+import random
+import statistics
+from dataclasses import replace
+
+from engine.board import Board, COLS
+from engine.solver import DIFFICULTIES, Searcher
+
+
+def random_positions(count: int, seed: int, max_plies: int = 16) -> list[Board]:
+    """Génère ``count`` positions non terminées reproductibles."""
+    rng = random.Random(seed)
+    positions: list[Board] = []
+    while len(positions) < count:
+        board = Board()
+        player = 0
+        for _ in range(rng.randint(0, max_plies)):
+            col = rng.choice([c for c in range(COLS) if not board.is_column_full(c)])
+            board.play(col, player)
+            if board.has_won(player):
+                break
+            player ^= 1
+        else:
+            positions.append(board)
+    return positions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--positions", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    positions = random_positions(args.positions, args.seed)
+
+    print(f"{'difficulté':<12}{'nœuds/s':>12}{'ms/coup moy.':>15}{'ms/coup p95':>14}{'profondeur moy.':>18}")
+    for name, difficulty in DIFFICULTIES.items():
+        # Sans hasard, pour mesurer la recherche elle-même
+        difficulty = replace(difficulty, randomness=0.0)
+        searcher = Searcher()
+        times, depths, nodes = [], [], 0
+        for board in positions:
+            player = board.moves % 2
+            position, mask = board.position(player)
+            result = searcher.search(position, mask, board.moves, difficulty)
+            times.append(result.elapsed)
+            depths.append(result.depth)
+            nodes += result.nodes
+
+        total = sum(times)
+        p95 = sorted(times)[max(0, int(len(times) * 0.95) - 1)]
+        print(
+            f"{name:<12}{nodes / total if total else 0:>12,.0f}"
+            f"{statistics.mean(times) * 1000:>15.1f}{p95 * 1000:>14.1f}"
+            f"{statistics.mean(depths):>18.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""Faux Discord local (API REST minimale + passerelle WebSocket) pour tester le lanceur.
+
+Répond à ce dont discord.py a besoin pour connecter un ``AutoShardedBot`` :
+``/users/@me``, ``/oauth2/applications/@me``, ``/gateway/bot`` et, côté
+passerelle, HELLO / IDENTIFY / READY / GUILD_CREATE, les battements (avec une
+latence simulée par shard) et les demandes de membres. Les serveurs factices
+sont répartis entre shards comme chez Discord : ``(guild_id >> 22) % shard_count``.
+
+Utilisé par ``python launcher.py --standin`` ; peut aussi tourner seul :
+    python -m benchmarks.standin_gateway --shards 4 --guilds 200 --port 8800
+"""
+
+import json
+import random
+import asyncio
+import logging
+import argparse
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+import discord
+from aiohttp import web, WSMsgType
+
+logger = logging.getLogger(__name__)
+
+BOT_ID = 900_000_000_000_000_001
+API_PREFIX = "/api/v10"
+HEARTBEAT_INTERVAL_MS = 5000
+
+
+def user_payload(user_id: int, bot: bool = False) -> dict:
+    return {"id": str(user_id), "username": f"u{user_id % 10**6}", "discriminator": "0",
+            "global_name": None, "avatar": None, "bot": bot}
+
+
+def member_payload(user_id: int, bot: bool = False) -> dict:
+    return {"user": user_payload(user_id, bot), "roles": [], "deaf": False, "mute": False, "flags": 0,
+            "joined_at": datetime(2024, 1, 1, tzinfo=timezone.utc).isoformat()}
+
+
+def json_response(data: Any, status: int = 200) -> web.Response:
+    # discord.py n'accepte que « application/json » exact, sans « ; charset= »
+    return web.Response(body=json.dumps(data).encode(), status=status,
+                        headers={"Content-Type": "application/json"})
+
+
+class StandinDiscord:
+    def __init__(self, shard_count: int, guilds: int, members: int = 50, latency: float = 0.04, seed: int = 1):
+        self.shard_count = shard_count
+        self.members = members
+        self.rng = random.Random(seed)
+        base = discord.utils.time_snowflake(datetime(2024, 1, 1, tzinfo=timezone.utc))
+        self.guild_ids = [base + (index << 22) + index for index in range(guilds)]
+        # Latence propre à chaque shard, pour distinguer les shards dans /status
+        self.latencies = {shard: latency * (1 + 0.25 * shard) for shard in range(shard_count)}
+        self.url: Optional[str] = None
+        self.identified: dict[int, int] = {}
+        self.synced = 0  # synchronisations de commandes reçues
+        self._runner: Optional[web.AppRunner] = None
+
+        self.app = web.Application()
+        self.app.add_routes([
+            web.get(API_PREFIX + "/users/@me", self.me),
+            web.get(API_PREFIX + "/oauth2/applications/@me", self.application),
+            web.get(API_PREFIX + "/gateway/bot", self.gateway_bot),
+            web.get(API_PREFIX + "/gateway", self.gateway_bot),
+            web.put(API_PREFIX + "/applications/{app}/commands", self.commands),
+            web.put(API_PREFIX + "/applications/{app}/guilds/{guild}/commands", self.commands),
+            web.get("/gateway", self.gateway),
+            web.route("*", API_PREFIX + "/{tail:.*}", self.not_found),
+        ])
+
+    def shard_of(self, guild_id: int) -> int:
+        return (guild_id >> 22) % self.shard_count
+
+    # === REST ===
+
+    async def me(self, request: web.Request) -> web.Response:
+        return json_response(user_payload(BOT_ID, bot=True))
+
+    async def application(self, request: web.Request) -> web.Response:
+        return json_response({
+            "id": str(BOT_ID), "name": "BotRonron (stand-in)", "icon": None, "description": "",
+            "bot_public": True, "bot_require_code_grant": False, "verify_key": "0" * 64,
+            "owner": user_payload(BOT_ID + 1), "flags": 0,
+        })
+
+    async def gateway_bot(self, request: web.Request) -> web.Response:
+        return json_response({
+            "url": self.url.replace("http", "ws", 1) + "/gateway", "shards": self.shard_count,
+            "session_start_limit": {"total": 1000, "remaining": 1000, "reset_after": 0, "max_concurrency": 1},
+        })
+
+    async def commands(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        self.synced += 1
+        return json_response([
+            {**command, "id": str(BOT_ID + 10 + index), "application_id": str(BOT_ID), "version": "1"}
+            for index, command in enumerate(payload)
+        ])
+
+    async def not_found(self, request: web.Request) -> web.Response:
+        return json_response({"message": "Unknown (stand-in)", "code": 0}, status=404)
+
+    # === Passerelle ===
+
+    async def gateway(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        sequence = 0
+
+        async def dispatch(event: str, data: dict) -> None:
+            nonlocal sequence
+            sequence += 1
+            await ws.send_str(json.dumps({"op": 0, "t": event, "s": sequence, "d": data}))
+
+        await ws.send_str(json.dumps({"op": 10, "d": {"heartbeat_interval": HEARTBEAT_INTERVAL_MS}}))
+        shard_id = 0
+        async for msg in ws:
+            if msg.type is not WSMsgType.TEXT:
+                continue
+            payload = json.loads(msg.data)
+            op, data = payload.get("op"), payload.get("d")
+            if op == 1:  # battement
+                await asyncio.sleep(self.latencies.get(shard_id, 0.0))
+                await ws.send_str(json.dumps({"op": 11}))
+            elif op in (2, 6):  # IDENTIFY (ou RESUME : on repart d'une session neuve)
+                shard_id = (data.get("shard") or [0, 1])[0] if op == 2 else shard_id
+                self.identified[shard_id] = self.identified.get(shard_id, 0) + 1
+                guilds = [g for g in self.guild_ids if self.shard_of(g) == shard_id]
+                await dispatch("READY", {
+                    "v": 10, "user": user_payload(BOT_ID, bot=True), "session_id": f"standin-{shard_id}",
+                    "resume_gateway_url": self.url.replace("http", "ws", 1) + "/gateway",
+                    "guilds": [{"id": str(g), "unavailable": True} for g in guilds],
+                    "application": {"id": str(BOT_ID), "flags": 0}, "shard": [shard_id, self.shard_count],
+                })
+                for index, guild_id in enumerate(guilds):
+                    await dispatch("GUILD_CREATE", {
+                        "id": str(guild_id), "name": f"Serveur {index} (shard {shard_id})",
+                        "member_count": self.members + 1, "members": [member_payload(BOT_ID, bot=True)],
+                        "channels": [], "roles": [], "emojis": [], "features": [], "large": False,
+                    })
+            elif op == 8:  # demande de membres
+                guild_id = int(data["guild_id"])
+                members = [member_payload(guild_id + 1 + i) for i in range(self.members)]
+                members.append(member_payload(BOT_ID, bot=True))
+                await dispatch("GUILD_MEMBERS_CHUNK", {
+                    "guild_id": str(guild_id), "members": members, "chunk_index": 0, "chunk_count": 1,
+                    "nonce": data.get("nonce"),
+                })
+        return ws
+
+    # === Cycle de vie ===
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+        self.url = f"http://{host}:{bound}"
+        logger.info(f"[Stand-in] Faux Discord sur {self.url} ({len(self.guild_ids)} serveurs, {self.shard_count} shards)")
+        return self.url
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+
+
+def point_discord_to(url: str) -> None:
+    """Redirige l'API REST et la passerelle de discord.py vers le faux Discord."""
+    import yarl
+    from discord.gateway import DiscordWebSocket
+
+    discord.http.Route.BASE = url + API_PREFIX
+    DiscordWebSocket.DEFAULT_GATEWAY = yarl.URL(url.replace("http", "ws", 1) + "/gateway")
+
+
+async def _serve_forever(args: argparse.Namespace) -> None:
+    standin = StandinDiscord(args.shards, args.guilds, args.members, args.latency / 1000)
+    await standin.start(port=args.port)
+    await asyncio.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shards", type=int, default=4)
+    parser.add_argument("--guilds", type=int, default=200)
+    parser.add_argument("--members", type=int, default=50, help="membres par serveur")
+    parser.add_argument("--latency", type=float, default=40.0, help="latence du shard 0 (ms)")
+    parser.add_argument("--port", type=int, default=8800)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_serve_forever(args))
+
+
+if __name__ == "__main__":
+    main()
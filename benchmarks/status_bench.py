@@ -0,0 +1,97 @@
+"""Benchmark du compteur d'utilisateurs de /status.
+
+Compare l'ancien calcul (ensemble construit sur tous les membres de tous les
+serveurs à chaque appel) à l'index incrémental ``HumanIndex`` de
+``commands.status``, sur des serveurs factices.
+
+Usage :
+    python -m benchmarks.status_bench [--members 100000] [--guilds 50] [--overlap 0.2]
+"""
+
+import time
+import random
+import argparse
+
+from commands.status import HumanIndex
+
+
+class FakeMember:
+    __slots__ = ("id", "bot")
+
+    def __init__(self, user_id: int, bot: bool):
+        self.id = user_id
+        self.bot = bot
+
+
+class FakeGuild:
+    __slots__ = ("members",)
+
+    def __init__(self):
+        self.members: list[FakeMember] = []
+
+
+def build_guilds(members: int, guilds: int, overlap: float, bots: float, seed: int) -> list[FakeGuild]:
+    """``members`` utilisateurs uniques, dont une part ``overlap`` présents sur plusieurs serveurs."""
+    rng = random.Random(seed)
+    result = [FakeGuild() for _ in range(guilds)]
+    for user_id in range(members):
+        member = FakeMember(user_id, rng.random() < bots)
+        copies = 1 + (rng.randint(1, 3) if rng.random() < overlap else 0)
+        for guild in rng.sample(result, min(copies, guilds)):
+            guild.members.append(member)
+    return result
+
+
+def timed(fn, min_time: float = 0.5) -> tuple[float, int]:
+    """Temps moyen par appel (s), en répétant au moins ``min_time`` secondes."""
+    calls, start = 0, time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < min_time:
+        fn()
+        calls += 1
+    return elapsed / calls, calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=100_000, help="utilisateurs uniques")
+    parser.add_argument("--guilds", type=int, default=50)
+    parser.add_argument("--overlap", type=float, default=0.2, help="part d'utilisateurs sur plusieurs serveurs")
+    parser.add_argument("--bots", type=float, default=0.02, help="part de bots")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    guilds = build_guilds(args.members, args.guilds, args.overlap, args.bots, args.seed)
+    memberships = sum(len(g.members) for g in guilds)
+    print(f"{args.members:,} utilisateurs, {memberships:,} appartenances sur {args.guilds} serveurs\n")
+
+    def full_scan() -> int:
+        return len({m.id for g in guilds for m in g.members if not m.bot})
+
+    index = HumanIndex()
+    start = time.perf_counter()
+    index.rebuild(guilds)
+    rebuild = time.perf_counter() - start
+    assert len(index) == full_scan(), "l'index diverge du calcul complet"
+
+    scan_time, _ = timed(full_scan)
+    index_time, _ = timed(lambda: len(index))
+
+    # Événements : un membre arrive puis repart (on_member_join / on_member_remove)
+    newcomer = FakeMember(args.members + 1, False)
+
+    def join_leave():
+        index.add(newcomer)
+        index.remove(newcomer)
+
+    event_time, _ = timed(join_leave)
+
+    print(f"{'opération':<42}{'temps':>14}")
+    print(f"{'/status, ancien calcul (ensemble complet)':<42}{scan_time * 1000:>11.2f} ms")
+    print(f"{'/status, HumanIndex (len)':<42}{index_time * 1e9:>11.0f} ns")
+    print(f"{'reconstruction (on_ready)':<42}{rebuild * 1000:>11.2f} ms")
+    print(f"{'arrivée + départ d’un membre':<42}{event_time * 1e9:>11.0f} ns")
+    print(f"\nGain par appel à /status : x{scan_time / index_time:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Benchmark des échéances de parties : ``loop.call_later`` par partie vs ``TimerWheel``.
+
+Simule ``--deadlines`` parties simultanées dont l'échéance est repoussée à
+chaque coup (``--resets`` fois), puis annulée en fin de partie :
+
+- coût par opération (programmer, reprogrammer, annuler) ;
+- mémoire occupée par les échéances en attente ;
+- taille du tas d'asyncio : un ``TimerHandle`` annulé y reste jusqu'à son
+  heure (ou jusqu'au nettoyage d'asyncio), la roue n'y met rien ;
+- précision : toutes les échéances sont réparties sur ``--spread`` secondes
+  et déclenchées, avec leur retard p50 / p99 / max (jamais d'avance).
+
+Usage :
+    python -m benchmarks.timer_bench [--deadlines 10000] [--resets 20] [--spread 3] [--tick 0.05]
+"""
+
+import time
+import random
+import asyncio
+import argparse
+import statistics
+import tracemalloc
+
+from timer_wheel import TimerWheel
+
+TIMEOUT = 120.0
+
+
+def heap_size(loop: asyncio.AbstractEventLoop) -> int:
+    return len(getattr(loop, "_scheduled", ()))
+
+
+async def bench_call_later(keys: list[int], resets: int) -> dict[str, float]:
+    loop = asyncio.get_running_loop()
+    handles: dict[int, asyncio.TimerHandle] = {}
+    heap_before = heap_size(loop)
+
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    for key in keys:
+        handles[key] = loop.call_later(TIMEOUT, lambda: None)
+    memory = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+
+    for _ in range(resets):
+        for key in keys:
+            handles[key].cancel()
+            handles[key] = loop.call_later(TIMEOUT, lambda: None)
+    heap_peak = heap_size(loop) - heap_before
+    for key in keys:
+        handles.pop(key).cancel()
+    elapsed = time.perf_counter() - start
+    return {"µs/op": elapsed / (len(keys) * (resets + 2)) * 1e6, "octets": memory, "tas": heap_peak}
+
+
+async def bench_wheel(keys: list[int], resets: int) -> dict[str, float]:
+    loop = asyncio.get_running_loop()
+    wheel: TimerWheel[int] = TimerWheel(lambda key: None)
+    heap_before = heap_size(loop)
+
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    now = time.time()
+    for key in keys:
+        wheel.schedule(key, now + TIMEOUT)
+    memory = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+
+    for _ in range(resets):
+        now = time.time()
+        for key in keys:
+            wheel.schedule(key, now + TIMEOUT)
+    heap_peak = heap_size(loop) - heap_before
+    for key in keys:
+        wheel.cancel(key)
+    elapsed = time.perf_counter() - start
+    wheel.stop()
+    return {"µs/op": elapsed / (len(keys) * (resets + 2)) * 1e6, "octets": memory, "tas": heap_peak}
+
+
+async def bench_firing(count: int, spread: float, tick: float, seed: int) -> dict[str, float]:
+    """Déclenche ``count`` échéances réparties sur ``spread`` secondes ; retards en ms."""
+    rng = random.Random(seed)
+    lateness: list[float] = []
+    done = asyncio.Event()
+    deadlines: dict[int, float] = {}
+
+    def fire(key: int) -> None:
+        lateness.append(time.time() - deadlines[key])
+        if len(lateness) == count:
+            done.set()
+
+    wheel: TimerWheel[int] = TimerWheel(fire, tick=tick)
+    now = time.time()
+    for key in range(count):
+        deadlines[key] = now + rng.uniform(0, spread)
+        wheel.schedule(key, deadlines[key])
+    await asyncio.wait_for(done.wait(), spread + 10 * tick + 5)
+    lateness.sort()
+    return {
+        "déclenchées": len(lateness),
+        "en avance": sum(1 for late in lateness if late < 0),
+        "p50": statistics.median(lateness) * 1000,
+        "p99": lateness[int(len(lateness) * 0.99) - 1] * 1000,
+        "max": lateness[-1] * 1000,
+    }
+
+
+async def run(args: argparse.Namespace) -> None:
+    keys = list(range(args.deadlines))
+    print(f"{args.deadlines:,} échéances, {args.resets} reprogrammations chacune\n")
+    print(f"{'méthode':<14}{'µs/op':>10}{'octets/échéance':>18}{'tas asyncio':>14}")
+    for name, bench in (("call_later", bench_call_later), ("TimerWheel", bench_wheel)):
+        result = await bench(keys, args.resets)
+        print(f"{name:<14}{result['µs/op']:>10.2f}{result['octets'] / len(keys):>18,.0f}{result['tas']:>14,}")
+
+    firing = await bench_firing(args.deadlines, args.spread, args.tick, args.seed)
+    print(
+        f"\nDéclenchement (tick {args.tick * 1000:.0f} ms) : {firing['déclenchées']:,} échéances, "
+        f"{firing['en avance']} en avance | retard p50 {firing['p50']:.1f} ms | "
+        f"p99 {firing['p99']:.1f} ms | max {firing['max']:.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--deadlines", type=int, default=10_000)
+    parser.add_argument("--resets", type=int, default=20, help="coups joués (échéance repoussée) par partie")
+    parser.add_argument("--spread", type=float, default=3.0, help="étalement des échéances déclenchées (s)")
+    parser.add_argument("--tick", type=float, default=0.05, help="résolution de la roue pour le déclenchement (s)")
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
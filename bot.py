@@ -1,13 +1,19 @@
+import time
+START_TIME = time.monotonic()
+
 import os
+import signal
+import resource
+import asyncio
 import logging
+import functools
+from typing import Optional
 import discord
 from discord.ext import commands
 from dotenv import load_dotenv
-from keep_alive import keep_alive
-from db import check_mongodb_connection
-from extensions import EXTENSIONS
 
 # === Chargement variables d'environnement ===
+# Avant les modules du projet : ils lisent leur configuration à l'import
 load_dotenv()
 TOKEN = os.getenv("TOKEN")
 
@@ -15,45 +21,146 @@ TOKEN = os.getenv("TOKEN")
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# === Intents & Bot ===
-intents = discord.Intents.default()
-intents.message_content = True
-intents.members = True
-
-bot = commands.Bot(command_prefix="!", intents=intents)
-
-# === Événements ===
-@bot.event
-async def setup_hook():
-    try:
-        for ext in EXTENSIONS:
-            await bot.load_extension(ext)
-            logger.info(f"Extension chargée : {ext}")
-        logger.info("✅ Toutes les extensions ont été chargées avec succès.")
-    except Exception:
-        logger.exception("❌ Erreur lors du chargement des extensions.")
-
-@bot.event
-async def on_ready():
-    logger.info(f"🤖 Bot connecté en tant que {bot.user}")
-    await check_mongodb_connection()
-
-@bot.event
-async def on_disconnect():
-    logger.warning("⚠️ Bot déconnecté de Discord.")
-
-@bot.event
-async def on_resumed():
-    logger.info("🔄 Session Discord reprise avec succès.")
-
-# === Keep Alive (pour Render / Repl.it) ===
-keep_alive()
-
-# === Lancement du bot ===
-if TOKEN:
-    try:
-        bot.run(TOKEN)
-    except discord.LoginFailure:
-        logger.error("❌ TOKEN invalide. Vérifie ton .env ou tes variables Render.")
-else:
-    logger.error("❌ TOKEN non trouvé. Vérifie ton .env ou tes variables Render.")
+from keep_alive import KeepAliveServer, PORT  # noqa: E402
+import members  # noqa: E402
+import metrics  # noqa: E402
+import extensions  # noqa: E402
+import command_sync  # noqa: E402
+from cluster import ClusterClient, worker_stats  # noqa: E402
+from loop_watchdog import watchdog  # noqa: E402
+from db import check_mongodb_connection  # noqa: E402
+
+class StartupTimer:
+    """Durée de chaque phase du démarrage, journalisée une fois le bot prêt."""
+
+    def __init__(self):
+        self.last = START_TIME
+        self.phases: list[tuple[str, float]] = []
+
+    def mark(self, phase: str) -> None:
+        now = time.monotonic()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def summary(self) -> str:
+        return " · ".join(f"{phase} {seconds:.2f} s" for phase, seconds in self.phases)
+
+startup = StartupTimer()
+startup.mark("imports")
+
+def create_bot(
+    shard_ids: Optional[list[int]] = None,
+    shard_count: Optional[int] = None,
+    cluster_id: Optional[int] = None,
+    http_host: str = "0.0.0.0",
+    http_port: int = PORT,
+) -> commands.AutoShardedBot:
+    """Construit le bot et branche ses événements.
+
+    Sans argument : un seul processus, avec le nombre de shards recommandé par
+    Discord. ``launcher.py`` donne à chaque worker sa plage de shards et son
+    ``cluster_id`` ; le worker envoie alors son état au lanceur (``bot.cluster``).
+    """
+    # === Intents & Bot ===
+    intents = discord.Intents.default()
+    intents.message_content = True
+    intents.members = True
+
+    # Cache des membres et chargement au démarrage : voir members.py (LOW_MEMORY)
+    bot = commands.AutoShardedBot(
+        command_prefix="!",
+        intents=intents,
+        tree_cls=metrics.InstrumentedTree,
+        member_cache_flags=members.member_cache_flags(),
+        chunk_guilds_at_startup=members.CHUNK_AT_STARTUP,
+        shard_ids=shard_ids,
+        shard_count=shard_count,
+    )
+    bot.cluster = ClusterClient(cluster_id, functools.partial(worker_stats, bot)) if cluster_id is not None else None
+
+    # Serveur de santé HTTP (Render / UptimeRobot), sur la boucle du bot
+    keep_alive = KeepAliveServer(bot, host=http_host, port=http_port)
+
+    async def shutdown():
+        watchdog.stop()
+        if bot.cluster:
+            bot.cluster.stop()
+        await keep_alive.stop()
+        await bot.close()
+
+    # === Événements ===
+    @bot.event
+    async def setup_hook():
+        # SIGTERM (arrêt Render ou du lanceur) passe par bot.close() : les cogs
+        # sont déchargés et vident leurs écritures différées avant la sortie
+        try:
+            asyncio.get_running_loop().add_signal_handler(
+                signal.SIGTERM, lambda: asyncio.create_task(shutdown())
+            )
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows : seul Ctrl+C est géré
+
+        metrics.install(bot)
+        # Retard de la boucle et blocages (pile journalisée), /profil pour le détail
+        watchdog.start()
+        keep_alive.start()
+        if bot.cluster:
+            bot.cluster.start()
+
+        startup.mark("connexion")
+
+        # Chaque extension est isolée : un cog en échec n'empêche pas les autres
+        reports = await extensions.load_all(bot)
+        failed = [r for r in reports if not r.ok]
+        startup.mark("extensions")
+        slowest = ", ".join(str(r) for r in sorted(reports, key=lambda r: -r.seconds)[:3])
+        if failed:
+            logger.error(f"❌ {len(failed)}/{len(reports)} extension(s) en échec : {', '.join(r.name for r in failed)}")
+        else:
+            logger.info(f"✅ {len(reports)} extensions chargées (les plus lentes : {slowest}).")
+
+        # Synchronise les commandes slash seulement si l'arbre a changé ; pas
+        # avec un arbre incomplet, qui retirerait les commandes des cogs en échec
+        if not failed:
+            await command_sync.sync_on_startup(bot)
+        startup.mark("synchronisation")
+
+    @bot.event
+    async def on_ready():
+        logger.info(f"🤖 Bot connecté en tant que {bot.user} (shards {sorted(bot.shards)} / {bot.shard_count})")
+        if startup.phases[-1][0] != "passerelle":
+            startup.mark("passerelle")
+            logger.info(f"🧭 Démarrage : {startup.summary()}")
+        # Temps de démarrage et pic de mémoire : base de comparaison de LOW_MEMORY (voir README)
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        logger.info(
+            f"⏱️ Prêt en {time.monotonic() - START_TIME:.1f} s · {len(bot.guilds)} serveurs · "
+            f"{len(bot.users)} utilisateurs en cache · pic RSS {peak_rss:.0f} Mio "
+            f"(LOW_MEMORY={int(members.LOW_MEMORY)}, MEMBER_CACHE={members.MEMBER_CACHE})"
+        )
+        await check_mongodb_connection()
+
+    @bot.event
+    async def on_disconnect():
+        logger.warning("⚠️ Bot déconnecté de Discord.")
+
+    @bot.event
+    async def on_resumed():
+        logger.info("🔄 Session Discord reprise avec succès.")
+
+    return bot
+
+def run(bot: commands.Bot) -> None:
+    """Lance le bot avec le token de l'environnement."""
+    if TOKEN:
+        try:
+            bot.run(TOKEN)
+        except discord.LoginFailure:
+            logger.error("❌ TOKEN invalide. Vérifie ton .env ou tes variables Render.")
+    else:
+        logger.error("❌ TOKEN non trouvé. Vérifie ton .env ou tes variables Render.")
+
+# Garde nécessaire : les workers du solveur (multiprocessing "spawn")
+# réimportent ce module et ne doivent pas relancer le bot.
+if __name__ == "__main__":
+    run(create_bot())
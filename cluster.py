@@ -0,0 +1,210 @@
+"""Communication entre les processus du cluster (voir ``launcher.py``).
+
+Chaque processus worker fait tourner une plage de shards et envoie son état
+au lanceur toutes les ``CLUSTER_REPORT_INTERVAL`` secondes, par une connexion
+TCP locale (une ligne JSON par message). Le lanceur répond à chaque rapport par
+un instantané de tout le cluster : ``/status`` et le serveur de santé de
+chaque worker affichent ainsi des chiffres globaux.
+
+Protocole :
+    worker  -> lanceur   {"cluster": 0, "stats": {...}}
+    lanceur -> worker    {"snapshot": {...}}
+"""
+
+import os
+import json
+import math
+import time
+import asyncio
+import logging
+from typing import Any, Callable, Optional
+
+import discord
+
+from loop_watchdog import watchdog
+
+logger = logging.getLogger(__name__)
+
+IPC_HOST: str = "127.0.0.1"
+IPC_PORT: int = int(os.getenv("CLUSTER_IPC_PORT", "8790"))
+REPORT_INTERVAL: float = float(os.getenv("CLUSTER_REPORT_INTERVAL", "5"))
+# Un worker silencieux depuis plus longtemps est considéré comme perdu
+STALE_AFTER: float = 3 * REPORT_INTERVAL
+RECONNECT_MAX: float = 30.0
+
+
+def rss_bytes() -> int:
+    """Mémoire résidente du processus (Linux), 0 si indisponible."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def shard_ranges(shard_count: int, clusters: int) -> list[list[int]]:
+    """Répartit les shards en plages contiguës, les premières plages prenant le reste."""
+    clusters = max(1, min(clusters, shard_count))
+    size, extra = divmod(shard_count, clusters)
+    ranges, start = [], 0
+    for index in range(clusters):
+        end = start + size + (index < extra)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+
+def local_path(path: str) -> str:
+    """Fichier local propre au worker : ``data/x.jsonl`` devient ``data/x.1.jsonl`` pour le cluster 1.
+
+    ``CLUSTER_ID`` est posé par le lanceur dans l'environnement de chaque
+    worker ; hors cluster, le chemin est inchangé.
+    """
+    cluster_id = os.getenv("CLUSTER_ID")
+    if not cluster_id:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.{cluster_id}{ext}"
+
+
+def _ms(seconds: float) -> Optional[float]:
+    return round(seconds * 1000, 1) if math.isfinite(seconds) else None
+
+
+def worker_stats(bot: discord.AutoShardedClient) -> dict[str, Any]:
+    """État du processus : shards (latence, serveurs), mémoire et retard de boucle."""
+    guilds_per_shard: dict[int, int] = {}
+    for guild in bot.guilds:
+        guilds_per_shard[guild.shard_id] = guilds_per_shard.get(guild.shard_id, 0) + 1
+    return {
+        "pid": os.getpid(),
+        "ready": bot.is_ready(),
+        "guilds": len(bot.guilds),
+        "shards": {
+            str(shard_id): {
+                "latency_ms": _ms(info.latency),
+                "closed": info.is_closed(),
+                "guilds": guilds_per_shard.get(shard_id, 0),
+            }
+            for shard_id, info in bot.shards.items()
+        },
+        "rss_mb": round(rss_bytes() / 2**20, 1),
+        "loop_lag_ms": watchdog.metrics()["max_ms"],
+    }
+
+
+# =========================================
+# Côté worker
+# =========================================
+
+class ClusterClient:
+    """Envoie l'état du worker au lanceur et garde le dernier instantané du cluster."""
+
+    def __init__(self, cluster_id: int, collect: Callable[[], dict], host: str = IPC_HOST, port: int = IPC_PORT):
+        self.cluster_id = cluster_id
+        self.collect = collect
+        self.host, self.port = host, port
+        self.snapshot: Optional[dict] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        delay = 1.0
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+            except OSError as e:
+                logger.warning(f"⚠️ [Cluster {self.cluster_id}] Lanceur injoignable ({e}), nouvel essai dans {delay:.0f} s.")
+                await asyncio.sleep(delay)
+                delay = min(RECONNECT_MAX, delay * 2)
+                continue
+            delay = 1.0
+            try:
+                while True:
+                    message = {"cluster": self.cluster_id, "stats": self.collect()}
+                    writer.write(json.dumps(message).encode() + b"\n")
+                    await writer.drain()
+                    line = await asyncio.wait_for(reader.readline(), REPORT_INTERVAL * 2)
+                    if not line:
+                        raise ConnectionError("connexion fermée par le lanceur")
+                    self.snapshot = json.loads(line)["snapshot"]
+                    await asyncio.sleep(REPORT_INTERVAL)
+            except (OSError, ConnectionError, asyncio.TimeoutError, ValueError, KeyError) as e:
+                logger.warning(f"⚠️ [Cluster {self.cluster_id}] Lien avec le lanceur perdu : {e!r}")
+            finally:
+                writer.close()
+
+
+# =========================================
+# Côté lanceur
+# =========================================
+
+class ClusterHub:
+    """Reçoit les rapports des workers et leur renvoie l'instantané du cluster."""
+
+    def __init__(self, host: str = IPC_HOST, port: int = IPC_PORT):
+        self.host, self.port = host, port
+        self.reports: dict[int, dict] = {}
+        self.received: dict[int, float] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        logger.info(f"[Cluster] En écoute sur {self.host}:{self.port}")
+
+    async def stop(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                message = json.loads(line)
+                cluster_id = int(message["cluster"])
+                self.reports[cluster_id] = message["stats"]
+                self.received[cluster_id] = time.monotonic()
+                writer.write(json.dumps({"snapshot": self.snapshot()}).encode() + b"\n")
+                await writer.drain()
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"⚠️ [Cluster] Rapport invalide ou connexion perdue : {e!r}")
+        finally:
+            writer.close()
+
+    def forget(self, cluster_id: int) -> None:
+        """Oublie un worker arrêté (il sera compté à nouveau à son prochain rapport)."""
+        self.reports.pop(cluster_id, None)
+        self.received.pop(cluster_id, None)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Vue globale : serveurs, shards et mémoire de chaque processus."""
+        now = time.monotonic()
+        clusters, shards = {}, {}
+        for cluster_id, stats in sorted(self.reports.items()):
+            age = now - self.received[cluster_id]
+            clusters[str(cluster_id)] = {
+                "pid": stats["pid"],
+                "ready": stats["ready"] and age <= STALE_AFTER,
+                "guilds": stats["guilds"],
+                "shards": sorted(int(s) for s in stats["shards"]),
+                "rss_mb": stats["rss_mb"],
+                "loop_lag_ms": stats["loop_lag_ms"],
+                "age_s": round(age, 1),
+            }
+            for shard_id, shard in stats["shards"].items():
+                shards[shard_id] = {**shard, "cluster": cluster_id}
+        return {
+            "guilds": sum(c["guilds"] for c in clusters.values()),
+            "rss_mb": round(sum(c["rss_mb"] for c in clusters.values()), 1),
+            "clusters": clusters,
+            "shards": dict(sorted(shards.items(), key=lambda item: int(item[0]))),
+        }
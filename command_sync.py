@@ -0,0 +1,206 @@
+"""Synchronisation des commandes slash seulement quand l'arbre a changé.
+
+L'arbre de commandes est sérialisé exactement comme ``CommandTree.sync()``
+l'enverrait à Discord, puis réduit à une empreinte canonique (SHA-256 du JSON
+trié). La dernière charge synchronisée est gardée par portée (``global`` ou
+``guild:<id>``) dans MongoDB et dans un fichier local, qui sert de repli si la
+base est injoignable. Au démarrage, le bot ne synchronise que si l'empreinte
+diffère : les redémarrages ordinaires ne coûtent plus aucun appel limité.
+
+Variables d'environnement :
+    ENV=dev          synchronise sur DEV_GUILD_ID au lieu de globalement
+    DEV_GUILD_ID     serveur de test (mode dev)
+    AUTO_SYNC=0      désactive la synchronisation au démarrage
+"""
+
+import os
+import json
+import hashlib
+import logging
+import datetime
+from dataclasses import dataclass, field
+from typing import Optional
+
+import discord
+from discord import app_commands
+
+import db
+from cluster import local_path
+
+logger = logging.getLogger(__name__)
+
+ENV: str = os.getenv("ENV", "prod").strip().lower()
+DEV_GUILD_ID: int = int(os.getenv("DEV_GUILD_ID", "0") or 0)
+AUTO_SYNC: bool = os.getenv("AUTO_SYNC", "1") == "1"
+SYNC_STATE_PATH: str = local_path(os.getenv("COMMAND_SYNC_PATH", os.path.join("data", "command_sync.json")))
+
+sync_collection = db.db["command_sync"]
+
+
+@dataclass
+class SyncResult:
+    scope: str
+    fingerprint: str
+    previous: Optional[str]
+    changes: list[str] = field(default_factory=list)
+    synced: Optional[int] = None  # nombre de commandes envoyées, None si rien n'a été envoyé
+
+    @property
+    def changed(self) -> bool:
+        return self.fingerprint != self.previous
+
+
+def dev_guild() -> Optional[discord.Object]:
+    """Serveur de test en mode ``ENV=dev``, None en production."""
+    if ENV == "dev" and DEV_GUILD_ID:
+        return discord.Object(id=DEV_GUILD_ID)
+    return None
+
+
+def scope_of(guild: Optional[discord.abc.Snowflake]) -> str:
+    return "global" if guild is None else f"guild:{guild.id}"
+
+
+async def tree_payload(tree: app_commands.CommandTree, guild: Optional[discord.abc.Snowflake] = None) -> list[dict]:
+    """Charge que ``tree.sync(guild=guild)`` enverrait, triée par type puis nom."""
+    commands = tree._get_all_commands(guild=guild)
+    if tree.translator:
+        payload = [await command.get_translated_payload(tree, tree.translator) for command in commands]
+    else:
+        payload = [command.to_dict(tree) for command in commands]
+    return sorted(payload, key=lambda c: (c.get("type", 1), c["name"]))
+
+
+def canonical(payload: list[dict]) -> str:
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def fingerprint(payload: list[dict]) -> str:
+    return hashlib.sha256(canonical(payload).encode()).hexdigest()
+
+
+def diff(old: list[dict], new: list[dict]) -> list[str]:
+    """Différences lisibles, commande par commande (``+`` ajoutée, ``-`` retirée, ``~`` modifiée)."""
+    def index(payload):
+        return {(c.get("type", 1), c["name"]): canonical([c]) for c in payload}
+
+    before, after = index(old), index(new)
+    changes = []
+    for key in sorted(before.keys() | after.keys()):
+        label = key[1] if key[0] == 1 else f"{key[1]} (menu contextuel)"
+        if key not in before:
+            changes.append(f"+ {label}")
+        elif key not in after:
+            changes.append(f"- {label}")
+        elif before[key] != after[key]:
+            changes.append(f"~ {label}")
+    return changes
+
+
+# =========================================
+# Dernière synchronisation (MongoDB + fichier local)
+# =========================================
+
+def _read_local() -> dict[str, dict]:
+    try:
+        with open(SYNC_STATE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"⚠️ État de synchronisation local illisible ({SYNC_STATE_PATH}) : {e}")
+        return {}
+
+
+def _write_local(scope: str, state: dict) -> None:
+    states = _read_local()
+    states[scope] = state
+    try:
+        os.makedirs(os.path.dirname(SYNC_STATE_PATH) or ".", exist_ok=True)
+        tmp = SYNC_STATE_PATH + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(states, f, ensure_ascii=False)
+        os.replace(tmp, SYNC_STATE_PATH)
+    except OSError as e:
+        logger.warning(f"⚠️ État de synchronisation local non écrit : {e}")
+
+
+async def load_state(scope: str) -> Optional[dict]:
+    """Dernière synchronisation connue : MongoDB d'abord (partagé entre déploiements), sinon le fichier local."""
+    try:
+        doc = await db.mongo.read(lambda: sync_collection.find_one({"_id": scope}))
+        if doc:
+            return doc
+    except db.DatabaseUnavailable:
+        pass
+    except Exception as e:
+        logger.warning(f"⚠️ Lecture de l'état de synchronisation ({scope}) échouée : {e}")
+    return _read_local().get(scope)
+
+
+async def save_state(scope: str, digest: str, payload: list[dict]) -> None:
+    state = {
+        "fingerprint": digest,
+        "commands": payload,
+        "synced_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+    }
+    _write_local(scope, state)
+    await db.mongo.write(sync_collection, [db.update_op({"_id": scope}, {"$set": state}, upsert=True)])
+
+
+# =========================================
+# Synchronisation
+# =========================================
+
+async def sync_if_changed(
+    tree: app_commands.CommandTree,
+    guild: Optional[discord.abc.Snowflake] = None,
+    *,
+    force: bool = False,
+    dry_run: bool = False,
+) -> SyncResult:
+    """Synchronise ``guild`` (ou les commandes globales) si l'arbre a changé depuis la dernière fois."""
+    scope = scope_of(guild)
+    payload = await tree_payload(tree, guild)
+    digest = fingerprint(payload)
+    state = await load_state(scope)
+    result = SyncResult(scope, digest, state and state.get("fingerprint"))
+    result.changes = diff(state.get("commands", []) if state else [], payload)
+
+    if dry_run or not (force or result.changed):
+        return result
+
+    synced = await tree.sync(guild=guild)
+    result.synced = len(synced)
+    await save_state(scope, digest, payload)
+    logger.info(f"[SYNC] {scope} : {[cmd.name for cmd in synced]} | Total : {len(synced)} | {digest[:12]}")
+    return result
+
+
+async def sync_on_startup(bot: discord.Client) -> Optional[SyncResult]:
+    """Synchronisation automatique (``setup_hook``), une fois les extensions chargées.
+
+    En mode dev, les commandes globales sont copiées sur ``DEV_GUILD_ID`` et
+    synchronisées là seulement (propagation immédiate). En cluster, seul le
+    worker 0 synchronise.
+    """
+    cluster = getattr(bot, "cluster", None)
+    if not AUTO_SYNC or (cluster and cluster.cluster_id != 0):
+        return None
+    if ENV == "dev" and not DEV_GUILD_ID:
+        logger.warning("⚠️ ENV=dev sans DEV_GUILD_ID : synchronisation automatique ignorée.")
+        return None
+
+    guild = dev_guild()
+    if guild is not None:
+        bot.tree.copy_global_to(guild=guild)
+    try:
+        result = await sync_if_changed(bot.tree, guild)
+    except discord.HTTPException as e:
+        logger.error(f"❌ Synchronisation automatique ({scope_of(guild)}) échouée : {e}")
+        return None
+    if result.synced is None:
+        logger.info(f"✅ Commandes inchangées ({result.scope}, {result.fingerprint[:12]}) : pas de synchronisation.")
+    else:
+        logger.info(f"✅ Commandes synchronisées ({result.scope}) : {', '.join(result.changes) or 'état inconnu'}")
+    return result
@@ -0,0 +1,74 @@
+import discord
+from discord.ext import commands, tasks
+from discord import app_commands
+import logging
+
+import db
+from leaderboard import leaderboard
+
+logger = logging.getLogger(__name__)
+
+MEDALS = ["🥇", "🥈", "🥉"]
+
+class Classement(commands.Cog):
+    """Classement Elo du Puissance 4, servi depuis le cache de ``leaderboard``."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def cog_load(self):
+        await db.ensure_rating_indexes()
+        leaderboard.start()
+        self.refresh_top.start()
+
+    async def cog_unload(self):
+        """Écrit les résultats en attente avant l'arrêt (appelé aussi par ``bot.close``)."""
+        self.refresh_top.cancel()
+        await leaderboard.stop()
+
+    @tasks.loop(seconds=60)
+    async def refresh_top(self):
+        refreshed = await leaderboard.refresh()
+        if refreshed:
+            logger.info(f"[Classement] {refreshed} classement(s) rafraîchi(s).")
+
+    @staticmethod
+    def build_embed(guild: discord.Guild, top: list[dict]) -> discord.Embed:
+        embed = discord.Embed(
+            title=f"🏆 Classement Puissance 4 · {guild.name}",
+            color=discord.Color.gold()
+        )
+        if not top:
+            embed.description = "Aucune partie classée pour l'instant. Lance `/puissance4` !"
+            return embed
+
+        lines = []
+        for rank, doc in enumerate(top, 1):
+            prefix = MEDALS[rank - 1] if rank <= len(MEDALS) else f"**{rank}.**"
+            lines.append(
+                f"{prefix} <@{doc['user_id']}> — **{round(doc['rating'])}** "
+                f"({doc.get('wins', 0)}V / {doc.get('losses', 0)}D / {doc.get('draws', 0)}N)"
+            )
+        embed.description = "\n".join(lines)
+        embed.set_footer(text="Elo mis à jour toutes les minutes · V/D/N : victoires, défaites, nuls")
+        return embed
+
+    @app_commands.command(name="classement", description="Affiche le classement Elo du Puissance 4 du serveur")
+    async def classement(self, interaction: discord.Interaction):
+        guild = interaction.guild
+        if guild is None:
+            await interaction.response.send_message("❌ Le classement n'existe que sur un serveur.", ephemeral=True)
+            return
+
+        top = leaderboard.cached_top(guild.id)
+        if top is not None:
+            await interaction.response.send_message(embed=self.build_embed(guild, top))
+            return
+
+        # Premier appel sur ce serveur : lecture MongoDB, puis cache
+        await interaction.response.defer()
+        top = await leaderboard.top(guild.id)
+        await interaction.followup.send(embed=self.build_embed(guild, top))
+
+async def setup(bot):
+    await bot.add_cog(Classement(bot))
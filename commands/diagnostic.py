@@ -0,0 +1,46 @@
+import io
+import discord
+from discord.ext import commands
+from discord import app_commands
+import logging
+
+from commands.sync_cmds import OWNER_ID
+from loop_watchdog import watchdog
+
+logger = logging.getLogger(__name__)
+
+class Diagnostic(commands.Cog):
+    """Profilage de la boucle asyncio en production, réservé au propriétaire."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.profiling = False
+
+    @app_commands.command(name="profil", description="Échantillonne la boucle du bot pendant N secondes (propriétaire)")
+    @app_commands.describe(secondes="Durée de l'échantillonnage")
+    async def profil(self, interaction: discord.Interaction, secondes: app_commands.Range[int, 1, 120] = 10):
+        if interaction.user.id != OWNER_ID:
+            await interaction.response.send_message("❌ Tu n'as pas la permission d'utiliser cette commande.", ephemeral=True)
+            return
+        if self.profiling:
+            await interaction.response.send_message("⏳ Un profilage est déjà en cours.", ephemeral=True)
+            return
+
+        self.profiling = True
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        try:
+            logger.info(f"[Diagnostic] Profilage de la boucle pendant {secondes} s.")
+            report = await watchdog.profile(secondes)
+        finally:
+            self.profiling = False
+
+        lag = watchdog.metrics()
+        summary = (
+            f"📈 Profil sur {secondes} s · retard de boucle {lag['last_ms']} ms "
+            f"(max {lag['max_ms']} ms sur 1 min) · {lag['stalls']} blocage(s) depuis le démarrage"
+        )
+        report_file = discord.File(io.BytesIO(report.encode("utf-8")), filename="profil.txt")
+        await interaction.followup.send(summary, file=report_file, ephemeral=True)
+
+async def setup(bot):
+    await bot.add_cog(Diagnostic(bot))
@@ -1,15 +1,15 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from db import users_collection
+from db import user_writes, update_user, WriteBehindBuffer
 import logging
 
 logger = logging.getLogger(__name__)
 
 class DropdownView(discord.ui.View):
-    def __init__(self, users_collection):
+    def __init__(self, user_writes: WriteBehindBuffer):
         super().__init__()
-        self.users_collection = users_collection
+        self.user_writes = user_writes
 
     @discord.ui.select(
         placeholder="Choisis une option...",
@@ -23,27 +23,26 @@ class DropdownView(discord.ui.View):
         choice = select.values[0]
         user_id = interaction.user.id
 
-        try:
-            result = await self.users_collection.update_one(
-                {"user_id": user_id},
-                {"$set": {"last_choice": choice}},
-                upsert=True
-            )
-            logger.info(f"User {user_id} choice saved in DB. Matched: {result.matched_count}, Modified: {result.modified_count}")
-        except Exception as e:
-            logger.error(f"Failed to save choice for user {user_id}: {e}")
+        # Aucune attente MongoDB avant la réponse : l'écriture est différée et groupée
+        update_user(user_id, {"last_choice": choice})
+        logger.info(f"User {user_id} choice queued for DB. Queue depth: {self.user_writes.queue_depth}")
 
         await interaction.response.send_message(f"Tu as choisi : {choice} !", ephemeral=True)
 
 class Menu(commands.Cog):
-    def __init__(self, bot, users_collection):
+    def __init__(self, bot, user_writes: WriteBehindBuffer):
         self.bot = bot
-        self.users_collection = users_collection
+        self.user_writes = user_writes
+
+    async def cog_unload(self):
+        # Appelé aussi par bot.close() : les choix en attente sont écrits avant l'arrêt
+        await self.user_writes.stop()
+        logger.info(f"Pending user writes flushed. Metrics: {self.user_writes.metrics()}")
 
     @app_commands.command(name="menu", description="Commande avec un menu déroulant")
     async def menu(self, interaction: discord.Interaction):
-        view = DropdownView(self.users_collection)
+        view = DropdownView(self.user_writes)
         await interaction.response.send_message("Choisis une option dans le menu :", view=view)
 
 async def setup(bot):
-    await bot.add_cog(Menu(bot, users_collection))
+    await bot.add_cog(Menu(bot, user_writes))
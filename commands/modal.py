@@ -1,7 +1,17 @@
+import datetime
+from typing import Any, Optional
+
 import discord
 from discord import app_commands
 from discord.ext import commands
 
+import db
+from commands.sync_cmds import OWNER_ID
+from feedback import inbox
+
+# Feedbacks affichés par page de /feedback_list
+PAGE_SIZE = 5
+
 class FeedbackModal(discord.ui.Modal, title="Envoyer un feedback"):
     sujet = discord.ui.TextInput(label="Sujet", placeholder="Le sujet de ton message", max_length=50)
     message = discord.ui.TextInput(label="Message", style=discord.TextStyle.paragraph, placeholder="Écris ton message ici...", max_length=500)
@@ -10,19 +20,116 @@ class FeedbackModal(discord.ui.Modal, title="Envoyer un feedback"):
         super().__init__()
 
     async def on_submit(self, interaction: discord.Interaction):
-        # Tu peux ici traiter les données (par ex. envoyer dans un channel, base, etc.)
+        # Mis en file puis inséré par lots dans MongoDB (feedback.py)
         sujet = self.sujet.value
         message = self.message.value
+        refusal = inbox.submit(interaction.user.id, interaction.guild_id, sujet, message)
+        if refusal:
+            await interaction.response.send_message(refusal, ephemeral=True)
+            return
         await interaction.response.send_message(f"Merci pour ton feedback !\n**Sujet:** {sujet}\n**Message:** {message}", ephemeral=True)
 
+class FeedbackPages(discord.ui.View):
+    """Pages de /feedback_list, du plus récent au plus ancien.
+
+    ``starts`` garde la clé ``(created_at, _id)`` qui précède chaque page déjà
+    vue : « Suivant » repart de la dernière clé affichée, « Précédent »
+    relit la page d'avant depuis sa clé, sans ``skip()``.
+    """
+
+    def __init__(self, owner_id: int):
+        super().__init__(timeout=300)
+        self.owner_id = owner_id
+        self.starts: list[Optional[tuple[Any, Any]]] = [None]
+        self.docs: list[dict] = []
+        self.has_next = False
+        self.message: Optional[discord.WebhookMessage] = None
+
+    async def load(self) -> bool:
+        """Lit la page courante (une de plus pour savoir s'il y a une suite) ; False si MongoDB ne répond pas."""
+        docs = await db.load_feedback_page(self.starts[-1], PAGE_SIZE + 1)
+        if docs is None:
+            return False
+        self.docs, self.has_next = docs[:PAGE_SIZE], len(docs) > PAGE_SIZE
+        self.previous_page.disabled = len(self.starts) == 1
+        self.next_page.disabled = not self.has_next
+        return True
+
+    def embed(self) -> discord.Embed:
+        embed = discord.Embed(title=f"📬 Feedbacks · page {len(self.starts)}", color=discord.Color.blurple())
+        if not self.docs:
+            embed.description = "Aucun feedback."
+        for doc in self.docs:
+            created_at = doc["created_at"]
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=datetime.timezone.utc)
+            embed.add_field(
+                name=doc["subject"][:256],
+                value=f"{doc['message'][:900]}\n— <@{doc['user_id']}> · <t:{int(created_at.timestamp())}:f>",
+                inline=False,
+            )
+        return embed
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.owner_id
+
+    async def show(self, interaction: discord.Interaction) -> None:
+        if not await self.load():
+            await interaction.response.send_message("❌ Base de données indisponible, réessaie plus tard.", ephemeral=True)
+            return
+        await interaction.response.edit_message(embed=self.embed(), view=self)
+
+    @discord.ui.button(emoji="◀️", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, _):
+        if len(self.starts) > 1:
+            self.starts.pop()
+        await self.show(interaction)
+
+    @discord.ui.button(emoji="▶️", style=discord.ButtonStyle.primary)
+    async def next_page(self, interaction: discord.Interaction, _):
+        if self.has_next and self.docs:
+            last = self.docs[-1]
+            self.starts.append((last["created_at"], last["_id"]))
+        await self.show(interaction)
+
+    async def on_timeout(self):
+        for child in self.children:
+            if isinstance(child, discord.ui.Button):
+                child.disabled = True
+        if self.message:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
+
 class Modals(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    async def cog_load(self):
+        await db.ensure_feedback_indexes()
+
+    async def cog_unload(self):
+        """Écrit les feedbacks en attente avant l'arrêt (appelé aussi par ``bot.close``)."""
+        await inbox.stop()
+
     @app_commands.command(name="feedback", description="Envoie un feedback au bot.")
     async def feedback(self, interaction: discord.Interaction):
         modal = FeedbackModal()
         await interaction.response.send_modal(modal)
 
+    @app_commands.command(name="feedback_list", description="Parcourt les feedbacks reçus (propriétaire)")
+    async def feedback_list(self, interaction: discord.Interaction):
+        if interaction.user.id != OWNER_ID:
+            await interaction.response.send_message("❌ Tu n'as pas la permission d'utiliser cette commande.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        view = FeedbackPages(interaction.user.id)
+        if not await view.load():
+            await interaction.followup.send("❌ Base de données indisponible, réessaie plus tard.", ephemeral=True)
+            return
+        view.message = await interaction.followup.send(embed=view.embed(), view=view, ephemeral=True, wait=True)
+
 async def setup(bot):
     await bot.add_cog(Modals(bot))
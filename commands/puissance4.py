@@ -2,97 +2,129 @@
 # Importations
 # =========================================
 
-import traceback
+import os
+import re
+import sys
+import time
+import gzip
+import secrets
 import random
 import asyncio
-from datetime import datetime, timedelta, timezone
-from typing import Optional, cast
+import datetime
+import tempfile
+import logging
+import functools
+import itertools
+from dataclasses import dataclass
+from typing import Any, Callable, Coroutine, Iterable, Optional, Union, cast
 
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
+from bson import ObjectId
+from bson.errors import InvalidId
+
+import db
+import members
+import metrics
+from history import history, history_doc, export_ndjson
+from leaderboard import leaderboard
+from render_scheduler import EditableMessage, scheduler
+from timer_wheel import TimerWheel
+
+from engine import board as engine_board
+from engine import book
+from engine import solver
+from engine.grid import CONNECT_FOUR, GridSpec
+
+logger = logging.getLogger(__name__)
 
 # =========================================
 # Helper utils
 # =========================================
 
-async def edit_message(message: Optional[discord.Message], **kwargs) -> None:
+async def edit_message(message: Optional[EditableMessage], **kwargs) -> None:
+    """Programme l'édition du message via le planificateur de rendu.
+
+    Les éditions successives d'un même message sont fusionnées et envoyées
+    dans l'ordre, en respectant la limite d'éditions du salon.
+    """
     if not message:
         return
-    try:
-        await message.edit(**kwargs)
-    except (discord.NotFound, discord.Forbidden, discord.HTTPException) as e:
-        print(f"Erreur en éditant le message : {e}")
-        traceback.print_exc()
-
-def disable_all_buttons(view: discord.ui.View) -> None:
-    """Désactive tous les boutons d'une vue Discord."""
-    for child in view.children:
-        if isinstance(child, discord.ui.Button):
-            child.disabled = True
+    scheduler.submit(message, **kwargs)
 
 # =========================================
 # Constantes
 # =========================================
 
-ROWS: int = 6
-COLS: int = 7
-
 EMPTY_CELL: str = "<:null:1405700337611837460>"
 SPACER: str = "<:spacer:1408471845950324829>"
 
 PIECES: dict[str, str] = {"p1": "🔴", "p2": "🔵"}
 COLORS: dict[str, discord.Color] = {"p1": discord.Color(0xD22D39), "p2": discord.Color.blue()}
 
-EMOJIS: list[str] = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "6️⃣", "7️⃣"]
+EMOJIS: list[str] = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "6️⃣", "7️⃣", "8️⃣", "9️⃣", "🔟"]
+
+# Tailles de Puissance N : une colonne par bouton (custom_id à un chiffre), 10 au plus
+GRID_MIN: int = 4
+GRID_MAX: int = len(EMOJIS)
+
+# Inactivité (en secondes) après laquelle une partie est déchargée de la mémoire (0 = jamais)
+IDLE_EVICT_SECONDS: int = int(os.getenv("P4_IDLE_EVICT", "0"))
+
+# Plafonds de parties (invitations comprises) ; 0 = pas de limite
+MAX_GAMES_PER_PLAYER: int = int(os.getenv("P4_MAX_PER_PLAYER", "3"))
+MAX_GAMES_PER_CHANNEL: int = int(os.getenv("P4_MAX_PER_CHANNEL", "5"))
+MAX_GAMES_PER_GUILD: int = int(os.getenv("P4_MAX_PER_GUILD", "200"))
+MAX_GAMES: int = int(os.getenv("P4_MAX_GAMES", "10000"))
+# Délai après l'échéance au-delà duquel une partie encore indexée est abandonnée
+ABANDON_GRACE_SECONDS: int = int(os.getenv("P4_ABANDON_GRACE", "300"))
+# Joueurs hors cache de discord.py (fetch_user) gardés pour les rechargements : taille et durée (s)
+PLAYER_CACHE_SIZE: int = int(os.getenv("P4_PLAYER_CACHE", "1000"))
+PLAYER_CACHE_TTL: float = float(os.getenv("P4_PLAYER_CACHE_TTL", "600"))
+# Délai avant de retenter le rechargement d'une partie après une erreur HTTP (joueur non résolu)
+RELOAD_RETRY_SECONDS: int = int(os.getenv("P4_RELOAD_RETRY", "60"))
+
+PIECE_LIST: list[str] = [PIECES["p1"], PIECES["p2"]]
+PIECE_INDEX: dict[str, int] = {piece: i for i, piece in enumerate(PIECE_LIST)}
+COLOR_LIST: list[discord.Color] = [COLORS["p1"], COLORS["p2"]]
+
+PlayerT = Union[discord.Member, discord.User, discord.ClientUser]
+
+# Export de l'historique : au-delà, le fichier compressé passe de la mémoire au disque
+EXPORT_SPOOL_BYTES: int = 1024 * 1024
 
 # =========================================
 # Plateau
 # =========================================
 
-class Board:
-    """Représente le plateau du Puissance 4 et gère les placements et vérifications."""
+class Board(engine_board.Board):
+    """Plateau du Puissance 4 (ou d'un Puissance N) manipulé avec les emojis des joueurs.
 
-    def __init__(self):
-        """Initialise une grille vide de dimensions ROWS x COLS."""
-        self.grid: list[list[str]] = [[EMPTY_CELL for _ in range(COLS)] for _ in range(ROWS)]
+    Le stockage (bitboards) et la détection de victoire sont dans
+    ``engine.grid`` ; les emojis ne sont produits qu'au rendu.
+    """
+
+    __slots__ = ()
 
     def drop_piece(self, col: int, piece: str) -> bool:
         """Place une pièce dans la colonne spécifiée si possible."""
-        if not 0 <= col < COLS:
-            return False
-        for row in reversed(self.grid):
-            if row[col] == EMPTY_CELL:
-                row[col] = piece
-                return True
-        return False
+        return self.play(col, PIECE_INDEX[piece])
 
     def check_win(self, piece: str) -> bool:
         """Vérifie si le joueur avec la pièce donnée a gagné."""
-        # Horizontale
-        for r in range(ROWS):
-            for c in range(COLS - 3):
-                if all(self.grid[r][c + i] == piece for i in range(4)):
-                    return True
-        # Verticale
-        for r in range(ROWS - 3):
-            for c in range(COLS):
-                if all(self.grid[r + i][c] == piece for i in range(4)):
-                    return True
-        # Diagonale ↘
-        for r in range(ROWS - 3):
-            for c in range(COLS - 3):
-                if all(self.grid[r + i][c + i] == piece for i in range(4)):
-                    return True
-        # Diagonale ↙
-        for r in range(3, ROWS):
-            for c in range(COLS - 3):
-                if all(self.grid[r - i][c + i] == piece for i in range(4)):
-                    return True
-        return False
-
-    def is_full(self) -> bool:
-        """Retourne True si le plateau est rempli (match nul)."""
-        return all(self.grid[0][c] != EMPTY_CELL for c in range(COLS))
+        return self.has_won(PIECE_INDEX[piece])
+
+    def piece_at(self, row: int, col: int) -> str:
+        """Retourne l'emoji de la case (ligne 0 = haut du plateau)."""
+        player = self.cell(row, col)
+        return EMPTY_CELL if player is None else PIECE_LIST[player]
+
+
+@functools.cache
+def grid_spec(rows: int, cols: int, connect: int) -> GridSpec:
+    """Variante « Puissance N » ; ``CONNECT_FOUR`` pour la taille classique (ValueError si impossible)."""
+    spec = GridSpec(f"Puissance {connect}", rows, cols, connect)
+    return CONNECT_FOUR if spec == CONNECT_FOUR else spec
 
 
 # =========================================
@@ -103,84 +135,89 @@ class EmbedBuilder:
     """Génère des embeds Discord pour le jeu Puissance 4."""
 
     @staticmethod
-    def board_display(view: "Puissance4View") -> str:
+    def board_display(game: "GameState") -> str:
         """Retourne le plateau sous forme de chaîne avec emojis."""
-        header = " ".join(EMOJIS)
-        arrows = " ".join("🔻" if view.last_move == i else SPACER for i in range(COLS))
-        grid = "\n".join(" ".join(row) for row in view.board.grid)
+        spec = game.board.spec
+        header = " ".join(EMOJIS[:spec.cols])
+        arrows = " ".join("🔻" if game.last_move == i else SPACER for i in range(spec.cols))
+        grid = "\n".join(
+            " ".join(game.board.piece_at(r, c) for c in range(spec.cols)) for r in range(spec.rows)
+        )
 
         return f"{header}\n{arrows}\n{grid}"
 
     @staticmethod
-    def status_message(view: "Puissance4View") -> str:
+    def status_message(game: "GameState") -> str:
         """Retourne le message de statut du jeu."""
-        if view.winner:
+        if game.winner is not None:
             timeout_msg = (
-                "⏳ Timeout. Partie terminée.\n" 
-                if view.winner != view.player_turn else ""
+                "⏳ Timeout. Partie terminée.\n"
+                if game.winner != game.player_turn else ""
             )
-            return f"{timeout_msg}**🎉 {view.winner.mention} a gagné !**"
+            return f"{timeout_msg}**🎉 {game.players[game.winner].mention} a gagné !**"
 
-        if view.draw:
+        if game.draw:
             return "🤝 Match nul !"
 
-        piece = view.pieces[view.player_turn.id]
-        return f"{piece} Tour de {view.player_turn.mention}"
-    
+        piece = PIECE_LIST[game.player_turn]
+        if game.is_bot_turn:
+            return f"{piece} {game.current.mention} réfléchit..."
+        return f"{piece} Tour de {game.current.mention}"
+
     @staticmethod
-    def timeout_timestamp(view: "Puissance4View") -> str:
+    def timeout_timestamp(game: "GameState") -> str:
         """Retourne le timestamp Discord pour la fin du tour, vide si terminé."""
-        if view.winner or view.draw:
+        if game.winner is not None or game.draw:
             return ""
-        
-        turn_end_time = datetime.now(timezone.utc) + timedelta(seconds=view.TURN_TIMEOUT)
-        timestamp = int(turn_end_time.timestamp())
 
-        return f"\n🕐 Fin du tour <t:{timestamp}:R>"
+        return f"\n🕐 Fin du tour <t:{int(game.deadline)}:R>"
 
     @staticmethod
-    def score_display(view: "Puissance4View") -> str:
+    def score_display(game: "GameState") -> str:
         """Affiche le score des deux joueurs."""
-        p1, p2 = view.players
+        p1, p2 = game.players
         return (
             f"**🏆 Victoires :**\n"
-            f"- {p1.mention} : **{view.scores[p1.id]}**\n"
-            f"- {p2.mention} : **{view.scores[p2.id]}**"
+            f"- {p1.mention} : **{game.scores[0]}**\n"
+            f"- {p2.mention} : **{game.scores[1]}**"
         )
 
     @staticmethod
-    def color_and_thumbnail(view: "Puissance4View") -> tuple[discord.Color, str]:
-        color = view.colors[view.player_turn.id]
-        thumbnail = view.player_turn.display_avatar.replace(size=32).url
+    def color_and_thumbnail(game: "GameState") -> tuple[discord.Color, str]:
+        color = COLOR_LIST[game.player_turn]
+        thumbnail = game.current.display_avatar.replace(size=32).url
 
-        if view.winner:
+        if game.winner is not None:
             color = discord.Color.green()
             thumbnail = "https://i.imgur.com/i0YzRG0.png"
-        elif view.draw:
+        elif game.draw:
             color = discord.Color.greyple()
             thumbnail = "https://i.imgur.com/kNr6XvV.png"
 
         return color, thumbnail
 
     @staticmethod
-    def game_embed(view: "Puissance4View") -> discord.Embed:
-        color, thumb = EmbedBuilder.color_and_thumbnail(view)
+    def game_embed(game: "GameState") -> discord.Embed:
+        color, thumb = EmbedBuilder.color_and_thumbnail(game)
+        title = f"✦━─ {EmbedBuilder.variant_name(game.board.spec)} ─━✦"
+        if game.difficulty:
+            title += f" · {solver.DIFFICULTIES[game.difficulty].label}"
         return (
             discord.Embed(
-                title="✦━─ Puissance 4 ─━✦",
+                title=title,
                 description=(
-                    f"{EmbedBuilder.board_display(view)}\n\n"
-                    f"{EmbedBuilder.status_message(view)}"
-                    f"{EmbedBuilder.timeout_timestamp(view)}\n\n"
-                    f"{EmbedBuilder.score_display(view)}"
+                    f"{EmbedBuilder.board_display(game)}\n\n"
+                    f"{EmbedBuilder.status_message(game)}"
+                    f"{EmbedBuilder.timeout_timestamp(game)}\n\n"
+                    f"{EmbedBuilder.score_display(game)}"
                 ),
                 color=color,
             )
             .set_thumbnail(url=thumb)
         )
-    
+
     @staticmethod
-    def rejection_embed(player: discord.Member, confirmed: Optional[bool]) -> discord.Embed:
+    def rejection_embed(player: PlayerT, confirmed: Optional[bool]) -> discord.Embed:
         """Embed affiché si l'invitation est refusée ou expirée."""
         if confirmed is False:
             title = "❌ Invitation refusée"
@@ -190,307 +227,1105 @@ class EmbedBuilder:
             title = "⌛ Invitation expirée"
             description = f"{player.mention} n'a pas répondu à temps."
             color = discord.Color.light_grey()
-        
+
         return discord.Embed(title=title, description=description, color=color)
 
     @staticmethod
-    def invitation_embed(player1: discord.Member) -> discord.Embed:
+    def variant_name(spec: GridSpec) -> str:
+        """« Puissance 4 », ou « Puissance N · lignes×colonnes » pour une autre taille."""
+        if spec == CONNECT_FOUR:
+            return spec.name
+        return f"{spec.name} · {spec.rows}×{spec.cols}"
+
+    @staticmethod
+    def invitation_embed(player1: PlayerT, spec: GridSpec = CONNECT_FOUR) -> discord.Embed:
         """Embed pour inviter un joueur à une partie."""
         return discord.Embed(
-            title="Souhaitez-vous jouer au Puissance 4 ?",
+            title=f"Souhaitez-vous jouer au {EmbedBuilder.variant_name(spec)} ?",
             description=f"{player1.mention} souhaite faire une partie avec vous.",
             color=discord.Color.blurple()
         )
 
-
-# =========================================
-# ButtonManager – gestion boutons
-# =========================================
-
-class ButtonManager:
-    """Gère l'initialisation et la mise à jour des boutons pour le jeu."""
-
     @staticmethod
-    def init_buttons(view: "Puissance4View"):
-        """Crée les boutons pour chaque colonne et les ajoute à la vue."""
-        view.clear_items()
-        for i in range(COLS):
-            view.add_item(Puissance4Button(i, view, row=0 if i < 4 else 1))
+    def replay_embed(replay: "ReplayView") -> discord.Embed:
+        """Embed d'une position de l'historique, avec le coup qui y a mené."""
+        record = replay.record
+        players = record["players"]
+        total = len(replay.moves)
+        if replay.ply == total and record.get("draw"):
+            status = "🤝 Match nul !"
+        elif replay.ply == total and record.get("winner") is not None:
+            timeout = " (timeout)" if record.get("timeout") else ""
+            status = f"🎉 <@{players[record['winner']]}> a gagné{timeout} !"
+        elif replay.ply == 0:
+            status = "Début de la partie"
+        else:
+            player = (replay.first + replay.ply - 1) % 2
+            status = f"{PIECE_LIST[player]} <@{players[player]}> joue {EMOJIS[replay.moves[replay.ply - 1]]}"
 
-    @staticmethod
-    def get_button_style(view: "Puissance4View") -> discord.ButtonStyle:
-        """Retourne la couleur des boutons des colonnes selon le joueur actuel"""
-        return (
-            discord.ButtonStyle.danger
-            if view.player_turn == view.players[0]
-            else discord.ButtonStyle.primary
+        ended = record["ended"]
+        if ended.tzinfo is None:
+            ended = ended.replace(tzinfo=datetime.timezone.utc)
+        return discord.Embed(
+            title=f"🎞️ {EmbedBuilder.variant_name(replay.board.spec)} · Revoir",
+            description=(
+                f"{EmbedBuilder.board_display(replay)}\n\n"
+                f"**Coup {replay.ply}/{total}** · {status}\n\n"
+                f"{PIECE_LIST[0]} <@{players[0]}> · {PIECE_LIST[1]} <@{players[1]}>"
+            ),
+            color=discord.Color.dark_teal(),
+            timestamp=ended,
         )
 
-    @staticmethod
-    def update_buttons(view: "Puissance4View"):
-        """Active/désactive et colore les boutons selon le joueur actuel et l'état du plateau."""
-        style = ButtonManager.get_button_style(view)
-        for button in view.children:
-            if isinstance(button, Puissance4Button):
-                button.disabled = view.board.grid[0][button.col] != EMPTY_CELL
-                button.style = style
 
 # =========================================
-# Puissance4View – fusion GameState + View
+# GameButton – custom_id dynamiques
 # =========================================
 
-class Puissance4View(discord.ui.View):
-    """Représente l'état d'une partie de Puissance 4 et la vue interactive Discord."""
-
-    TURN_TIMEOUT = 120
+# p4:<partie>:col:<colonne>:<séquence> ou p4:<partie>:<action>:<séquence>
+# (les custom_id sans séquence, d'avant le routage dynamique, restent acceptés)
+CUSTOM_ID_TEMPLATE: str = r"p4:(?P<game>[0-9a-f]+):(?:col:(?P<col>[0-9])|(?P<action>[a-z]+))(?::(?P<seq>[0-9]+))?"
 
-    def __init__(self, p1: discord.Member, p2: discord.Member, scores: Optional[dict] = None):
-        """Initialise la partie, le plateau, les joueurs, les couleurs, et les boutons."""
-        super().__init__(timeout=self.TURN_TIMEOUT)
+# Actions possibles selon le type de partie
+ACTIONS: dict[str, tuple[str, ...]] = {
+    "invite": ("confirm", "cancel"),
+    "game": ("col", "hint"),
+    "end": ("replay", "stop"),
+}
 
-        self.board = Board()
-        self.players = [p1, p2]
-        self.player_turn = random.choice(self.players)
-        self.pieces = {p1.id: PIECES["p1"], p2.id: PIECES["p2"]}
-        self.colors = {p1.id: COLORS["p1"], p2.id: COLORS["p2"]}
-        self.scores = scores or {p1.id: 0, p2.id: 0}
-
-        self.last_move: Optional[int] = None
-        self.winner: Optional[discord.Member] = None
-        self.draw: bool = False
 
-        self.message: Optional[discord.Message] = None
-        self.lock = asyncio.Lock()
+class GameButton(discord.ui.DynamicItem[discord.ui.Button], template=CUSTOM_ID_TEMPLATE):
+    """Bouton d'une partie, routé par son custom_id vers l'état du ``GameStore``.
 
-        ButtonManager.init_buttons(self)
-        ButtonManager.update_buttons(self)
+    Un seul gestionnaire est enregistré (``bot.add_dynamic_items``) pour toutes
+    les parties : entre deux clics, aucune vue ni aucun bouton n'est gardé en
+    mémoire. Le custom_id porte l'ID de la partie, l'action (ou la colonne) et
+    le numéro de séquence de l'état affiché.
+    """
 
-    async def interaction_check(self, interaction: discord.Interaction) -> bool:
-        """Vérifie que seul le joueur du tour peut interagir avec la vue."""
-        if interaction.user != self.player_turn:
-            await interaction.response.send_message(
-                "⏳ Ce n'est pas ton tour.", ephemeral=True
-            )
-            return False
-        return True
-
-    async def play_turn(self, col: int):
-        """Joue un tour pour le joueur courant dans la colonne spécifiée."""
-        async with self.lock:
-            piece = self.pieces[self.player_turn.id]
-            if not self.board.drop_piece(col, piece):
-                return
-
-            self.last_move = col
-
-            if self._check_game_end(piece):
-                await self._end_game()
-                return
-            
-            self.switch_turn()
-            ButtonManager.update_buttons(self)
-            await self.refresh_message()
-
-    def _check_game_end(self, piece: str) -> bool:
-        """Vérifie si la partie est terminée (victoire ou match nul)."""
-        if self.board.check_win(piece):
-            self.winner = self.player_turn
-            return True
-        if self.board.is_full():
-            self.draw = True
-            return True
-        return False
-
-    async def _end_game(self):
-        """Met fin à la partie et met à jour le score si nécessaire."""
-        if self.winner:
-            self.scores[self.winner.id] += 1
-        self.stop()
-        await self.refresh_message(EndgameView(self))
-
-    def switch_turn(self):
-        """Change le joueur courant pour le tour suivant."""
-        self.player_turn = self.players[1 - self.players.index(self.player_turn)]
-
-    async def refresh_message(self, view: Optional[discord.ui.View] = None):
-        """Met à jour le message Discord avec le plateau et la vue actuelle."""
-        await edit_message(
-            self.message,
-            embed=EmbedBuilder.game_embed(self),
-            view=view or self
+    def __init__(self, game_id: str, action: str, col: Optional[int] = None, seq: Optional[int] = None, **kwargs):
+        self.game_id = game_id
+        self.action = action
+        self.col = col
+        self.seq = seq
+        custom_id = f"p4:{game_id}:" + (f"col:{col}" if action == "col" else action)
+        if seq is not None:
+            custom_id += f":{seq}"
+        super().__init__(discord.ui.Button(custom_id=custom_id, **kwargs))
+
+    @classmethod
+    def make(cls, game: "GameState", action: str, col: Optional[int] = None, **kwargs) -> "GameButton":
+        """Bouton de ``game`` pour son état courant."""
+        return cls(game.game_id, action, col, game.seq, **kwargs)
+
+    @classmethod
+    async def from_custom_id(
+        cls, interaction: discord.Interaction, item: discord.ui.Button, match: re.Match[str]
+    ) -> "GameButton":
+        col, seq = match["col"], match["seq"]
+        return cls(
+            match["game"],
+            "col" if col is not None else match["action"],
+            int(col) if col is not None else None,
+            int(seq) if seq is not None else None,
         )
 
-    async def on_timeout(self):
-        """Gère la fin du tour si le joueur n'a pas joué à temps."""
-        async with self.lock:
-            if not (self.winner or self.draw):
-                self.winner = next(p for p in self.players if p != self.player_turn)
-            await self._end_game()
+    async def callback(self, interaction: discord.Interaction) -> None:
+        """Retrouve la partie (rechargée depuis MongoDB si déchargée) et lui transmet le clic."""
+        game = store.games.get(self.game_id) or await store.reload(self.game_id)
+        if game is None:
+            if self.game_id in store.evicted:
+                # Joueur non résolu (erreur passagère de l'API) : la partie est gardée
+                await interaction.response.send_message("⚠️ Partie momentanément indisponible, réessaie.", ephemeral=True)
+                return
+            await interaction.response.send_message("⌛ Cette partie n'existe plus.", ephemeral=True)
+            return
+        await game.handle(interaction, self.action, self.col, self.seq)
 
 
 # =========================================
-# Puissance4Button – bouton colonne
+# GameState – état compact d'une partie
 # =========================================
 
-class Puissance4Button(discord.ui.Button):
-    """Bouton représentant une colonne pour déposer une pièce."""
+class GameState:
+    """État compact d'une partie : invitation, partie en cours ou écran de fin.
+
+    Aucune vue discord.py n'est gardée : les composants sont reconstruits à
+    chaque rendu (``components``) et les clics arrivent par ``GameButton``.
+    ``seq`` augmente à chaque changement d'état et figure dans les custom_id :
+    un clic sur un état périmé (tour précédent, double clic) est refusé par
+    simple comparaison, sans verrou. Chaque action modifie l'état avant son
+    premier ``await`` ; le clic suivant voit donc déjà le nouveau ``seq``.
+
+    L'échéance (``deadline``, timestamp UNIX) est stockée avec la partie ;
+    c'est elle qu'affiche l'embed et que programme la roue temporelle du
+    ``GameStore`` (``expire``).
+    """
+
+    __slots__ = (
+        "game_id", "kind", "players", "player_turn", "scores", "difficulty", "board",
+        "last_move", "winner", "draw", "seq", "deadline", "message", "last_activity",
+        "first", "moves", "started",
+    )
+
+    TIMEOUT: int = 120
+
+    def __init__(
+        self,
+        game_id: str,
+        kind: str,
+        players: tuple[PlayerT, PlayerT],
+        difficulty: Optional[str] = None,
+        deadline: Optional[float] = None,
+        spec: GridSpec = CONNECT_FOUR,
+    ):
+        """Initialise une partie (ou une invitation) ; ``player_turn`` est tiré au sort.
+
+        Si ``difficulty`` est fourni, le second joueur est BotRonron et ses
+        coups sont calculés par le solveur (``engine.solver``, 6×7 seulement).
+        ``spec`` donne la taille du plateau et la longueur d'alignement.
+        """
+        self.game_id = game_id
+        self.kind = kind
+        self.players = players
+        self.player_turn = random.randrange(2)
+        self.first = self.player_turn
+        self.moves = bytearray()  # une colonne par coup (historique)
+        self.started = time.time()
+        self.scores = [0, 0]
+        self.difficulty = difficulty
+        self.board = Board(spec)
+        self.last_move: Optional[int] = None
+        self.winner: Optional[int] = None
+        self.draw = False
+        self.seq = 0
+        self.deadline = deadline or time.time() + self.TIMEOUT
+        self.message: Optional[EditableMessage] = None
+        self.last_activity = time.monotonic()
+
+    # === Propriétés ===
+
+    @property
+    def current(self) -> PlayerT:
+        """Joueur dont c'est le tour."""
+        return self.players[self.player_turn]
+
+    @property
+    def is_bot_turn(self) -> bool:
+        """True si c'est à BotRonron de jouer."""
+        return self.difficulty is not None and self.player_turn == 1
+
+    @property
+    def player_ids(self) -> tuple[int, ...]:
+        """Joueurs de la partie (invitant puis invité)."""
+        return tuple(p.id for p in self.players)
+
+    @property
+    def guild_id(self) -> Optional[int]:
+        """Serveur de la partie, déduit de son message."""
+        message = self.message
+        if message is None:
+            return None
+        if message.guild:
+            return message.guild.id
+        return getattr(message.channel, "guild_id", None)
+
+    @property
+    def channel_id(self) -> Optional[int]:
+        return self.message.channel.id if self.message else None
+
+    # === Sérialisation ===
+
+    def to_doc(self) -> dict:
+        """Sérialise la partie pour MongoDB : bitboards, joueurs, tour, scores et échéance."""
+        message = self.message
+        doc = {
+            "_id": self.game_id,
+            "v": time.time_ns(),
+            "kind": self.kind,
+            "guild_id": self.guild_id,
+            "channel_id": self.channel_id,
+            "message_id": message.id if message else None,
+            "deadline": self.deadline,
+            "players": list(self.player_ids),
+            "seq": self.seq,
+        }
+        spec = self.board.spec
+        if spec != CONNECT_FOUR:
+            doc["grid"] = [spec.rows, spec.cols, spec.connect]
+        if self.kind != "invite":
+            doc.update({
+                "board": list(self.board.bitboards),
+                "moves": bytes(self.moves),
+                "first": self.first,
+                "started": self.started,
+                "turn": self.player_turn,
+                "scores": list(self.scores),
+                "last_move": self.last_move,
+                "difficulty": self.difficulty,
+                "winner": self.winner,
+                "draw": self.draw,
+            })
+        return doc
+
+    @classmethod
+    def from_doc(cls, doc: dict, players: tuple[PlayerT, PlayerT]) -> "GameState":
+        """Recrée une partie à partir de son document MongoDB."""
+        spec = grid_spec(*doc["grid"]) if doc.get("grid") else CONNECT_FOUR
+        game = cls(doc["_id"], doc["kind"], players, doc.get("difficulty"), doc["deadline"], spec)
+        game.seq = doc.get("seq", 0)
+        if game.kind != "invite":
+            game.board = Board.from_bitboards(doc["board"], spec)
+            game.moves = bytearray(doc.get("moves", b""))
+            game.first = doc.get("first", 0)
+            game.started = doc.get("started", game.started)
+            game.player_turn = doc["turn"]
+            game.scores = list(doc["scores"])
+            game.last_move = doc.get("last_move")
+            game.winner = doc.get("winner")
+            game.draw = doc.get("draw", False)
+        return game
+
+    # === Échéance ===
+
+    def reset_deadline(self) -> None:
+        """Repousse l'échéance de ``TIMEOUT`` secondes."""
+        self.deadline = time.time() + self.TIMEOUT
+        self.arm_deadline()
+
+    def arm_deadline(self) -> None:
+        """(Re)programme l'appel à ``expire`` à l'échéance (O(1), sans tâche par partie)."""
+        store.deadlines.schedule(self.game_id, self.deadline)
+
+    async def expire(self) -> None:
+        """Échéance : invitation expirée, tour perdu par timeout ou écran de fin fermé."""
+        if store.games.get(self.game_id) is not self:
+            return
+        if self.kind == "invite":
+            await self.answer_invite(None)
+        elif self.kind == "game":
+            self.finish(1 - self.player_turn)
+            store.save(self)
+            await self.refresh_message()
+        else:
+            await self.close()
+
+    # === Rendu ===
+
+    def components(self, disabled: bool = False) -> discord.ui.View:
+        """Boutons du message pour l'état courant.
+
+        La vue est jetable : arrêtée avant d'être renvoyée, discord.py ne
+        l'enregistre pas et les clics passent par ``GameButton``.
+        """
+        view = discord.ui.View(timeout=None)
+        if self.kind == "game":
+            style = discord.ButtonStyle.danger if self.player_turn == 0 else discord.ButtonStyle.primary
+            cols = self.board.spec.cols
+            # Colonnes (puis indice) réparties sur deux rangées, cinq boutons par rangée au plus
+            per_row = min(5, (cols + 2) // 2)
+            for col in range(cols):
+                view.add_item(GameButton.make(
+                    self, "col", col, emoji=EMOJIS[col], style=style, row=col // per_row,
+                    disabled=disabled or self.board.is_column_full(col),
+                ))
+            if self.board.spec == CONNECT_FOUR:
+                view.add_item(GameButton.make(
+                    self, "hint", label="💡 Meilleur coup", style=discord.ButtonStyle.secondary,
+                    row=cols // per_row, disabled=disabled,
+                ))
+        elif self.kind == "end":
+            view.add_item(GameButton.make(self, "replay", label="🔄 Rejouer", style=discord.ButtonStyle.success, disabled=disabled))
+            view.add_item(GameButton.make(self, "stop", label="🛑 Arrêter", style=discord.ButtonStyle.danger, disabled=disabled))
+        else:
+            view.add_item(GameButton.make(self, "confirm", label="✅ Confirmer", style=discord.ButtonStyle.success, disabled=disabled))
+            view.add_item(GameButton.make(self, "cancel", label="❌ Annuler", style=discord.ButtonStyle.danger, disabled=disabled))
+        view.stop()
+        return view
+
+    async def refresh_message(self) -> None:
+        """Met à jour le message Discord avec le plateau et les boutons actuels."""
+        await edit_message(self.message, embed=EmbedBuilder.game_embed(self), view=self.components())
+
+    # === Clics ===
+
+    def refusal(self, user_id: int, action: str, col: Optional[int], seq: Optional[int]) -> Optional[str]:
+        """Motif du refus d'un clic (message éphémère), None s'il est accepté."""
+        stale = seq is not None and seq != self.seq
+        if stale or action not in ACTIONS[self.kind] or (action == "col" and col is None):
+            return "⌛ Ce bouton n'est plus à jour."
+        if action == "hint" and self.board.spec != CONNECT_FOUR:
+            return "💡 Pas d'indice pour cette taille de plateau."
+        if self.kind == "invite" and user_id != self.players[1].id:
+            return "❌ Seul l'adversaire invité peut cliquer."
+        if self.kind == "game" and user_id != self.current.id:
+            return "⏳ Ce n'est pas ton tour."
+        if self.kind == "end" and user_id not in self.player_ids:
+            return "🚫 Tu ne peux pas participer."
+        return None
+
+    async def handle(self, interaction: discord.Interaction, action: str, col: Optional[int], seq: Optional[int]) -> None:
+        """Applique le clic d'un joueur s'il vise l'état courant."""
+        refusal = self.refusal(interaction.user.id, action, col, seq)
+        if refusal:
+            await interaction.response.send_message(refusal, ephemeral=True)
+            return
 
-    def __init__(self, col: int, game_view: Puissance4View, row: int = 0):
-        """Initialise le bouton pour une colonne donnée et l'associe à la vue du jeu."""
-        super().__init__(emoji=EMOJIS[col], row=row)
-        self.col = col
-        self.game_view = game_view
+        if action == "col":
+            assert col is not None
+            await self.play_turn(interaction, col)
+        elif action == "hint":
+            # La recherche peut attendre le pool du solveur (coups de BotRonron) : acquittement d'abord
+            await interaction.response.defer(ephemeral=True, thinking=True)
+            hint = await self.best_move_hint()
+            if hint is None:
+                await interaction.followup.send("❌ Analyse indisponible, réessaie dans un instant.", ephemeral=True)
+                return
+            col, source = hint
+            await interaction.followup.send(f"💡 Meilleur coup : {EMOJIS[col]} ({source})", ephemeral=True)
+        elif action in ("confirm", "cancel"):
+            await self.answer_invite(action == "confirm", interaction)
+        elif action == "replay":
+            await self.replay(interaction)
+        elif action == "stop":
+            await self.close(interaction)
+
+    # === Partie ===
+
+    def apply_move(self, col: int) -> bool:
+        """Pose la pièce du joueur courant ; retourne False si la colonne est pleine.
+
+        Synchrone : le coup, le changement de tour (ou la fin de partie) et
+        le nouveau ``seq`` sont en place avant que quoi que ce soit n'attende.
+        """
+        if not self.board.play(col, self.player_turn):
+            return False
+        self.moves.append(col)
+        self.last_move = col
+        self.seq += 1
+        if self.board.last_move_wins():
+            self.finish(self.player_turn)
+        elif self.board.is_full():
+            self.finish(None)
+        else:
+            self.player_turn = 1 - self.player_turn
+            self.reset_deadline()
+        store.save(self)
+        return True
 
-    async def callback(self, interaction: discord.Interaction):
-        """Déclenche le tour du joueur lorsqu'il clique sur le bouton."""
+    async def play_turn(self, interaction: discord.Interaction, col: int) -> None:
+        """Joue le coup du joueur courant, puis celui de BotRonron s'il y a lieu."""
+        played = self.apply_move(col)
         await interaction.response.defer()
-        await self.game_view.play_turn(self.col)
-
-# =========================================
-# EndgameView – fin de partie
-# =========================================
-
-class EndgameView(discord.ui.View):
-    """Vue interactive affichée à la fin d'une partie avec options Rejouer/Arrêter."""
-
-    def __init__(self, game_view: Puissance4View, timeout: int = 120):
-        """Initialise les boutons pour rejouer ou arrêter la partie."""
-        super().__init__(timeout=timeout)
-        self.game_view = game_view
-        self.add_item(RejouerButton(game_view))
-        self.add_item(ArreterButton(game_view))
-
-    async def interaction_check(self, interaction: discord.Interaction) -> bool:
-        """Vérifie que seuls les joueurs de la partie peuvent interagir."""
-        if interaction.user in self.game_view.players:
-            return True
-        await interaction.response.send_message(
-            "🚫 Tu ne peux pas participer.", ephemeral=True
-        )
-        return False
-
-    async def on_timeout(self):
-        """Désactive les boutons à l'expiration de la vue."""
-        self.stop()
-        disable_all_buttons(self)
-        await edit_message(self.game_view.message, view=self)
-
-
-class RejouerButton(discord.ui.Button):
-    """Bouton pour relancer une nouvelle partie avec les mêmes joueurs."""
-
-    def __init__(self, game_view: Puissance4View):
-        super().__init__(label="🔄 Rejouer", style=discord.ButtonStyle.success)
-        self.game_view = game_view
-
-    async def callback(self, interaction: discord.Interaction):
-        """Crée une nouvelle vue de jeu et remplace l'ancienne."""
-        if self.view:
-            self.view.stop()
-
-            new_view = Puissance4View(
-                *self.game_view.players,
-                scores=self.game_view.scores
-            )
-
-            new_view.message = self.game_view.message
+        if played:
+            await self.refresh_message()
+            await self.play_bot_turn()
 
-            await interaction.response.edit_message(
-                embed=EmbedBuilder.game_embed(new_view), 
-                view=new_view
+    async def play_bot_turn(self) -> None:
+        """Calcule le coup de BotRonron dans le pool de processus puis le joue."""
+        if self.kind != "game" or not self.is_bot_turn:
+            return
+        assert self.difficulty is not None
+        seq = self.seq
+        try:
+            result = await solver.best_move(self.board, 1, self.difficulty)
+            col = result.col
+            logger.info(
+                f"[P4] BotRonron ({self.difficulty}) joue {col} | profondeur {result.depth} | "
+                f"{result.nodes} nœuds en {result.elapsed * 1000:.0f} ms"
             )
+        except Exception:
+            logger.exception("Erreur du solveur, coup aléatoire joué.")
+            col = random.choice([c for c in range(self.board.spec.cols) if not self.board.is_column_full(c)])
+        # Partie expirée, arrêtée ou relancée pendant le calcul
+        if self.seq != seq or store.games.get(self.game_id) is not self:
+            return
+        if self.apply_move(col):
+            await self.refresh_message()
 
+    async def best_move_hint(self) -> Optional[tuple[int, str]]:
+        """Meilleur coup du joueur courant : base de positions, sinon recherche courte (None si le solveur échoue)."""
+        position, mask = self.board.position(self.player_turn)
+
+        position_book = book.get_book()
+        entry = position_book.lookup(position, mask) if position_book else None
+        if entry is not None:
+            return entry[0], "base de positions"
+
+        try:
+            result = await solver.best_move(self.board, self.player_turn, solver.HINT_DIFFICULTY)
+        except Exception:
+            logger.exception("Erreur du solveur pendant un indice.")
+            return None
+        return result.col, f"analyse à {result.depth} coups"
+
+    def finish(self, winner: Optional[int]) -> None:
+        """Termine la partie (``winner`` None : match nul) et passe à l'écran de fin."""
+        self.winner = winner
+        self.draw = winner is None
+        if winner is not None:
+            self.scores[winner] += 1
+        self.kind = "end"
+        self.seq += 1
+        self.reset_deadline()
+        self.record_result()
+        self.archive()
+
+    def archive(self) -> None:
+        """Ajoute la partie à l'historique (inséré par lots dans MongoDB)."""
+        # Partie restaurée d'avant l'historique : journal de coups incomplet
+        if len(self.moves) != self.board.moves:
+            return
+        history.record(history_doc(
+            self.game_id, self.guild_id, self.channel_id, self.player_ids, self.first, self.moves,
+            self.winner, self.winner is not None and self.winner != self.player_turn,
+            self.difficulty, self.started, self.board.spec,
+        ))
+
+    def record_result(self) -> None:
+        """Envoie le résultat au classement Elo (hors BotRonron et hors Puissance N)."""
+        guild_id = self.guild_id
+        if self.difficulty is not None or guild_id is None or self.board.spec != CONNECT_FOUR:
+            return
+        p1, p2 = self.player_ids
+        score = 0.5 if self.draw else 1.0 if self.winner == 0 else 0.0
+        leaderboard.record(guild_id, p1, p2, score)
+
+    # === Invitation et écran de fin ===
+
+    async def answer_invite(self, confirmed: Optional[bool], interaction: Optional[discord.Interaction] = None) -> None:
+        """Applique la réponse à l'invitation (None : expirée) et met à jour le message."""
+        self.seq += 1
+        if confirmed:
+            self.kind = "game"
+            self.reset_deadline()
+            store.save(self)
+            embed = EmbedBuilder.game_embed(self)
+            view = self.components()
+        else:
+            store.forget(self.game_id)
+            embed = EmbedBuilder.rejection_embed(self.players[1], confirmed)
+            view = self.components(disabled=True)
 
-class ArreterButton(discord.ui.Button):
-    """Bouton pour arrêter la partie en cours."""
-
-    def __init__(self, game_view: Puissance4View):
-        super().__init__(label="🛑 Arrêter", style=discord.ButtonStyle.danger)
-        self.game_view = game_view
+        if interaction is not None:
+            await interaction.response.defer()
+        await edit_message(self.message, content=None, embed=embed, view=view)
 
-    async def callback(self, interaction: discord.Interaction):
-        """Arrête la partie et notifie les joueurs."""
-        if self.view:
-            self.view.stop()
-            disable_all_buttons(self.view)
-            await interaction.response.edit_message(view=self.view)
-            await interaction.followup.send(f"🛑 {interaction.user.mention} a arrêté le jeu.")
+    async def replay(self, interaction: discord.Interaction) -> None:
+        """Relance une partie avec les mêmes joueurs, en gardant les scores."""
+        self.board = Board(self.board.spec)
+        self.player_turn = self.first = random.randrange(2)
+        self.moves = bytearray()
+        self.started = time.time()
+        self.last_move = None
+        self.winner = None
+        self.draw = False
+        self.kind = "game"
+        self.seq += 1
+        self.reset_deadline()
+        store.save(self)
+
+        scheduler.discard(self.message)
+        await interaction.response.edit_message(embed=EmbedBuilder.game_embed(self), view=self.components())
+        await self.play_bot_turn()
+
+    async def close(self, interaction: Optional[discord.Interaction] = None) -> None:
+        """Ferme l'écran de fin : bouton « Arrêter », ou échéance atteinte."""
+        self.seq += 1
+        store.forget(self.game_id)
+        if interaction is None:
+            await edit_message(self.message, view=self.components(disabled=True))
+            return
+        scheduler.discard(self.message)
+        await interaction.response.edit_message(view=self.components(disabled=True))
+        await interaction.followup.send(f"🛑 {interaction.user.mention} a arrêté le jeu.")
 
 
 # =========================================
-# ConfirmationView – accepter/refuser partie
+# ReplayView – historique coup par coup
 # =========================================
 
-class ConfirmationView(discord.ui.View):
-    """Vue pour confirmer ou refuser une invitation à jouer."""
+class ReplayView(discord.ui.View):
+    """Revoit une partie de l'historique coup par coup (message éphémère).
+
+    Chaque position est recalculée depuis le journal de coups
+    (``Board.from_moves``) : seul le document de l'historique est gardé.
+    """
+
+    def __init__(self, record: dict):
+        super().__init__(timeout=300)
+        self.record = record
+        self.moves = bytes(record["moves"])
+        self.first: int = record.get("first", 0)
+        self.spec = grid_spec(*record["grid"]) if record.get("grid") else CONNECT_FOUR
+        self.message: Optional[discord.WebhookMessage] = None
+        self.goto(len(self.moves))
+
+    @property
+    def last_move(self) -> Optional[int]:
+        return self.moves[self.ply - 1] if self.ply else None
+
+    def goto(self, ply: int) -> None:
+        """Place le plateau après ``ply`` coups et met à jour les boutons."""
+        self.ply = max(0, min(ply, len(self.moves)))
+        self.board = Board.from_moves(self.moves, self.first, self.ply, self.spec)
+        self.first_ply.disabled = self.previous_ply.disabled = self.ply == 0
+        self.next_ply.disabled = self.last_ply.disabled = self.ply == len(self.moves)
+
+    async def show(self, interaction: discord.Interaction, ply: int) -> None:
+        self.goto(ply)
+        await interaction.response.edit_message(embed=EmbedBuilder.replay_embed(self), view=self)
+
+    @discord.ui.button(emoji="⏮️", style=discord.ButtonStyle.secondary)
+    async def first_ply(self, interaction: discord.Interaction, _):
+        await self.show(interaction, 0)
+
+    @discord.ui.button(emoji="◀️", style=discord.ButtonStyle.primary)
+    async def previous_ply(self, interaction: discord.Interaction, _):
+        await self.show(interaction, self.ply - 1)
+
+    @discord.ui.button(emoji="▶️", style=discord.ButtonStyle.primary)
+    async def next_ply(self, interaction: discord.Interaction, _):
+        await self.show(interaction, self.ply + 1)
+
+    @discord.ui.button(emoji="⏭️", style=discord.ButtonStyle.secondary)
+    async def last_ply(self, interaction: discord.Interaction, _):
+        await self.show(interaction, len(self.moves))
 
-    def __init__(self, player1: discord.Member, player2: discord.Member, timeout: int = 120):
-        """Initialise les boutons de confirmation et l'état de l'invitation."""
-        super().__init__(timeout=timeout)
-        self.player1 = player1
-        self.player2 = player2
-        self.confirmed: Optional[bool] = None
-        self.message: Optional[discord.Message] = None
+    async def on_timeout(self):
+        for child in self.children:
+            if isinstance(child, discord.ui.Button):
+                child.disabled = True
+        if self.message:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
 
-    async def interaction_check(self, interaction: discord.Interaction) -> bool:
-        """Vérifie que seul l'adversaire invité peut interagir."""
-        if interaction.user != self.player2:
-            await interaction.response.send_message(
-                "❌ Seul l'adversaire invité peut cliquer.", ephemeral=True
-            )
-            return False
-        return True
 
-    async def finalize(self):
-        """Applique la décision finale et met à jour le message Discord."""
-        self.stop()
+# =========================================
+# GameStore – index et persistance des parties
+# =========================================
 
-        if self.confirmed:
-            view = Puissance4View(self.player1, self.player2)
-            view.message = self.message
-            embed = EmbedBuilder.game_embed(view)
+@dataclass(slots=True)
+class GameEntry:
+    """Entrée de l'index : de quoi lister et plafonner une partie sans charger son état."""
+    game_id: str
+    kind: str
+    players: tuple[int, ...]
+    guild_id: Optional[int]
+    channel_id: Optional[int]
+    deadline: float
+    started: float
+
+
+@dataclass
+class GameLimits:
+    """Plafonds de parties actives (invitations comprises) ; 0 = pas de limite."""
+    per_player: int = MAX_GAMES_PER_PLAYER
+    per_channel: int = MAX_GAMES_PER_CHANNEL
+    per_guild: int = MAX_GAMES_PER_GUILD
+    total: int = MAX_GAMES
+
+
+# Objets partagés avec le reste du bot : exclus de la taille d'une partie
+_SHARED_TYPES = (discord.abc.User, discord.abc.Messageable, discord.PartialMessage, discord.Client,
+                 asyncio.AbstractEventLoop, GridSpec, type)
+
+
+def _slots(cls: type) -> Iterable[str]:
+    for klass in cls.__mro__:
+        slots = klass.__dict__.get("__slots__", ())
+        yield from (slots,) if isinstance(slots, str) else slots
+
+
+def approx_size(root: object) -> int:
+    """Octets occupés par les objets propres à une partie (état, plateau, échéance…)."""
+    seen: set[int] = set()
+    stack = [root]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _SHARED_TYPES):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
         else:
-            view = self
-            embed = EmbedBuilder.rejection_embed(self.player2, self.confirmed)
-            disable_all_buttons(self)
+            if hasattr(obj, "__dict__"):
+                stack.append(vars(obj))
+            stack.extend(getattr(obj, name) for name in _slots(type(obj)) if hasattr(obj, name))
+    return total
 
-        await edit_message(self.message, content=None, embed=embed, view=view)
 
-    async def on_timeout(self):
-        """Finalise automatiquement si le joueur invité n'a pas répondu."""
-        await self.finalize()
+class GameStore:
+    """Index des parties en mémoire, sauvegardées dans MongoDB via ``db``.
 
-    @discord.ui.button(label="✅ Confirmer", style=discord.ButtonStyle.success)
-    async def confirm(self, interaction: discord.Interaction, _):
-        """Bouton pour accepter l'invitation."""
-        self.confirmed = True
-        await interaction.response.defer()
-        await self.finalize()
+    Chaque partie active (invitation, partie, écran de fin) a une ``GameEntry``
+    indexée par joueur, salon et serveur, même lorsque son état est déchargé :
+    les plafonds (``GameLimits``) et ``/puissance4 parties`` se lisent dans
+    l'index. Les états chargés (``games``) sont compacts et retrouvés par les
+    clics via ``GameButton`` ; une fois la connexion prête, les parties
+    stockées sont indexées déchargées, puis recréées au premier clic ou à
+    leur échéance. Les parties inactives peuvent être déchargées puis
+    rechargées de la même façon.
+    """
+
+    def __init__(self):
+        self.bot: Optional[commands.Bot] = None
+        self.games: dict[str, GameState] = {}
+        self.evicted: set[str] = set()
+        self.deadlines: TimerWheel[str] = TimerWheel(self._on_deadline)
+        self.entries: dict[str, GameEntry] = {}
+        self.by_player: dict[int, set[str]] = {}
+        self.by_channel: dict[int, set[str]] = {}
+        self.by_guild: dict[int, set[str]] = {}
+        self.limits = GameLimits()
+        self.restored = False
+        self.rejected: dict[str, int] = {}
+        self._tasks: set[asyncio.Task] = set()
+        # Dernière écriture MongoDB de chaque partie : les suivantes l'attendent (ordre garanti)
+        self._writes: dict[str, asyncio.Task] = {}
+        self._users = db.ReadThroughCache(self._fetch_user, "p4_players", PLAYER_CACHE_SIZE, PLAYER_CACHE_TTL)
+
+    # === Index ===
+
+    def _humans(self, players: Iterable[int]) -> list[int]:
+        """Joueurs indexés et plafonnés : BotRonron n'est le joueur d'aucune partie."""
+        bot_user = self.bot.user if self.bot else None
+        return [p for p in players if bot_user is None or p != bot_user.id]
+
+    def _index(self, entry: GameEntry) -> None:
+        self.entries[entry.game_id] = entry
+        for player_id in self._humans(entry.players):
+            self.by_player.setdefault(player_id, set()).add(entry.game_id)
+        if entry.channel_id is not None:
+            self.by_channel.setdefault(entry.channel_id, set()).add(entry.game_id)
+        if entry.guild_id is not None:
+            self.by_guild.setdefault(entry.guild_id, set()).add(entry.game_id)
+
+    def _unindex(self, game_id: str) -> None:
+        entry = self.entries.pop(game_id, None)
+        if entry is None:
+            return
+        keyed = [(self.by_player, p) for p in entry.players]
+        keyed += [(self.by_channel, entry.channel_id), (self.by_guild, entry.guild_id)]
+        for index, key in keyed:
+            games = index.get(key) if key is not None else None
+            if games is not None:
+                games.discard(game_id)
+                if not games:
+                    del index[key]
+
+    def _index_game(self, game: GameState) -> None:
+        """Crée ou met à jour l'entrée d'une partie (type et échéance changent au fil de la partie)."""
+        entry = self.entries.get(game.game_id)
+        if entry is None:
+            self._index(GameEntry(game.game_id, game.kind, game.player_ids, game.guild_id,
+                                  game.channel_id, game.deadline, time.time()))
+        else:
+            entry.kind = game.kind
+            entry.deadline = game.deadline
+
+    def lookup(self, game_ids: Iterable[str]) -> list[GameEntry]:
+        return [self.entries[game_id] for game_id in game_ids if game_id in self.entries]
+
+    def games_of(self, user_id: int) -> list[GameEntry]:
+        return self.lookup(self.by_player.get(user_id, ()))
+
+    def games_in_guild(self, guild_id: int) -> list[GameEntry]:
+        return self.lookup(self.by_guild.get(guild_id, ()))
+
+    # === Admission ===
+
+    def reserve(
+        self, game_id: str, kind: str, players: tuple[int, ...],
+        guild_id: Optional[int], channel_id: Optional[int], deadline: float,
+    ) -> Optional[str]:
+        """Réserve une place dans l'index avant d'envoyer quoi que ce soit.
+
+        Retourne le motif du refus (message pour l'utilisateur), ou None si la
+        partie est admise. La réservation est immédiate : deux commandes
+        simultanées ne peuvent pas dépasser un plafond.
+        """
+        refusal = self._refusal(players, guild_id, channel_id)
+        if refusal is not None:
+            reason, message = refusal
+            self.rejected[reason] = self.rejected.get(reason, 0) + 1
+            return message
+        self._index(GameEntry(game_id, kind, players, guild_id, channel_id, deadline, time.time()))
+        return None
+
+    def _refusal(
+        self, players: tuple[int, ...], guild_id: Optional[int], channel_id: Optional[int]
+    ) -> Optional[tuple[str, str]]:
+        limits = self.limits
+        # Défi en double : une invitation ou partie oppose déjà ces joueurs (BotRonron n'est pas indexé)
+        if len(players) == 2:
+            a, b = (self.by_player.get(p, set()) for p in players)
+            if a & b:
+                return "duplicate", "❌ Une invitation ou une partie vous oppose déjà."
+        for player_id in self._humans(players):
+            if limits.per_player and len(self.by_player.get(player_id, ())) >= limits.per_player:
+                return "player", f"❌ <@{player_id}> a déjà {limits.per_player} partie(s) en cours."
+        if limits.per_channel and channel_id is not None \
+                and len(self.by_channel.get(channel_id, ())) >= limits.per_channel:
+            return "channel", f"❌ Trop de parties dans ce salon ({limits.per_channel} au plus)."
+        if limits.per_guild and guild_id is not None \
+                and len(self.by_guild.get(guild_id, ())) >= limits.per_guild:
+            return "guild", f"❌ Trop de parties sur ce serveur ({limits.per_guild} au plus)."
+        if limits.total and len(self.entries) >= limits.total:
+            return "total", "❌ Trop de parties en cours, réessaie dans quelques minutes."
+        return None
+
+    def release(self, game_id: str) -> None:
+        """Annule une partie dont le message n'a pas pu être envoyé."""
+        self.games.pop(game_id, None)
+        self.deadlines.cancel(game_id)
+        self._unindex(game_id)
+
+    # === Cycle de vie ===
+
+    def spawn(self, coro: Coroutine[Any, Any, Any]) -> None:
+        """Lance une tâche de fond en gardant une référence jusqu'à sa fin."""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def write(self, game_id: str, call: Callable[[], Coroutine[Any, Any, Any]]) -> None:
+        """Lance une écriture MongoDB de la partie après la précédente, sans bloquer l'appelant.
+
+        Sans cet ordre, une sauvegarde (upsert) encore en vol pourrait arriver
+        après la suppression d'une partie fermée et la recréer.
+        """
+        previous = self._writes.get(game_id)
+
+        async def run() -> None:
+            if previous is not None:
+                await asyncio.wait([previous])
+            await call()
+
+        task = asyncio.create_task(run())
+        self._tasks.add(task)
+        self._writes[game_id] = task
+
+        def done(t: asyncio.Task) -> None:
+            self._tasks.discard(t)
+            if self._writes.get(game_id) is t:
+                del self._writes[game_id]
+        task.add_done_callback(done)
+
+    def track(self, game: GameState) -> None:
+        """Rend une nouvelle partie joignable par les clics et programme son échéance.
+
+        Appelé avant l'envoi du message : un clic arrivé juste après l'envoi
+        trouve déjà la partie. Elle est sauvegardée une fois ``message`` connu.
+        """
+        self.games[game.game_id] = game
+        game.arm_deadline()
+
+    def save(self, game: GameState) -> None:
+        """Sauvegarde l'état de la partie sans bloquer l'interaction."""
+        game.last_activity = time.monotonic()
+        self._index_game(game)
+        self.write(game.game_id, functools.partial(db.save_game, game.to_doc()))
+
+    def owns(self, guild_id: Optional[int]) -> bool:
+        """True si le serveur relève d'un shard de ce processus (toujours vrai hors cluster).
+
+        Les messages privés arrivent par le shard 0, comme ``guild_id = 0``.
+        """
+        bot = self.bot
+        if not isinstance(bot, discord.AutoShardedClient) or not bot.shard_count:
+            return True
+        # shard_ids : plage du worker (launcher.py) ; sinon tous les shards lancés par ce processus
+        owned = bot.shard_ids if bot.shard_ids is not None else bot.shards
+        return ((guild_id or 0) >> 22) % bot.shard_count in owned
+
+    def _on_deadline(self, game_id: str) -> None:
+        """Rappel de la roue : la partie expire, après rechargement si elle était déchargée."""
+        game = self.games.get(game_id)
+        if game is not None:
+            self.spawn(game.expire())
+        elif game_id in self.evicted:
+            self.spawn(self.reload(game_id))
+
+    def forget(self, game_id: str) -> None:
+        """Supprime définitivement une partie terminée."""
+        self.games.pop(game_id, None)
+        self.deadlines.cancel(game_id)
+        self.evicted.discard(game_id)
+        self._unindex(game_id)
+        self.write(game_id, functools.partial(db.delete_game, game_id))
+
+    async def resolve_user(self, user_id: int, guild: Optional[discord.Guild] = None) -> Optional[PlayerT]:
+        """Retrouve un joueur à partir de son ID (membre du serveur, cache, puis API).
+
+        Sans cache complet des membres (``LOW_MEMORY``), le serveur de la partie
+        est chargé au premier besoin : une requête passerelle pour tous ses
+        joueurs plutôt qu'un ``fetch_user`` HTTP par joueur. Retourne None si
+        le compte n'existe plus (``NotFound``) ; les autres erreurs HTTP remontent.
+        """
+        assert self.bot is not None
+        if self.bot.user and user_id == self.bot.user.id:
+            return self.bot.user
+        if guild is not None:
+            member = guild.get_member(user_id)
+            if member is None and await members.ensure_chunked(guild):
+                member = guild.get_member(user_id)
+            if member is not None:
+                return member
+        return self.bot.get_user(user_id) or await self._users.get(user_id)
+
+    async def _fetch_user(self, user_id: int) -> Optional[discord.User]:
+        """Chargeur du cache ``_users`` (borné, avec TTL) : None si le compte n'existe plus."""
+        assert self.bot is not None
+        try:
+            return await self.bot.fetch_user(user_id)
+        except discord.NotFound:
+            return None
+
+    async def rebuild(self, doc: dict) -> Optional[GameState]:
+        """Recrée l'état correspondant à un document MongoDB."""
+        assert self.bot is not None
+        guild = self.bot.get_guild(doc["guild_id"]) if doc.get("guild_id") else None
+        if doc.get("message_id") is None:
+            return None
+        players: list[PlayerT] = []
+        for user_id in doc["players"]:
+            player = await self.resolve_user(user_id, guild)
+            if player is None:
+                return None
+            players.append(player)
+        p1, p2 = players
+
+        game = GameState.from_doc(doc, (p1, p2))
+        channel = self.bot.get_partial_messageable(doc["channel_id"], guild_id=doc.get("guild_id"))
+        game.message = channel.get_partial_message(doc["message_id"])
+        return game
+
+    async def register(self, doc: dict) -> Optional[GameState]:
+        """Recrée une partie, la rend joignable par les clics et réarme son échéance.
+
+        La partie n'est supprimée que si un joueur n'existe plus ou si son
+        message n'a jamais été envoyé. Après une autre erreur HTTP, elle reste
+        déchargée : prochain clic, ou nouvel essai dans ``RELOAD_RETRY_SECONDS``.
+        """
+        game_id = doc["_id"]
+        try:
+            game = await self.rebuild(doc)
+        except discord.HTTPException as e:
+            logger.warning(f"⚠️ [P4] Partie {game_id} non rechargée, nouvel essai plus tard : {e}")
+            entry = self.entries.get(game_id)
+            if game_id not in self.games and entry is not None:
+                self.evicted.add(game_id)
+                self.deadlines.schedule(game_id, max(entry.deadline, time.time() + RELOAD_RETRY_SECONDS))
+            return None
+        if game_id in self.games:
+            # Deux clics simultanés sur une partie déchargée : le premier l'a déjà rechargée
+            return self.games[game_id]
+        if game is None:
+            self.forget(game_id)
+            return None
+        self.track(game)
+        self._index_game(game)
+        return game
+
+    async def restore_all(self) -> None:
+        """Indexe les parties stockées, déchargées (appelé une fois la connexion prête).
+
+        Aucun joueur n'est résolu ici : chaque partie est recréée par
+        ``reload`` au premier clic ou à son échéance, et le démarrage ne
+        coûte qu'une lecture MongoDB. En cluster, seules les parties des
+        shards du processus sont reprises : les autres workers arment leurs
+        propres échéances.
+        """
+        restored = 0
+        for doc in await db.load_all_games():
+            game_id = doc["_id"]
+            if game_id in self.entries or not self.owns(doc.get("guild_id")):
+                continue
+            self._index(GameEntry(game_id, doc["kind"], tuple(doc["players"]), doc.get("guild_id"),
+                                  doc.get("channel_id"), doc["deadline"], time.time()))
+            self.evicted.add(game_id)
+            self.deadlines.schedule(game_id, doc["deadline"])
+            restored += 1
+        logger.info(f"[P4] {restored} partie(s) restaurée(s) depuis MongoDB.")
+
+    async def reload(self, game_id: str) -> Optional[GameState]:
+        """Recharge à la demande une partie déchargée de la mémoire."""
+        self.evicted.discard(game_id)
+        doc = await db.load_game(game_id)
+        if doc is None or not self.owns(doc.get("guild_id")):
+            return None
+        return await self.register(doc)
+
+    def evict_idle(self, max_idle: float) -> int:
+        """Décharge les parties inactives ; leur échéance reste programmée."""
+        now = time.monotonic()
+        evicted = 0
+        for game_id, game in list(self.games.items()):
+            if now - game.last_activity < max_idle:
+                continue
+            del self.games[game_id]
+            # L'échéance reste dans la roue : la partie est alors rechargée et expire d'elle-même
+            self.evicted.add(game_id)
+            evicted += 1
+        return evicted
+
+    def sweep_abandoned(self, grace: float) -> int:
+        """Oublie les parties encore indexées ``grace`` secondes après leur échéance.
+
+        Normalement, l'échéance termine la partie ; une partie qui reste au-delà
+        (message supprimé, erreur pendant ``expire``…) est abandonnée et ne
+        doit plus compter dans les plafonds.
+        """
+        limit = time.time() - grace
+        abandoned = [e.game_id for e in self.entries.values() if e.deadline < limit]
+        for game_id in abandoned:
+            self.forget(game_id)
+        return len(abandoned)
+
+    # === Mesures ===
+
+    def metrics(self, sample: int = 16) -> dict[str, Any]:
+        """Parties par type, états chargés et mémoire estimée (moyenne sur ``sample`` parties)."""
+        kinds: dict[str, int] = {}
+        for entry in self.entries.values():
+            kinds[entry.kind] = kinds.get(entry.kind, 0) + 1
+        games = list(itertools.islice(self.games.values(), sample))
+        per_game = sum(approx_size(g) for g in games) / len(games) if games else 0.0
+        index_bytes = sys.getsizeof(self.games) + sum(
+            sys.getsizeof(index) + sum(sys.getsizeof(ids) for ids in index.values())
+            for index in (self.by_player, self.by_channel, self.by_guild)
+        ) + sys.getsizeof(self.entries) \
+            + len(self.entries) * (sys.getsizeof(GameEntry("", "", (), None, None, 0.0, 0.0)) + 64)
+        return {
+            "games": len(self.entries),
+            "kinds": kinds,
+            "loaded": len(self.games),
+            "evicted": len(self.evicted),
+            "deadlines": len(self.deadlines),
+            "players": len(self.by_player),
+            "rejected": dict(self.rejected),
+            "game_bytes": round(per_game),
+            "memory_bytes": round(per_game * len(self.games) + index_bytes),
+        }
+
+
+store = GameStore()
 
-    @discord.ui.button(label="❌ Annuler", style=discord.ButtonStyle.danger)
-    async def cancel(self, interaction: discord.Interaction, _):
-        """Bouton pour refuser l'invitation."""
-        self.confirmed = False
-        await interaction.response.defer()
-        await self.finalize()
 
 # =========================================
 # Cog commande /puissance4
 # =========================================
 
 class Puissance4(commands.Cog):
-    """Cog Discord contenant la commande /puissance4 pour lancer une partie."""
+    """Cog Discord contenant le groupe /puissance4 (jouer, parties, revoir, exporter)."""
+
+    group = discord.app_commands.Group(name="puissance4", description="Parties de Puissance 4.")
 
     def __init__(self, bot: commands.Bot):
         """Initialise le Cog avec le bot."""
         self.bot = bot
 
-    @discord.app_commands.command(name="puissance4", description="Lance une partie de Puissance 4.")
-    @discord.app_commands.describe(adversaire="L'utilisateur que vous souhaitez affronter.")
-    async def p4(self, interaction: discord.Interaction, adversaire: discord.Member) -> None:
-        """Commande pour initier une partie contre un adversaire choisi."""
+    async def cog_load(self):
+        """Ouvre la base de positions (mmap), route les boutons et restaure les parties en cours.
+
+        Au démarrage, la restauration attend ``on_ready`` ; après un
+        rechargement à chaud (``/recharger``), la connexion est déjà prête et
+        le nouveau ``store`` est rempli tout de suite.
+        """
+        book.load()
+        store.bot = self.bot
+        self.bot.add_dynamic_items(GameButton)
+        await db.ensure_history_indexes()
+        if self.bot.is_ready():
+            self.restore()
+        metrics.registry.register(metrics.Gauge(
+            "p4_games", "Parties de Puissance 4 actives, par type.", ("kind",),
+            lambda: {(kind,): n for kind, n in store.metrics(sample=0)["kinds"].items()}))
+        metrics.registry.register(metrics.Gauge(
+            "p4_memory_bytes", "Mémoire estimée des parties chargées et de l'index.", (),
+            lambda: {(): store.metrics()["memory_bytes"]}))
+        self.maintain_games.start()
+
+    async def cog_unload(self):
+        """Arrête le solveur, l'entretien, les échéances et le routage des boutons ; vide l'historique."""
+        self.maintain_games.cancel()
+        store.deadlines.stop()
+        self.bot.remove_dynamic_items(GameButton)
+        solver.shutdown_pool()
+        await history.stop()
+
+    # Démarrage à froid : restauration une fois la passerelle prête (serveurs et membres en cache)
+    @commands.Cog.listener()
+    async def on_ready(self):
+        self.restore()
+
+    @staticmethod
+    def restore() -> None:
+        """Indexe les parties stockées en tâche de fond, une seule fois par ``store``."""
+        if not store.restored:
+            store.restored = True
+            store.spawn(store.restore_all())
+
+    @tasks.loop(seconds=60)
+    async def maintain_games(self):
+        """Oublie les parties abandonnées ; décharge celles inactives depuis ``P4_IDLE_EVICT`` secondes."""
+        abandoned = store.sweep_abandoned(ABANDON_GRACE_SECONDS)
+        if abandoned:
+            logger.warning(f"⚠️ [P4] {abandoned} partie(s) abandonnée(s) retirée(s) de l'index.")
+        if IDLE_EVICT_SECONDS > 0:
+            evicted = store.evict_idle(IDLE_EVICT_SECONDS)
+            if evicted:
+                logger.info(f"[P4] {evicted} partie(s) inactive(s) déchargée(s).")
+
+    @group.command(name="jouer", description="Lance une partie de Puissance 4.")
+    @discord.app_commands.describe(
+        adversaire="L'utilisateur que vous souhaitez affronter (vide : BotRonron).",
+        difficulte="Niveau de BotRonron si vous jouez contre lui.",
+        lignes="Puissance N : nombre de lignes (6 par défaut).",
+        colonnes="Puissance N : nombre de colonnes (7 par défaut).",
+        alignement="Puissance N : pièces à aligner pour gagner (4 par défaut).",
+    )
+    @discord.app_commands.choices(difficulte=[
+        discord.app_commands.Choice(name=d.label, value=key)
+        for key, d in solver.DIFFICULTIES.items()
+    ])
+    async def p4(
+        self,
+        interaction: discord.Interaction,
+        adversaire: Optional[discord.Member] = None,
+        difficulte: str = "moyen",
+        lignes: discord.app_commands.Range[int, GRID_MIN, GRID_MAX] = CONNECT_FOUR.rows,
+        colonnes: discord.app_commands.Range[int, GRID_MIN, GRID_MAX] = CONNECT_FOUR.cols,
+        alignement: discord.app_commands.Range[int, 3, GRID_MAX] = CONNECT_FOUR.connect,
+    ) -> None:
+        """Commande pour initier une partie contre un adversaire choisi ou contre le bot."""
 
         player1 = cast(discord.Member, interaction.user)
+        try:
+            spec = grid_spec(lignes, colonnes, alignement)
+        except ValueError:
+            await interaction.response.send_message(
+                f"❌ Impossible d'aligner {alignement} pièces sur un plateau {lignes}×{colonnes}.", ephemeral=True
+            )
+            return
+
+        if adversaire is None or (self.bot.user and adversaire.id == self.bot.user.id):
+            if spec != CONNECT_FOUR:
+                await interaction.response.send_message(
+                    "❌ BotRonron ne joue qu'au Puissance 4 classique (6×7).", ephemeral=True
+                )
+                return
+            await self.start_bot_game(interaction, player1, difficulte)
+            return
+
         player2 = cast(discord.Member, adversaire)
 
         if player1 == player2 or player1.bot or player2.bot:
@@ -499,17 +1334,185 @@ class Puissance4(commands.Cog):
             )
             return
 
-        view = ConfirmationView(player1, player2)
-        
-        await interaction.response.send_message(
-            content=f"{player2.mention}",
-            embed=EmbedBuilder.invitation_embed(player1),
-            view=view
+        # Plafonds et défis en double vérifiés avant de créer la moindre partie
+        game_id = secrets.token_hex(4)
+        deadline = time.time() + GameState.TIMEOUT
+        refusal = store.reserve(game_id, "invite", (player1.id, player2.id),
+                                interaction.guild_id, interaction.channel_id, deadline)
+        if refusal:
+            await interaction.response.send_message(refusal, ephemeral=True)
+            return
+
+        game = GameState(game_id, "invite", (player1, player2), deadline=deadline, spec=spec)
+        store.track(game)
+        try:
+            response = await interaction.response.send_message(
+                content=f"{player2.mention}",
+                embed=EmbedBuilder.invitation_embed(player1, spec),
+                view=game.components()
+            )
+        except discord.HTTPException:
+            store.release(game_id)
+            raise
+
+        game.message = self.response_message(interaction, response)
+        store.save(game)
+
+    @group.command(name="parties", description="Liste les parties de Puissance 4 en cours sur ce serveur.")
+    @discord.app_commands.describe(moi="Seulement mes parties (tous serveurs confondus)")
+    async def parties(self, interaction: discord.Interaction, moi: bool = False) -> None:
+        """Liste les parties depuis l'index du GameStore, sans parcourir les états chargés."""
+        if moi:
+            entries = store.games_of(interaction.user.id)
+        elif interaction.guild_id is not None:
+            entries = store.games_in_guild(interaction.guild_id)
+        else:
+            entries = []
+        entries.sort(key=lambda e: e.started, reverse=True)
+
+        labels = {"invite": "✉️ Invitation", "game": "🎮 En cours", "end": "🏁 Terminée"}
+        lines = [
+            f"{labels.get(e.kind, e.kind)} · {' vs '.join(f'<@{p}>' for p in e.players)}"
+            + (f" · <#{e.channel_id}>" if e.channel_id else "")
+            + f" · échéance <t:{int(e.deadline)}:R>"
+            for e in entries[:15]
+        ]
+        if len(entries) > 15:
+            lines.append(f"… et {len(entries) - 15} autre(s).")
+
+        embed = discord.Embed(
+            title=f"🎲 Parties de Puissance 4 ({len(entries)})",
+            description="\n".join(lines) or "Aucune partie en cours.",
+            color=discord.Color.blurple(),
         )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @group.command(name="revoir", description="Revoit coup par coup une partie terminée.")
+    @discord.app_commands.describe(partie="Partie de ton historique (vide : ta dernière partie)")
+    async def revoir(self, interaction: discord.Interaction, partie: Optional[str] = None) -> None:
+        """Rejoue une partie de l'historique à partir de son journal de coups.
+
+        Seules les parties du joueur, ou celles jouées sur ce serveur, sont
+        accessibles : un ID d'une autre partie est traité comme introuvable.
+        """
+        query: dict[str, Any] = {"players": interaction.user.id}
+        if partie:
+            try:
+                game_id = ObjectId(partie)
+            except InvalidId:
+                await interaction.response.send_message("❌ Partie introuvable.", ephemeral=True)
+                return
+            scope: list[dict[str, Any]] = [{"players": interaction.user.id}]
+            if interaction.guild_id is not None:
+                scope.append({"guild_id": interaction.guild_id})
+            query = {"_id": game_id, "$or": scope}
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        record = await db.load_history(query)
+        if record is None:
+            await interaction.followup.send("❌ Aucune partie terminée trouvée.", ephemeral=True)
+            return
+        view = ReplayView(record)
+        view.message = await interaction.followup.send(
+            embed=EmbedBuilder.replay_embed(view), view=view, ephemeral=True, wait=True
+        )
+
+    @revoir.autocomplete("partie")
+    async def revoir_partie(self, interaction: discord.Interaction, current: str) -> list[discord.app_commands.Choice[str]]:
+        """Dernières parties du joueur : date, adversaire, résultat et nombre de coups."""
+        choices = []
+        for doc in await db.load_player_history(interaction.user.id, 25):
+            label = self.history_label(doc, interaction.user.id, interaction.guild)
+            if current.lower() in label.lower():
+                choices.append(discord.app_commands.Choice(name=label[:100], value=str(doc["_id"])))
+        return choices
+
+    def history_label(self, doc: dict, user_id: int, guild: Optional[discord.Guild]) -> str:
+        players = doc["players"]
+        me = players.index(user_id) if user_id in players else 0
+        opponent_id = players[1 - me]
+        opponent = (guild.get_member(opponent_id) if guild else None) or self.bot.get_user(opponent_id)
+        name = opponent.display_name if opponent else f"joueur {opponent_id}"
+        if doc.get("draw"):
+            result = "nul"
+        else:
+            result = "victoire" if doc.get("winner") == me else "défaite"
+        return f"{doc['ended']:%d/%m/%Y %H:%M} · contre {name} · {result}"
+
+    @group.command(name="exporter", description="Exporte l'historique des parties du serveur (NDJSON compressé).")
+    async def exporter(self, interaction: discord.Interaction) -> None:
+        """Écrit l'historique au fil du curseur MongoDB, sans le charger entièrement en mémoire."""
+        guild = interaction.guild
+        if guild is None or not interaction.permissions.manage_guild:
+            await interaction.response.send_message(
+                "❌ Réservé aux membres qui gèrent le serveur.", ephemeral=True
+            )
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        with tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES) as spool:
+            try:
+                with gzip.GzipFile(fileobj=spool, mode="wb") as out:
+                    count = await export_ndjson(guild.id, out)
+            except Exception as e:
+                logger.error(f"❌ Export de l'historique du serveur {guild.id} échoué : {e}")
+                await interaction.followup.send("❌ Historique indisponible, réessaie plus tard.", ephemeral=True)
+                return
+
+            if spool.tell() > interaction.attachment_size_limit:
+                await interaction.followup.send(
+                    f"❌ Export trop volumineux ({spool.tell() // 1024 ** 2} Mio, {count} parties).", ephemeral=True
+                )
+                return
+            spool.seek(0)
+            await interaction.followup.send(
+                f"📦 {count} partie(s) exportée(s) (une ligne JSON par partie).",
+                file=discord.File(spool, filename=f"puissance4-{guild.id}.ndjson.gz"),  # type: ignore[arg-type]
+                ephemeral=True,
+            )
+
+    def response_message(
+        self, interaction: discord.Interaction, response: discord.InteractionCallbackResponse
+    ) -> discord.PartialMessage:
+        """Message envoyé en réponse, éditable via le salon (le token expire après 15 min).
+
+        Construit sans aller-retour API : un clic rapide, routé dès le retour
+        de ``send_message``, ne doit pas trouver ``game.message`` vide.
+        """
+        assert interaction.channel_id is not None and response.message_id is not None
+        channel = self.bot.get_partial_messageable(interaction.channel_id, guild_id=interaction.guild_id)
+        return channel.get_partial_message(response.message_id)
+
+    async def start_bot_game(self, interaction: discord.Interaction, player: discord.Member, difficulty: str) -> None:
+        """Lance directement une partie contre BotRonron, sans invitation."""
+        guild = interaction.guild
+        if guild is None or player.bot:
+            await interaction.response.send_message(
+                "❌ Impossible de jouer contre BotRonron ici.", ephemeral=True
+            )
+            return
+
+        game_id = secrets.token_hex(4)
+        deadline = time.time() + GameState.TIMEOUT
+        refusal = store.reserve(game_id, "game", (player.id, guild.me.id),
+                                guild.id, interaction.channel_id, deadline)
+        if refusal:
+            await interaction.response.send_message(refusal, ephemeral=True)
+            return
+
+        game = GameState(game_id, "game", (player, guild.me), difficulty=difficulty, deadline=deadline)
+        store.track(game)
+        try:
+            response = await interaction.response.send_message(
+                embed=EmbedBuilder.game_embed(game), view=game.components()
+            )
+        except discord.HTTPException:
+            store.release(game_id)
+            raise
 
-        message = await interaction.original_response()
-        view.message = await message.channel.fetch_message(message.id)
-        await view.wait()
+        game.message = self.response_message(interaction, response)
+        store.save(game)
+        await game.play_bot_turn()
 
 
 # =========================================
@@ -5,15 +5,112 @@ import time
 import platform
 import datetime
 
+import members
+
 # Constantes
 START_TIME  = time.time()
 BOT_VERSION = "1.0.0"
 CREATOR     = "<@998191350807797830>"
 INVITE_URL  = "https://github.com/BunnyMelonne/discord-bot"
 
+def _latency(ms) -> str:
+    return "—" if ms is None else f"{ms:.0f} ms"
+
+class HumanIndex:
+    """Utilisateurs humains uniques, tenus à jour par les événements de membres.
+
+    Chaque ID est associé au nombre de serveurs communs avec le bot ; il sort
+    de l'index quand ce nombre retombe à zéro. ``len()`` est en O(1).
+    """
+
+    def __init__(self):
+        self._guild_counts: dict[int, int] = {}
+
+    def __len__(self):
+        return len(self._guild_counts)
+
+    def add(self, member):
+        if not member.bot:
+            self._guild_counts[member.id] = self._guild_counts.get(member.id, 0) + 1
+
+    def remove(self, member):
+        if member.bot:
+            return
+        count = self._guild_counts.get(member.id, 0) - 1
+        if count > 0:
+            self._guild_counts[member.id] = count
+        else:
+            self._guild_counts.pop(member.id, None)
+
+    def add_guild(self, guild):
+        for member in guild.members:
+            self.add(member)
+
+    def remove_guild(self, guild):
+        for member in guild.members:
+            self.remove(member)
+
+    def rebuild(self, guilds):
+        self._guild_counts.clear()
+        for guild in guilds:
+            self.add_guild(guild)
+
 class Status(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        # Sans cache complet des membres (LOW_MEMORY), l'index serait partiel :
+        # /status se rabat alors sur le nombre approximatif fourni par Discord
+        self.humans = HumanIndex() if members.has_full_member_cache() else None
+        if self.humans is not None:
+            self.humans.rebuild(bot.guilds)
+
+    def user_count(self) -> str:
+        if self.humans is not None:
+            return str(len(self.humans))
+        # Membres (bots compris, doublons entre serveurs compris) : approximatif
+        total = sum(g.approximate_member_count or g.member_count or 0 for g in self.bot.guilds)
+        return f"≈ {total}"
+
+    def cluster_fields(self, snapshot: dict) -> list[tuple[str, str]]:
+        """Shards et processus du cluster (mode ``launcher.py``)."""
+        shards = "\n".join(
+            f"#{shard_id} · {_latency(s['latency_ms'])} · {s['guilds']} serv."
+            for shard_id, s in snapshot["shards"].items()
+        )
+        processes = "\n".join(
+            f"{'🟢' if c['ready'] else '🔴'} {cluster_id} · shards {c['shards'][0]}–{c['shards'][-1]} · {c['rss_mb']:.0f} Mio"
+            for cluster_id, c in snapshot["clusters"].items() if c["shards"]
+        )
+        return [
+            ("🧩 Shards", shards[:1024] or "—"),
+            ("🖥️ Processus", f"{processes[:1000] or '—'}\nTotal {snapshot['rss_mb']:.0f} Mio"),
+        ]
+
+    # Index des humains : reconstruit une fois la connexion prête, puis incrémental
+    @commands.Cog.listener()
+    async def on_ready(self):
+        if self.humans is not None:
+            self.humans.rebuild(self.bot.guilds)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        if self.humans is not None:
+            self.humans.add(member)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        if self.humans is not None:
+            self.humans.remove(member)
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild):
+        if self.humans is not None:
+            self.humans.add_guild(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        if self.humans is not None:
+            self.humans.remove_guild(guild)
 
     @app_commands.command(name="status", description="Affiche les informations sur le bot")
     async def status(self, interaction: discord.Interaction):
@@ -25,8 +122,11 @@ class Status(commands.Cog):
 
         # Infos système & bot
         latency         = round(self.bot.latency * 1000)
-        guild_count     = len(self.bot.guilds)
-        user_count      = len({m.id for g in self.bot.guilds for m in g.members if not m.bot})
+        # En cluster, les serveurs sont comptés sur tous les processus
+        cluster         = getattr(self.bot, "cluster", None)
+        snapshot        = cluster.snapshot if cluster else None
+        guild_count     = snapshot["guilds"] if snapshot else len(self.bot.guilds)
+        user_count      = self.user_count()
         command_count   = len(self.bot.tree.get_commands())
         python_version  = platform.python_version()
         discord_version = discord.__version__
@@ -56,6 +156,8 @@ class Status(commands.Cog):
             ("🧑 Créateur", CREATOR),
             ("🔗 Lien d'invitation", f"[Clique ici]({INVITE_URL})"),
         ]
+        if snapshot:
+            fields += self.cluster_fields(snapshot)
 
         for name, value in fields:
             embed.add_field(name=name, value=str(value), inline=True)
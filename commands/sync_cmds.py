@@ -4,6 +4,9 @@ from discord.ext import commands
 from discord import app_commands
 import logging
 
+import command_sync
+import extensions
+
 logger = logging.getLogger(__name__)
 
 OWNER_ID = 998191350807797830
@@ -12,22 +15,69 @@ class SyncCmds(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
-    @app_commands.command(name="sync_commands", description="Synchronise toutes les commandes slash (globalement)")
-    async def resync(self, interaction: discord.Interaction):
+    @app_commands.command(name="sync_commands", description="Synchronise les commandes slash si elles ont changé")
+    @app_commands.describe(
+        apercu="Affiche les différences sans rien synchroniser",
+        forcer="Synchronise même si l'empreinte n'a pas changé",
+    )
+    async def resync(self, interaction: discord.Interaction, apercu: bool = False, forcer: bool = False):
         if interaction.user.id != OWNER_ID:
             await interaction.response.send_message("❌ Tu n'as pas la permission d'utiliser cette commande.", ephemeral=True)
             return
 
         await interaction.response.defer(ephemeral=True)
 
-        try:
-            synced = await self.bot.tree.sync()
-            logger.info(f"[SYNC] Commandes : {[cmd.name for cmd in synced]} | Total : {len(synced)}")
-            await interaction.followup.send(f"✅ {len(synced)} commandes synchronisées globalement.", ephemeral=True)
+        # Même portée qu'au démarrage : serveur de test en ENV=dev, sinon global
+        guild = command_sync.dev_guild()
+        if guild is not None:
+            self.bot.tree.copy_global_to(guild=guild)
+        where = "sur le serveur de test" if guild else "globalement"
 
+        try:
+            result = await command_sync.sync_if_changed(self.bot.tree, guild, force=forcer, dry_run=apercu)
         except Exception as e:
             logger.error(f"Erreur lors de la synchronisation : {e}", exc_info=True)
             await interaction.followup.send(f"❌ Erreur : {e}", ephemeral=True)
+            return
+
+        changes = "\n".join(result.changes) or "(aucune différence)"
+        details = f"Empreinte `{result.fingerprint[:12]}` (précédente : `{(result.previous or '—')[:12]}`)\n```diff\n{changes[:1700]}\n```"
+        if apercu:
+            header = "🔍 Changements à synchroniser :" if result.changed else "🔍 Rien à synchroniser."
+        elif result.synced is None:
+            header = f"✅ Commandes déjà à jour {where}, aucune synchronisation nécessaire."
+        else:
+            header = f"✅ {result.synced} commandes synchronisées {where}."
+        await interaction.followup.send(f"{header}\n{details}", ephemeral=True)
+
+    @app_commands.command(name="recharger", description="Recharge les extensions modifiées, sans redémarrer le bot")
+    async def recharger(self, interaction: discord.Interaction):
+        if interaction.user.id != OWNER_ID:
+            await interaction.response.send_message("❌ Tu n'as pas la permission d'utiliser cette commande.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+        # En mode cluster, seul le processus qui reçoit la commande est rechargé
+        reports = await extensions.reload_changed(self.bot)
+        if not reports:
+            await interaction.followup.send("✅ Aucune extension modifiée.", ephemeral=True)
+            return
+
+        lines = [f"{'✅' if r.ok else '❌'} {r}" for r in reports]
+        # Les commandes ont pu changer : synchronisation seulement si l'empreinte diffère
+        guild = command_sync.dev_guild()
+        if guild is not None:
+            self.bot.tree.copy_global_to(guild=guild)
+        try:
+            result = await command_sync.sync_if_changed(self.bot.tree, guild)
+            if result.synced is not None:
+                lines.append(f"🔄 Commandes synchronisées : {', '.join(result.changes) or result.synced}")
+        except Exception as e:
+            logger.error(f"Erreur lors de la synchronisation après rechargement : {e}", exc_info=True)
+            lines.append(f"❌ Synchronisation : {e}")
+
+        logger.info(f"[RELOAD] {'; '.join(str(r) for r in reports)}")
+        await interaction.followup.send("\n".join(lines)[:2000], ephemeral=True)
 
 async def setup(bot):
     await bot.add_cog(SyncCmds(bot))
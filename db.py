@@ -1,30 +1,981 @@
-from pymongo import AsyncMongoClient
+from pymongo import AsyncMongoClient, ASCENDING, DESCENDING, DeleteOne, InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError, ConnectionFailure
+from bson import json_util
 import os
-from dotenv import load_dotenv
+import time
+import asyncio
+import itertools
+from collections import OrderedDict, deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Generic, Hashable, Iterable, Optional, TypeVar
 import logging
 import certifi
 
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+import metrics
+from cluster import local_path
 
-load_dotenv()
+# Pas de load_dotenv ni de logging.basicConfig ici : c'est le rôle des points
+# d'entrée (bot.py, launcher.py), qui les appellent avant d'importer ce module
+logger = logging.getLogger(__name__)
 
 mongo_uri = os.getenv("MONGO_URI")
 if not mongo_uri:
     logger.error("❌ MONGO_URI non défini dans les variables d'environnement.")
 
-client = AsyncMongoClient(
-    mongo_uri,
-    tls=True,
-    tlsCAFile=certifi.where()
-)
+# Pool et délais explicites : une base injoignable doit échouer vite,
+# pas bloquer les interactions jusqu'aux 30 s par défaut de PyMongo
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "20"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "2"))
+MONGO_TIMEOUT_MS = int(os.getenv("MONGO_TIMEOUT_MS", "3000"))
+DATABASE_NAME = "my_discord_bot"
+
+_client: Optional[AsyncMongoClient] = None
+
+def get_client() -> AsyncMongoClient:
+    """Client MongoDB, créé à la première requête plutôt qu'à l'import (contexte TLS : ~25 ms)."""
+    global _client
+    if _client is None:
+        _client = AsyncMongoClient(
+            mongo_uri,
+            tls=True,
+            tlsCAFile=certifi.where(),
+            maxPoolSize=MONGO_MAX_POOL_SIZE,
+            minPoolSize=MONGO_MIN_POOL_SIZE,
+            maxIdleTimeMS=60_000,
+            waitQueueTimeoutMS=MONGO_TIMEOUT_MS,
+            serverSelectionTimeoutMS=MONGO_TIMEOUT_MS,
+            connectTimeoutMS=MONGO_TIMEOUT_MS,
+            socketTimeoutMS=10_000,
+            retryWrites=True,
+            event_listeners=[metrics.MongoCommandListener()],
+        )
+    return _client
+
+class LazyDatabase:
+    """Base MongoDB résolue au premier accès ; ``db[nom]`` donne une ``LazyCollection``."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __getitem__(self, collection: str) -> "LazyCollection":
+        return LazyCollection(self, collection)
+
+    def __getattr__(self, attr: str):
+        return getattr(get_client()[self.name], attr)
+
+class LazyCollection:
+    """Collection résolue (et le client créé) au premier appel ; ``name`` reste disponible avant."""
+
+    def __init__(self, database: LazyDatabase, name: str):
+        self.database = database
+        self.name = name
+        self._collection = None
 
-db = client["my_discord_bot"]
+    def __getattr__(self, attr: str):
+        if self._collection is None:
+            self._collection = get_client()[self.database.name][self.name]
+        return getattr(self._collection, attr)
+
+db = LazyDatabase(DATABASE_NAME)
 users_collection = db["users"]
 
-async def check_mongodb_connection():
+# === Disponibilité : disjoncteur, sonde de santé et journal local ===
+
+MONGO_PROBE_INTERVAL = float(os.getenv("MONGO_PROBE_INTERVAL", "15"))
+# Un journal par worker du cluster : deux processus ne rejouent jamais le même fichier
+MONGO_JOURNAL_PATH = local_path(os.getenv("MONGO_JOURNAL_PATH", os.path.join("data", "mongo_journal.jsonl")))
+
+class DatabaseUnavailable(Exception):
+    """MongoDB est marqué indisponible : l'appel échoue sans attendre de timeout."""
+
+def update_op(filter: dict, update: dict, upsert: bool = False) -> dict:
+    """Écriture sérialisable (journal) équivalente à ``UpdateOne``."""
+    return {"op": "update", "filter": filter, "update": update, "upsert": upsert}
+
+def delete_op(filter: dict) -> dict:
+    """Écriture sérialisable (journal) équivalente à ``DeleteOne``."""
+    return {"op": "delete", "filter": filter}
+
+def insert_op(document: dict) -> dict:
+    """Écriture sérialisable (journal) équivalente à ``InsertOne``.
+
+    Avec un ``_id`` fixé par l'appelant, le rejeu d'une insertion déjà faite
+    n'est qu'un doublon de clé, ignoré.
+    """
+    return {"op": "insert", "document": document}
+
+def _to_request(op: dict):
+    if op["op"] == "delete":
+        return DeleteOne(op["filter"])
+    if op["op"] == "insert":
+        return InsertOne(op["document"])
+    return UpdateOne(op["filter"], op["update"], upsert=op.get("upsert", False))
+
+class CircuitBreaker:
+    """S'ouvre après ``threshold`` échecs de connexion consécutifs.
+
+    Ouvert, il fait échouer les appels immédiatement ; seule une sonde de santé
+    réussie le referme.
+    """
+
+    def __init__(self, threshold: int = 3):
+        self.threshold = threshold
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def record_failure(self) -> bool:
+        """Compte un échec ; True si le disjoncteur vient de s'ouvrir."""
+        self.failures += 1
+        if self.opened_at is None and self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+            return True
+        return False
+
+    def trip(self) -> bool:
+        """Ouvre le disjoncteur ; True s'il était fermé."""
+        self.failures = max(self.failures, self.threshold)
+        if self.opened_at is None:
+            self.opened_at = time.monotonic()
+            return True
+        return False
+
+    def record_success(self) -> bool:
+        """Remet à zéro ; True si le disjoncteur vient de se refermer."""
+        self.failures = 0
+        was_open, self.opened_at = self.opened_at is not None, None
+        return was_open
+
+class WriteJournal:
+    """Journal local, en ajout seul, des écritures faites en mode dégradé.
+
+    Une ligne JSON (Extended JSON) par lot : ``{"c": collection, "ops": [...]}``.
+    Pour le rejouer, le fichier est d'abord renommé en ``.replay`` : les
+    écritures suivantes repartent dans un nouveau fichier. Une ligne qui ne
+    peut pas être rejouée (illisible, refusée par MongoDB) est mise à l'écart
+    dans ``.rejected`` pour ne pas bloquer les suivantes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.replay_path = path + ".replay"
+        self.rejected_path = path + ".rejected"
+
+    def has_entries(self) -> bool:
+        return os.path.exists(self.path) or os.path.exists(self.replay_path)
+
+    def append(self, collection: str, ops: list[dict]) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json_util.dumps({"c": collection, "t": time.time(), "ops": ops}) + "\n")
+
+    def take(self) -> Optional[list[str]]:
+        """Lignes à rejouer (reprise d'un rejeu interrompu en priorité), ou None."""
+        if not os.path.exists(self.replay_path):
+            if not os.path.exists(self.path):
+                return None
+            os.replace(self.path, self.replay_path)
+        with open(self.replay_path, encoding="utf-8") as f:
+            return [line for line in f if line.strip()]
+
+    def keep(self, lines: list[str]) -> None:
+        """Réécrit les lignes pas encore rejouées (ou supprime le fichier)."""
+        if not lines:
+            os.remove(self.replay_path)
+            return
+        tmp = self.replay_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+        os.replace(tmp, self.replay_path)
+
+    def quarantine(self, line: str) -> None:
+        """Met de côté une ligne impossible à rejouer (à examiner à la main)."""
+        with open(self.rejected_path, "a", encoding="utf-8") as f:
+            f.write(line if line.endswith("\n") else line + "\n")
+
+    @staticmethod
+    def parse(line: str) -> tuple[str, list[dict]]:
+        record = json_util.loads(line)
+        return record["c"], record["ops"]
+
+class MongoManager:
+    """Point de passage des accès MongoDB : disjoncteur, sonde et mode dégradé.
+
+    - Les lectures (``read``) échouent immédiatement (``DatabaseUnavailable``)
+      quand le disjoncteur est ouvert.
+    - Les écritures (``write``) sont alors ajoutées au journal local, puis
+      rejouées dans l'ordre par la sonde dès que la base répond. Tant que le
+      journal n'est pas vide, les nouvelles écritures y passent aussi pour
+      conserver l'ordre. Une écriture interrompue par une coupure est
+      journalisée et peut donc être appliquée deux fois (au moins une fois).
+    """
+
+    def __init__(self, database, journal: WriteJournal, probe_interval: float = MONGO_PROBE_INTERVAL,
+                 threshold: int = 3):
+        self.database = database
+        self.journal = journal
+        self.breaker = CircuitBreaker(threshold)
+        self.probe_interval = probe_interval
+        self.retry_interval = min(5.0, probe_interval)
+        self._backlog = journal.has_entries()
+        self._replay_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.last_probe_ms: float = 0.0
+        self.stats: dict[str, int] = {
+            "rejected": 0, "journaled": 0, "replayed": 0, "quarantined": 0, "write_errors": 0,
+            "probes": 0, "probe_failures": 0,
+        }
+
+    @property
+    def healthy(self) -> bool:
+        return not self.breaker.is_open
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            **self.stats,
+            "healthy": self.healthy,
+            "backlog": self._backlog,
+            "last_probe_ms": round(self.last_probe_ms, 1),
+        }
+
+    def start(self) -> None:
+        """Lance la sonde de santé périodique si elle ne tourne pas déjà."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._probe_loop())
+
+    def _connection_failed(self, error: Exception) -> None:
+        if self.breaker.record_failure():
+            logger.warning(f"⚠️ MongoDB injoignable, passage en mode dégradé : {error}")
+
+    def _check(self) -> None:
+        if self.breaker.is_open:
+            self.stats["rejected"] += 1
+            raise DatabaseUnavailable("MongoDB indisponible (mode dégradé)")
+
+    async def read(self, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Exécute une lecture, ou lève ``DatabaseUnavailable`` sans attendre."""
+        self._check()
+        try:
+            result = await call()
+        except ConnectionFailure as e:
+            self._connection_failed(e)
+            raise
+        self.breaker.record_success()
+        return result
+
+    async def iterate(self, cursor: Callable[[], Any]) -> AsyncIterator[Any]:
+        """Parcourt un curseur document par document, sans charger tout le résultat.
+
+        Comme ``read``, lève ``DatabaseUnavailable`` sans attendre si MongoDB
+        est marqué indisponible.
+        """
+        self._check()
+        try:
+            async for document in cursor():
+                yield document
+        except ConnectionFailure as e:
+            self._connection_failed(e)
+            raise
+        self.breaker.record_success()
+
+    async def write(self, collection, ops: list[dict]) -> bool:
+        """Applique les écritures dans l'ordre ; en mode dégradé, les journalise.
+
+        Retourne True si elles sont appliquées ou journalisées, False si MongoDB
+        les a refusées pour une autre raison qu'une coupure.
+        """
+        if not ops:
+            return True
+        if self.breaker.is_open or self._backlog:
+            self._journal(collection.name, ops)
+            return True
+        try:
+            await self._apply(collection, ops)
+        except ConnectionFailure as e:
+            self._connection_failed(e)
+            self._journal(collection.name, ops)
+            return True
+        except Exception as e:
+            logger.error(f"❌ Écriture dans {collection.name} échouée : {e}")
+            return False
+        self.breaker.record_success()
+        return True
+
+    def _journal(self, collection: str, ops: list[dict]) -> None:
+        try:
+            self.journal.append(collection, ops)
+        except OSError as e:
+            logger.error(f"❌ Journal local inaccessible, {len(ops)} écriture(s) perdue(s) : {e}")
+            return
+        self._backlog = True
+        self.stats["journaled"] += len(ops)
+
+    async def _apply(self, collection, ops: list[dict]) -> None:
+        """``bulk_write`` ordonné ; une erreur d'écriture n'arrête pas la suite du lot.
+
+        Les doublons de clé (code 11000) sont attendus : sauvegarde versionnée
+        d'une partie dont une version plus récente est déjà stockée.
+        """
+        requests = [_to_request(op) for op in ops]
+        start = 0
+        while start < len(requests):
+            try:
+                await collection.bulk_write(requests[start:], ordered=True)
+                return
+            except BulkWriteError as e:
+                errors = e.details.get("writeErrors") or []
+                if not errors:
+                    raise
+                error = errors[0]
+                if error.get("code") != 11000:
+                    self.stats["write_errors"] += 1
+                    logger.error(f"❌ Écriture ignorée dans {collection.name} : {error.get('errmsg')}")
+                start += error["index"] + 1
+
+    async def probe(self) -> bool:
+        """Ping MongoDB ; referme le disjoncteur et rejoue le journal si la base répond."""
+        self.stats["probes"] += 1
+        start = time.perf_counter()
+        try:
+            await self.database.command("ping")
+        except Exception as e:
+            self.stats["probe_failures"] += 1
+            if self.breaker.trip():
+                logger.warning(f"⚠️ Sonde MongoDB en échec, passage en mode dégradé : {e}")
+            return False
+        self.last_probe_ms = (time.perf_counter() - start) * 1000
+        # Le journal est rejoué avant de rouvrir les lectures : elles ne doivent
+        # pas voir un état antérieur aux écritures journalisées
+        if self._backlog:
+            await self.replay()
+            if self._backlog:
+                return False
+        if self.breaker.record_success():
+            logger.info("✅ MongoDB de nouveau joignable, fin du mode dégradé.")
+        return True
+
+    async def replay(self) -> int:
+        """Rejoue le journal local dans l'ordre ; s'arrête à la première coupure.
+
+        Toute autre erreur sur une ligne (JSON tronqué, écriture refusée) la
+        met en quarantaine (``WriteJournal.quarantine``) et le rejeu continue.
+        """
+        replayed = 0
+        async with self._replay_lock:
+            while (lines := self.journal.take()) is not None:
+                for i, line in enumerate(lines):
+                    try:
+                        name, ops = self.journal.parse(line)
+                        await self._apply(self.database[name], ops)
+                    except ConnectionFailure as e:
+                        self.journal.keep(lines[i:])
+                        self._connection_failed(e)
+                        logger.warning(f"⚠️ Rejeu du journal interrompu ({replayed} écriture(s) rejouée(s)).")
+                        return replayed
+                    except Exception as e:
+                        logger.error(f"❌ Ligne du journal non rejouée, mise en quarantaine ({self.journal.rejected_path}) : {e}")
+                        try:
+                            self.journal.quarantine(line)
+                        except OSError as err:
+                            logger.error(f"❌ Quarantaine impossible, ligne perdue : {err}")
+                        self.stats["quarantined"] += 1
+                        continue
+                    replayed += len(ops)
+                    self.stats["replayed"] += len(ops)
+                self.journal.keep([])
+            self._backlog = False
+        if replayed:
+            logger.info(f"✅ Journal local rejoué : {replayed} écriture(s) appliquée(s).")
+        return replayed
+
+    async def _probe_loop(self):
+        while True:
+            await asyncio.sleep(self.probe_interval if self.healthy else self.retry_interval)
+            try:
+                await self.probe()
+            except Exception:
+                # La sonde doit survivre à tout : sans elle, le journal n'est plus jamais rejoué
+                logger.exception("❌ Sonde MongoDB en erreur")
+
+mongo = MongoManager(db, WriteJournal(MONGO_JOURNAL_PATH))
+
+# === Écritures différées (write-behind) ===
+
+class WriteBehindBuffer:
+    """Tampon d'écritures différées : l'appelant n'attend jamais MongoDB.
+
+    Les ``$set`` d'un même document sont fusionnés (le plus récent l'emporte)
+    puis écrits en un seul ``bulk_write`` dès que ``max_batch`` documents sont
+    en attente ou toutes les ``interval`` secondes. Un lot en échec est remis
+    en attente sans écraser les valeurs plus récentes.
+    """
+
+    def __init__(self, collection, name: str, max_batch: int = 500, interval: float = 2.0):
+        self.collection = collection
+        self.name = name
+        self.max_batch = max_batch
+        self.interval = interval
+        self._pending: dict[Hashable, tuple[dict, dict[str, Any]]] = {}
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        # Lot en cours d'écriture : encore visible par ``pending_fields`` jusqu'au retour de MongoDB
+        self._inflight: dict[Hashable, dict[str, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.stats: dict[str, int] = {"queued": 0, "merged": 0, "written": 0, "batches": 0, "failed": 0}
+        self.last_flush_ms: float = 0.0
+        self.max_flush_ms: float = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    def metrics(self) -> dict[str, float]:
+        """Compteurs, profondeur de file et latence des écritures groupées."""
+        return {
+            **self.stats,
+            "queue_depth": self.queue_depth,
+            "last_flush_ms": round(self.last_flush_ms, 1),
+            "max_flush_ms": round(self.max_flush_ms, 1),
+        }
+
+    def set(self, filter: dict, fields: dict[str, Any]) -> None:
+        """Programme ``update_one(filter, {"$set": fields}, upsert=True)``."""
+        key = tuple(sorted(filter.items()))
+        pending = self._pending.get(key)
+        if pending is not None:
+            pending[1].update(fields)
+            self.stats["merged"] += 1
+        else:
+            self._pending[key] = (filter, dict(fields))
+        self.stats["queued"] += 1
+        self.start()
+        if len(self._pending) >= self.max_batch:
+            self._wakeup.set()
+
+    def pending_fields(self, filter: dict) -> dict[str, Any]:
+        """Champs encore en attente (ou en cours) d'écriture pour ce document."""
+        key = tuple(sorted(filter.items()))
+        pending = self._pending.get(key)
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            return dict(pending[1]) if pending else {}
+        return {**inflight, **pending[1]} if pending else dict(inflight)
+
+    def start(self) -> None:
+        """Lance la tâche d'écriture si elle ne tourne pas déjà."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Arrête la tâche d'écriture puis écrit tout ce qui reste (arrêt du bot)."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        if self._pending:
+            logger.error(f"❌ [{self.name}] {len(self._pending)} écriture(s) perdue(s) à l'arrêt.")
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def _requeue(self, batch: list[tuple[Hashable, tuple[dict, dict[str, Any]]]]):
+        for key, (filter, fields) in batch:
+            newer = self._pending.pop(key, None)
+            if newer is not None:
+                fields.update(newer[1])
+            self._pending[key] = (filter, fields)
+
+    async def flush(self) -> int:
+        """Écrit les documents en attente par lots ; retourne le nombre écrit."""
+        written = 0
+        async with self._flush_lock:
+            while self._pending:
+                keys = list(itertools.islice(self._pending, self.max_batch))
+                batch = [(key, self._pending.pop(key)) for key in keys]
+                self._inflight = {key: fields for key, (_, fields) in batch}
+                operations = [
+                    update_op(filter, {"$set": fields}, upsert=True)
+                    for _, (filter, fields) in batch
+                ]
+                start = time.perf_counter()
+                try:
+                    # En mode dégradé, le lot part dans le journal local (mongo.write)
+                    ok = await mongo.write(self.collection, operations)
+                except asyncio.CancelledError:
+                    self._requeue(batch)
+                    raise
+                finally:
+                    self._inflight = {}
+                if not ok:
+                    self._requeue(batch)
+                    self.stats["failed"] += 1
+                    logger.error(f"❌ [{self.name}] Écriture groupée de {len(batch)} document(s) échouée.")
+                    break
+                self.last_flush_ms = (time.perf_counter() - start) * 1000
+                self.max_flush_ms = max(self.max_flush_ms, self.last_flush_ms)
+                self.stats["written"] += len(batch)
+                self.stats["batches"] += 1
+                written += len(batch)
+        return written
+
+# === Files écrites par lots (classement, historique, feedbacks) ===
+
+T = TypeVar("T")
+
+class BatchQueue(Generic[T]):
+    """File en mémoire écrite par lots : l'appelant n'attend jamais MongoDB.
+
+    ``enqueue`` ajoute un élément ; une tâche unique passe les éléments à
+    ``write`` par lots de ``max_batch``, dès qu'un lot est plein ou toutes les
+    ``interval`` secondes. Un lot en échec (``write`` retourne False ou lève)
+    est remis en tête de file et retenté plus tard avec la même composition ;
+    la tâche continue quoi qu'il arrive. Au-delà de ``max_pending`` éléments
+    (MongoDB injoignable), les plus anciens sont perdus.
+    """
+
+    def __init__(self, write: Callable[[list[T]], Awaitable[bool]], name: str,
+                 max_batch: int, max_pending: int, interval: float):
+        self.write = write
+        self.name = name
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.interval = interval
+        self._queue: deque[T] = deque()
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        # Taille du lot en échec en tête de file : il est retenté à l'identique
+        self._retry_size = 0
+        self.stats: dict[str, int] = {"queued": 0, "written": 0, "batches": 0, "failed": 0, "dropped": 0}
+
+    def enqueue(self, item: T) -> None:
+        """Ajoute un élément à la file, sans attendre MongoDB."""
+        if len(self._queue) >= self.max_pending:
+            self._queue.popleft()
+            self._retry_size = max(0, self._retry_size - 1)
+            self.stats["dropped"] += 1
+            logger.warning(f"⚠️ [{self.name}] File pleine : l'élément le plus ancien est perdu.")
+        self._queue.append(item)
+        self.stats["queued"] += 1
+        self.start()
+        if len(self._queue) >= self.max_batch:
+            self._wakeup.set()
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def start(self) -> None:
+        """Lance la tâche d'écriture si elle ne tourne pas déjà."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Arrête la tâche d'écriture et écrit les éléments restants (arrêt du bot)."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        if self._queue:
+            logger.error(f"❌ [{self.name}] {len(self._queue)} élément(s) non écrit(s) à l'arrêt.")
+
+    def on_flushed(self) -> None:
+        """Appelé après chaque passage de la tâche d'écriture (entretien des sous-classes)."""
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+            self.on_flushed()
+
+    def _requeue(self, batch: list[T]) -> None:
+        self._queue.extendleft(reversed(batch))
+        self._retry_size = len(batch)
+
+    async def flush(self) -> int:
+        """Écrit les éléments en attente par lots ; retourne le nombre écrit."""
+        written = 0
+        async with self._flush_lock:
+            while self._queue:
+                size = min(self._retry_size or self.max_batch, len(self._queue))
+                batch = [self._queue.popleft() for _ in range(size)]
+                try:
+                    ok = await self.write(batch)
+                except asyncio.CancelledError:
+                    # Annulation (arrêt du bot) : le lot sera repris par stop()
+                    self._requeue(batch)
+                    raise
+                except Exception:
+                    logger.exception(f"❌ [{self.name}] Écriture d'un lot de {len(batch)} élément(s) en erreur")
+                    ok = False
+                if not ok:
+                    self._requeue(batch)
+                    self.stats["failed"] += 1
+                    break
+                self._retry_size = 0
+                written += len(batch)
+                self.stats["written"] += len(batch)
+                self.stats["batches"] += 1
+        return written
+
+# === Cache en lecture (read-through) ===
+
+class ReadThroughCache:
+    """Cache LRU borné, avec TTL, devant un chargeur asynchrone.
+
+    Les lectures simultanées d'une même clé absente ne déclenchent qu'un seul
+    chargement. ``update`` et ``invalidate`` sont appelés par les chemins
+    d'écriture ; un chargement en cours pendant une écriture n'est pas mis en
+    cache (il pourrait précéder l'écriture).
+    """
+
+    def __init__(self, loader: Callable[[Hashable], Awaitable[Any]], name: str,
+                 max_size: int = 10_000, ttl: float = 300.0):
+        self.loader = loader
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self.stats: dict[str, int] = {
+            "hits": 0, "misses": 0, "coalesced": 0, "expired": 0, "evictions": 0, "invalidations": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def metrics(self) -> dict[str, float]:
+        """Compteurs, taille et taux de succès du cache."""
+        lookups = self.stats["hits"] + self.stats["misses"] + self.stats["coalesced"]
+        return {
+            **self.stats,
+            "size": len(self._data),
+            "hit_ratio": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+        }
+
+    async def get(self, key: Hashable) -> Any:
+        """Valeur en cache, sinon chargée (une seule fois pour les appels simultanés).
+
+        La valeur retournée est partagée : ne pas la modifier.
+        """
+        entry = self._data.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._data.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[1]
+            del self._data[key]
+            self.stats["expired"] += 1
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+        else:
+            self.stats["misses"] += 1
+            task = asyncio.create_task(self.loader(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, key=key: self._loaded(key, t))
+        # shield : l'annulation d'un appelant n'annule pas le chargement partagé
+        return await asyncio.shield(task)
+
+    def _loaded(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is not task:
+            return  # invalidé pendant le chargement
+        del self._inflight[key]
+        if not task.cancelled() and task.exception() is None:
+            self._store(key, task.result())
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def update(self, key: Hashable, fields: dict[str, Any], default: Optional[dict] = None) -> None:
+        """Applique une écriture à l'entrée en cache (document copié, jamais modifié)."""
+        self._inflight.pop(key, None)
+        entry = self._data.get(key)
+        if entry is None:
+            return
+        base = entry[1] if entry[1] is not None else (default or {})
+        self._data[key] = (entry[0], {**base, **fields})
+
+    def invalidate(self, key: Hashable) -> None:
+        self._inflight.pop(key, None)
+        if self._data.pop(key, None) is not None:
+            self.stats["invalidations"] += 1
+
+
+# === Profils utilisateurs ===
+
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "300"))
+
+# Écritures des préférences utilisateur (/menu)
+user_writes = WriteBehindBuffer(users_collection, "users")
+
+async def _load_user(user_id: int) -> Optional[dict]:
+    # Champs relevés avant la lecture aussi : un lot écrit pendant la lecture n'est
+    # plus en attente à son retour, mais le document lu peut le précéder
+    before = user_writes.pending_fields({"user_id": user_id})
+    doc = await mongo.read(lambda: users_collection.find_one({"user_id": user_id}, {"_id": 0}))
+    # Les écritures différées pas encore envoyées (ou en cours) priment sur MongoDB
+    pending = {**before, **user_writes.pending_fields({"user_id": user_id})}
+    if pending:
+        doc = {**(doc or {"user_id": user_id}), **pending}
+    return doc
+
+user_cache = ReadThroughCache(_load_user, "users", max_size=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+
+async def get_user(user_id: int) -> Optional[dict]:
+    """Profil d'un utilisateur (cache, sinon MongoDB), None s'il n'existe pas ou en cas d'erreur."""
     try:
-        await db.command("ping")
+        return await user_cache.get(user_id)
+    except DatabaseUnavailable:
+        return None
+    except Exception as e:
+        logger.error(f"❌ Lecture du profil {user_id} échouée : {e}")
+        return None
+
+def update_user(user_id: int, fields: dict[str, Any]) -> None:
+    """Met à jour des champs du profil : cache immédiatement, MongoDB en différé."""
+    user_writes.set({"user_id": user_id}, fields)
+    user_cache.update(user_id, fields, default={"user_id": user_id})
+
+async def check_mongodb_connection():
+    """Vérifie la connexion (et rejoue un éventuel journal), puis lance la sonde périodique."""
+    if await mongo.probe():
         logger.info("✅ Connexion MongoDB réussie (PyMongo Async) !")
+    else:
+        logger.error("❌ Connexion MongoDB échouée : mode dégradé jusqu'au retour de la base.")
+    mongo.start()
+
+# === Parties de Puissance 4 en cours ===
+games_collection = db["games"]
+
+async def save_game(doc: dict):
+    """Enregistre l'état d'une partie si sa version ``v`` est plus récente que celle stockée.
+
+    Une version plus récente déjà stockée provoque un doublon de ``_id``
+    (upsert), ignoré par ``mongo.write``.
+    """
+    fields = {k: v for k, v in doc.items() if k != "_id"}
+    if not await mongo.write(games_collection, [
+        update_op({"_id": doc["_id"], "v": {"$lt": doc["v"]}}, {"$set": fields}, upsert=True)
+    ]):
+        logger.error(f"❌ Sauvegarde de la partie {doc['_id']} échouée.")
+
+async def delete_game(game_id: str):
+    if not await mongo.write(games_collection, [delete_op({"_id": game_id})]):
+        logger.error(f"❌ Suppression de la partie {game_id} échouée.")
+
+async def load_game(game_id: str):
+    try:
+        return await mongo.read(lambda: games_collection.find_one({"_id": game_id}))
+    except DatabaseUnavailable:
+        return None
+    except Exception as e:
+        logger.error(f"❌ Chargement de la partie {game_id} échoué : {e}")
+        return None
+
+async def load_all_games() -> list[dict]:
+    try:
+        return await mongo.read(lambda: games_collection.find({}).to_list())
+    except Exception as e:
+        logger.error(f"❌ Chargement des parties échoué : {e}")
+        return []
+
+# === Classement Elo du Puissance 4 ===
+ratings_collection = db["ratings"]
+
+RatingKey = tuple[int, int]  # (guild_id, user_id)
+# Derniers lots appliqués gardés par joueur (``batches``) : un lot rejoué après une coupure est ignoré
+RATING_BATCH_MEMORY: int = 32
+
+async def ensure_rating_indexes():
+    """Index du classement : un document par joueur et par serveur, top-N trié par Elo."""
+    try:
+        await ratings_collection.create_index(
+            [("guild_id", ASCENDING), ("user_id", ASCENDING)], unique=True
+        )
+        await ratings_collection.create_index([("guild_id", ASCENDING), ("rating", DESCENDING)])
+    except Exception as e:
+        logger.error(f"❌ Création des index du classement échouée : {e}")
+
+async def load_ratings(keys: Iterable[RatingKey]) -> Optional[dict[RatingKey, float]]:
+    """Retourne l'Elo des joueurs demandés (absents = jamais classés), ou None en cas d'erreur."""
+    query = {"$or": [{"guild_id": guild_id, "user_id": user_id} for guild_id, user_id in keys]}
+    if not query["$or"]:
+        return {}
+    try:
+        docs = await mongo.read(
+            lambda: ratings_collection.find(query, {"guild_id": 1, "user_id": 1, "rating": 1}).to_list()
+        )
+    except DatabaseUnavailable:
+        return None
+    except Exception as e:
+        logger.error(f"❌ Lecture des classements échouée : {e}")
+        return None
+    return {(doc["guild_id"], doc["user_id"]): doc["rating"] for doc in docs}
+
+async def update_ratings(
+    changes: dict[RatingKey, dict[str, float]], new_ratings: dict[RatingKey, float], batch_id: str
+) -> bool:
+    """Applique les variations (``$inc``) en un seul ``bulk_write`` ordonné.
+
+    ``new_ratings`` donne l'Elo initial des joueurs pas encore classés : leur
+    document est créé avant que les ``$inc`` ne s'appliquent. Chaque ``$inc``
+    ne s'applique qu'aux documents qui n'ont pas encore reçu ``batch_id``
+    (gardé dans ``batches``) : un lot journalisé puis rejoué, ou retenté
+    après une coupure au milieu du ``bulk_write``, n'est compté qu'une fois.
+    """
+    operations = [
+        update_op(
+            {"guild_id": guild_id, "user_id": user_id},
+            {"$setOnInsert": {"rating": rating}},
+            upsert=True
+        )
+        for (guild_id, user_id), rating in new_ratings.items()
+    ]
+    operations += [
+        update_op(
+            {"guild_id": guild_id, "user_id": user_id, "batches": {"$ne": batch_id}},
+            {"$inc": inc, "$push": {"batches": {"$each": [batch_id], "$slice": -RATING_BATCH_MEMORY}}},
+        )
+        for (guild_id, user_id), inc in changes.items()
+    ]
+    # En mode dégradé, les variations sont journalisées puis rejouées (mongo.write)
+    if not await mongo.write(ratings_collection, operations):
+        logger.error(f"❌ Mise à jour du classement échouée ({len(changes)} joueurs).")
+        return False
+    return True
+
+async def load_top_ratings(guild_id: int, limit: int) -> Optional[list[dict]]:
+    """Top ``limit`` d'un serveur par Elo décroissant (index ``guild_id, rating``)."""
+    try:
+        return await mongo.read(
+            lambda: ratings_collection.find({"guild_id": guild_id}, {"_id": 0, "batches": 0})
+            .sort("rating", DESCENDING)
+            .limit(limit)
+            .to_list()
+        )
+    except DatabaseUnavailable:
+        return None
+    except Exception as e:
+        logger.error(f"❌ Lecture du classement du serveur {guild_id} échouée : {e}")
+        return None
+
+# === Historique des parties de Puissance 4 terminées ===
+history_collection = db["game_history"]
+
+async def ensure_history_indexes():
+    """Index de l'historique : export par serveur et parties d'un joueur, dans l'ordre des ``_id``."""
+    try:
+        await history_collection.create_index([("guild_id", ASCENDING), ("_id", ASCENDING)])
+        await history_collection.create_index([("players", ASCENDING), ("_id", DESCENDING)])
+    except Exception as e:
+        logger.error(f"❌ Création des index de l'historique échouée : {e}")
+
+async def insert_history(docs: list[dict]) -> bool:
+    """Insère un lot de parties terminées en un seul ``bulk_write``."""
+    if not await mongo.write(history_collection, [insert_op(doc) for doc in docs]):
+        logger.error(f"❌ Insertion de {len(docs)} partie(s) dans l'historique échouée.")
+        return False
+    return True
+
+async def load_history(filter: dict) -> Optional[dict]:
+    """Dernière partie de l'historique correspondant à ``filter``."""
+    try:
+        return await mongo.read(lambda: history_collection.find_one(filter, sort=[("_id", DESCENDING)]))
+    except DatabaseUnavailable:
+        return None
+    except Exception as e:
+        logger.error(f"❌ Lecture de l'historique échouée : {e}")
+        return None
+
+async def load_player_history(user_id: int, limit: int) -> list[dict]:
+    """Dernières parties d'un joueur, sans leurs coups (index ``players, _id``)."""
+    try:
+        return await mongo.read(
+            lambda: history_collection.find({"players": user_id}, {"moves": 0})
+            .sort("_id", DESCENDING)
+            .limit(limit)
+            .to_list()
+        )
+    except DatabaseUnavailable:
+        return []
+    except Exception as e:
+        logger.error(f"❌ Lecture de l'historique du joueur {user_id} échouée : {e}")
+        return []
+
+def iter_guild_history(guild_id: int, batch_size: int = 500) -> AsyncIterator[dict]:
+    """Parties d'un serveur, de la plus ancienne à la plus récente, lues par lots de ``batch_size``."""
+    return mongo.iterate(
+        lambda: history_collection.find({"guild_id": guild_id}).sort("_id", ASCENDING).batch_size(batch_size)
+    )
+
+# === Boîte de réception des feedbacks ===
+feedback_collection = db["feedback"]
+
+async def ensure_feedback_indexes():
+    """Index des feedbacks : pagination ``(created_at, _id)`` et doublons par utilisateur."""
+    try:
+        await feedback_collection.create_index([("created_at", DESCENDING), ("_id", DESCENDING)])
+        await feedback_collection.create_index([("user_id", ASCENDING), ("digest", ASCENDING)], unique=True)
+    except Exception as e:
+        logger.error(f"❌ Création des index des feedbacks échouée : {e}")
+
+async def insert_feedback(docs: list[dict]) -> bool:
+    """Insère un lot de feedbacks en un seul ``bulk_write`` (doublons ignorés)."""
+    if not await mongo.write(feedback_collection, [insert_op(doc) for doc in docs]):
+        logger.error(f"❌ Insertion de {len(docs)} feedback(s) échouée.")
+        return False
+    return True
+
+async def load_feedback_page(before: Optional[tuple[Any, Any]], limit: int) -> Optional[list[dict]]:
+    """Feedbacks du plus récent au plus ancien, strictement avant la clé ``(created_at, _id)``.
+
+    Pagination « keyset » : la page suivante repart de la clé du dernier
+    document affiché, sur l'index ``(created_at, _id)``, au lieu de sauter
+    les documents déjà vus avec ``skip()``.
+    """
+    filter: dict = {}
+    if before is not None:
+        created_at, _id = before
+        filter = {"$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": _id}},
+        ]}
+    try:
+        return await mongo.read(
+            lambda: feedback_collection.find(filter)
+            .sort([("created_at", DESCENDING), ("_id", DESCENDING)])
+            .limit(limit)
+            .to_list()
+        )
+    except DatabaseUnavailable:
+        return None
     except Exception as e:
-        logger.error(f"❌ Connexion MongoDB échouée : {e}")
+        logger.error(f"❌ Lecture des feedbacks échouée : {e}")
+        return None
@@ -0,0 +1,2 @@
+# Moteur de jeu pur (sans dépendance à discord.py), importable depuis les
+# workers du pool de processus et depuis les scripts hors ligne.
@@ -0,0 +1,62 @@
+from engine.grid import CONNECT_FOUR, GridBoard
+
+# =========================================
+# Constantes
+# =========================================
+
+ROWS: int = CONNECT_FOUR.rows
+COLS: int = CONNECT_FOUR.cols
+SIZE: int = ROWS * COLS
+
+# Chaque colonne occupe ROWS + 1 bits : la ligne supplémentaire sert de
+# sentinelle pour que les décalages ne débordent pas d'une colonne à l'autre.
+BIT_HEIGHT: int = ROWS + 1
+
+BOTTOM_MASK: int = sum(1 << (c * BIT_HEIGHT) for c in range(COLS))
+BOARD_MASK: int = BOTTOM_MASK * ((1 << ROWS) - 1)
+
+# =========================================
+# Opérations sur les bitboards
+# =========================================
+
+def column_mask(col: int) -> int:
+    """Retourne le masque de toutes les cases jouables d'une colonne."""
+    return ((1 << ROWS) - 1) << (col * BIT_HEIGHT)
+
+
+def possible_moves(mask: int) -> int:
+    """Retourne le masque des cases où une pièce peut être posée."""
+    return (mask + BOTTOM_MASK) & BOARD_MASK
+
+
+def winning_cells(position: int, mask: int) -> int:
+    """Retourne les cases vides qui compléteraient un alignement pour ``position``."""
+    # Verticale
+    r = (position << 1) & (position << 2) & (position << 3)
+
+    for shift in (BIT_HEIGHT, BIT_HEIGHT + 1, BIT_HEIGHT - 1):
+        p = (position << shift) & (position << (2 * shift))
+        r |= p & (position << (3 * shift))
+        r |= p & (position >> shift)
+        p = (position >> shift) & (position >> (2 * shift))
+        r |= p & (position << shift)
+        r |= p & (position >> (3 * shift))
+
+    return r & (BOARD_MASK ^ mask)
+
+
+# =========================================
+# Plateau
+# =========================================
+
+class Board(GridBoard):
+    """Plateau de Puissance 4 stocké sous forme de deux bitboards.
+
+    ``GridBoard`` à la taille par défaut (``CONNECT_FOUR``) : le solveur et la
+    base de positions n'utilisent que ``position`` et les constantes de ce
+    module. ``bitboards[i]`` contient les pièces du joueur ``i`` (0 ou 1) et
+    ``heights[col]`` le nombre de pièces de la colonne. Le bit
+    ``col * BIT_HEIGHT + ligne`` correspond à une case, la ligne 0 étant en bas.
+    """
+
+    __slots__ = ()
@@ -0,0 +1,234 @@
+"""Base de positions précalculées pour le bouton « meilleur coup ».
+
+Le fichier est construit hors ligne puis ouvert en ``mmap`` au démarrage :
+aucune position n'est chargée en objets Python, une recherche est une
+simple dichotomie sur les enregistrements triés.
+
+Construction :
+    python -m engine.book build [--plies 8] [--depth 6] [--output data/puissance4_book.bin]
+
+Format (little-endian) :
+    en-tête   : magic ``P4BK``, version (u16), plies (u16), nombre d'enregistrements (u32)
+    entrées   : clé canonique (u64), score (i16), meilleure colonne (u8), remplissage (u8)
+"""
+
+import os
+import mmap
+import time
+import struct
+import logging
+import argparse
+from multiprocessing import Pool
+from typing import Iterator, Optional
+
+from engine.board import COLS, BIT_HEIGHT, column_mask, possible_moves, winning_cells
+from engine.solver import Difficulty, Searcher
+
+logger = logging.getLogger(__name__)
+
+# =========================================
+# Constantes
+# =========================================
+
+MAGIC: bytes = b"P4BK"
+VERSION: int = 1
+HEADER = struct.Struct("<4sHHI")
+RECORD = struct.Struct("<QhBx")
+
+DEFAULT_PATH: str = os.getenv("P4_BOOK_PATH", os.path.join("data", "puissance4_book.bin"))
+
+COLUMN_BITS: int = (1 << BIT_HEIGHT) - 1
+
+# =========================================
+# Clés canoniques
+# =========================================
+
+def mirror(bb: int) -> int:
+    """Retourne le bitboard symétrique (colonne ``c`` ↔ ``COLS - 1 - c``)."""
+    result = 0
+    for col in range(COLS):
+        result |= ((bb >> (col * BIT_HEIGHT)) & COLUMN_BITS) << ((COLS - 1 - col) * BIT_HEIGHT)
+    return result
+
+
+def position_key(position: int, mask: int) -> int:
+    """Clé unique d'une position (pièces du joueur au trait + masque)."""
+    return position + mask
+
+
+def canonical_key(position: int, mask: int) -> tuple[int, bool]:
+    """Retourne la clé canonique et True si elle correspond à la position miroir.
+
+    L'addition ne déborde jamais d'une colonne à l'autre, la clé miroir est
+    donc simplement le miroir de la clé.
+    """
+    key = position_key(position, mask)
+    mirrored = mirror(key)
+    if mirrored < key:
+        return mirrored, True
+    return key, False
+
+
+# =========================================
+# Lecture
+# =========================================
+
+class PositionBook:
+    """Accès en lecture seule à un fichier de positions ouvert en ``mmap``."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.plies, self.count = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Fichier de positions invalide : {path}")
+
+    @classmethod
+    def open(cls, path: str = DEFAULT_PATH) -> Optional["PositionBook"]:
+        """Ouvre le fichier s'il existe, sinon retourne None."""
+        if not os.path.exists(path):
+            logger.warning(f"⚠️ Base de positions introuvable : {path}")
+            return None
+        try:
+            book = cls(path)
+        except (OSError, ValueError) as e:
+            logger.error(f"❌ Impossible d'ouvrir la base de positions : {e}")
+            return None
+        logger.info(f"📖 Base de positions chargée : {book.count} positions ({book.plies} coups max)")
+        return book
+
+    def close(self) -> None:
+        self._mmap.close()
+        self._file.close()
+
+    def lookup(self, position: int, mask: int) -> Optional[tuple[int, int]]:
+        """Retourne (meilleure colonne, score) pour la position, ou None si absente."""
+        key, mirrored = canonical_key(position, mask)
+        lo, hi = 0, self.count
+        base, size, buf = HEADER.size, RECORD.size, self._mmap
+        while lo < hi:
+            mid = (lo + hi) // 2
+            record_key, score, col = RECORD.unpack_from(buf, base + mid * size)
+            if record_key < key:
+                lo = mid + 1
+            elif record_key > key:
+                hi = mid
+            else:
+                return (COLS - 1 - col if mirrored else col), score
+        return None
+
+
+_book: Optional[PositionBook] = None
+
+
+def load(path: str = DEFAULT_PATH) -> Optional[PositionBook]:
+    """Ouvre la base de positions partagée (une seule fois par processus)."""
+    global _book
+    if _book is None:
+        _book = PositionBook.open(path)
+    return _book
+
+
+def get_book() -> Optional[PositionBook]:
+    """Retourne la base de positions chargée au démarrage, ou None."""
+    return _book
+
+
+# =========================================
+# Construction hors ligne
+# =========================================
+
+def enumerate_positions(max_plies: int) -> Iterator[tuple[int, int, int]]:
+    """Parcourt les positions non terminées jusqu'à ``max_plies`` coups.
+
+    Chaque position canonique n'est produite qu'une fois, sous la forme
+    (pièces du joueur au trait, masque, nombre de coups).
+    """
+    seen: set[int] = set()
+    stack: list[tuple[int, int, int]] = [(0, 0, 0)]
+    while stack:
+        position, mask, moves = stack.pop()
+        key, _ = canonical_key(position, mask)
+        if key in seen:
+            continue
+        seen.add(key)
+        yield position, mask, moves
+
+        if moves >= max_plies:
+            continue
+        possible = possible_moves(mask)
+        # Les positions gagnées par le joueur au trait ne sont pas explorées
+        if winning_cells(position, mask) & possible:
+            continue
+        for col in range(COLS):
+            move = possible & column_mask(col)
+            if move:
+                stack.append((position ^ mask, mask | move, moves + 1))
+
+
+_builder_searcher: Optional[Searcher] = None
+
+
+def _score_chunk(args: tuple[list[tuple[int, int, int]], int]) -> list[tuple[int, int, int]]:
+    """Score un lot de positions (exécuté dans un worker du pool)."""
+    global _builder_searcher
+    positions, depth = args
+    if _builder_searcher is None:
+        _builder_searcher = Searcher()
+    difficulty = Difficulty("build", max_depth=depth, time_budget=float("inf"))
+    records = []
+    for position, mask, moves in positions:
+        key, mirrored = canonical_key(position, mask)
+        result = _builder_searcher.search(position, mask, moves, difficulty)
+        col = COLS - 1 - result.col if mirrored else result.col
+        records.append((key, result.score, col))
+    return records
+
+
+def build(output: str, max_plies: int, depth: int, workers: Optional[int] = None, chunk: int = 256) -> int:
+    """Construit le fichier de positions et retourne le nombre d'enregistrements."""
+    start = time.perf_counter()
+    positions = list(enumerate_positions(max_plies))
+    logger.info(f"{len(positions)} positions uniques jusqu'à {max_plies} coups")
+
+    chunks = [(positions[i:i + chunk], depth) for i in range(0, len(positions), chunk)]
+    records: list[tuple[int, int, int]] = []
+    with Pool(workers) as pool:
+        for done, batch in enumerate(pool.imap_unordered(_score_chunk, chunks), 1):
+            records.extend(batch)
+            if done % 50 == 0 or done == len(chunks):
+                logger.info(f"{len(records)}/{len(positions)} positions évaluées")
+
+    records.sort()
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    tmp = output + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, max_plies, len(records)))
+        for key, score, col in records:
+            f.write(RECORD.pack(key, score, col))
+    os.replace(tmp, output)
+
+    logger.info(f"✅ {output} écrit en {time.perf_counter() - start:.1f} s")
+    return len(records)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Base de positions du Puissance 4")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    build_parser = sub.add_parser("build", help="Construit le fichier de positions")
+    build_parser.add_argument("--plies", type=int, default=8, help="nombre de coups maximum (8 par défaut)")
+    build_parser.add_argument("--depth", type=int, default=6, help="profondeur de recherche par position")
+    build_parser.add_argument("--output", default=DEFAULT_PATH)
+    build_parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.cmd == "build":
+        build(args.output, args.plies, args.depth, args.workers)
+
+
+if __name__ == "__main__":
+    main()
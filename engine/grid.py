@@ -0,0 +1,216 @@
+"""Plateau générique des jeux d'alignement sur grille : Puissance N, Gomoku…
+
+Une variante est décrite par un ``GridSpec`` : lignes, colonnes, longueur
+d'alignement et gravité (une pièce tombe dans une colonne, ou se pose sur
+n'importe quelle case libre). ``GridBoard`` garde un bitboard par joueur,
+rangé par colonnes de ``rows + 1`` bits comme ``engine.board`` : la ligne
+sentinelle empêche les décalages de passer d'une colonne à la suivante,
+quelle que soit la taille. Les entiers Python n'ont pas de taille fixe : un
+Gomoku 15×15 tient dans un entier de 240 bits.
+
+Deux détections de victoire :
+
+- ``GridBoard.wins_at`` compte, depuis la pièce qui vient d'être posée, les
+  pièces alignées dans les quatre directions : au plus ``2 × (connect - 1)``
+  tests de bit par direction, quelle que soit la taille du plateau. C'est
+  celle d'une partie, coup après coup ;
+- ``has_alignment`` teste tout un bitboard par décalages successifs
+  (O(log connect) opérations sur entiers), pour un plateau reconstruit.
+"""
+
+from dataclasses import dataclass, field
+
+# =========================================
+# Variantes
+# =========================================
+
+@dataclass(frozen=True)
+class GridSpec:
+    """Dimensions et règle d'une variante (ligne 0 = bas du plateau dans les bitboards)."""
+
+    name: str
+    rows: int
+    cols: int
+    connect: int
+    gravity: bool = True
+    # Dérivés, calculés une fois : bits par colonne (sentinelle comprise), cases, et
+    # décalages des quatre directions (verticale, horizontale, diagonales ↗ et ↘)
+    bit_height: int = field(init=False, repr=False, compare=False)
+    size: int = field(init=False, repr=False, compare=False)
+    shifts: tuple[int, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.rows < 1 or self.cols < 1:
+            raise ValueError(f"plateau invalide : {self.rows}×{self.cols}")
+        if not 2 <= self.connect <= max(self.rows, self.cols):
+            raise ValueError(f"alignement impossible sur {self.rows}×{self.cols} : {self.connect}")
+        height = self.rows + 1
+        object.__setattr__(self, "bit_height", height)
+        object.__setattr__(self, "size", self.rows * self.cols)
+        object.__setattr__(self, "shifts", (1, height, height + 1, height - 1))
+
+    def column_mask(self, col: int) -> int:
+        """Masque de toutes les cases jouables d'une colonne."""
+        return ((1 << self.rows) - 1) << (col * self.bit_height)
+
+
+CONNECT_FOUR = GridSpec("Puissance 4", 6, 7, 4)
+GOMOKU = GridSpec("Gomoku", 15, 15, 5, gravity=False)
+
+
+def has_alignment(bb: int, spec: GridSpec) -> bool:
+    """Retourne True si le bitboard contient ``spec.connect`` pièces alignées."""
+    n = spec.connect
+    for shift in spec.shifts:
+        # runs : bits qui commencent une suite d'au moins ``length`` pièces
+        runs, length = bb, 1
+        while length * 2 <= n:
+            runs &= runs >> (shift * length)
+            length *= 2
+        if length < n:
+            runs &= runs >> (shift * (n - length))
+        if runs:
+            return True
+    return False
+
+
+# =========================================
+# Plateau
+# =========================================
+
+class GridBoard:
+    """Plateau d'une variante : deux bitboards, hauteurs des colonnes et dernier coup.
+
+    ``bitboards[i]`` contient les pièces du joueur ``i`` (0 ou 1) ; le bit
+    ``col * spec.bit_height + ligne`` correspond à une case, la ligne 0 étant
+    en bas. ``last`` est le bit de la dernière pièce posée (None pour un
+    plateau reconstruit depuis ses bitboards).
+    """
+
+    __slots__ = ("spec", "bitboards", "heights", "moves", "last")
+
+    def __init__(self, spec: GridSpec = CONNECT_FOUR):
+        self.spec = spec
+        self.bitboards: list[int] = [0, 0]
+        self.heights: list[int] = [0] * spec.cols
+        self.moves: int = 0
+        self.last: int | None = None
+
+    @classmethod
+    def from_bitboards(cls, bitboards: list[int], spec: GridSpec = CONNECT_FOUR) -> "GridBoard":
+        """Reconstruit un plateau à partir des deux bitboards (hauteurs recalculées)."""
+        board = cls(spec)
+        board.bitboards = list(bitboards)
+        mask = bitboards[0] | bitboards[1]
+        board.heights = [(mask & spec.column_mask(c)).bit_count() for c in range(spec.cols)]
+        board.moves = mask.bit_count()
+        return board
+
+    @classmethod
+    def from_moves(
+        cls, moves: bytes, first: int = 0, plies: int | None = None, spec: GridSpec = CONNECT_FOUR
+    ) -> "GridBoard":
+        """Rejoue les ``plies`` premiers coups d'un journal (un coup par octet, voir ``apply``).
+
+        Les joueurs alternent à partir de ``first`` ; aucune détection de
+        victoire en route, seulement la validité de chaque coup.
+        """
+        board = cls(spec)
+        player = first
+        for move in moves[:plies]:
+            if not board.apply(move, player):
+                raise ValueError(f"coup invalide dans le journal : {move}")
+            player ^= 1
+        return board
+
+    # === Coups ===
+
+    def play(self, col: int, player: int) -> bool:
+        """Pose une pièce du joueur ``player`` dans la colonne si possible (avec gravité)."""
+        spec = self.spec
+        if not 0 <= col < spec.cols or self.heights[col] >= spec.rows:
+            return False
+        self.last = bit = col * spec.bit_height + self.heights[col]
+        self.bitboards[player] |= 1 << bit
+        self.heights[col] += 1
+        self.moves += 1
+        return True
+
+    def place(self, row: int, col: int, player: int) -> bool:
+        """Pose une pièce sur une case libre (ligne 0 = haut), sans gravité."""
+        spec = self.spec
+        if not (0 <= row < spec.rows and 0 <= col < spec.cols):
+            return False
+        bit = col * spec.bit_height + spec.rows - 1 - row
+        if (self.bitboards[0] | self.bitboards[1]) >> bit & 1:
+            return False
+        self.last = bit
+        self.bitboards[player] |= 1 << bit
+        self.heights[col] += 1
+        self.moves += 1
+        return True
+
+    def apply(self, move: int, player: int) -> bool:
+        """Joue un coup codé sur un octet : la colonne avec gravité, sinon ``ligne * cols + colonne``."""
+        if self.spec.gravity:
+            return self.play(move, player)
+        return self.place(*divmod(move, self.spec.cols), player)
+
+    # === Victoire ===
+
+    def wins_at(self, bit: int, player: int) -> bool:
+        """True si la pièce du bit ``bit`` complète un alignement de ``player``.
+
+        Compte les pièces consécutives de part et d'autre de la case dans
+        chaque direction ; la ligne sentinelle (toujours vide) arrête le
+        décompte au bord d'une colonne.
+        """
+        bb = self.bitboards[player]
+        connect = self.spec.connect
+        for shift in self.spec.shifts:
+            run = 1
+            step = bit + shift
+            while run < connect and bb >> step & 1:
+                run += 1
+                step += shift
+            step = bit - shift
+            while run < connect and step >= 0 and bb >> step & 1:
+                run += 1
+                step -= shift
+            if run >= connect:
+                return True
+        return False
+
+    def last_move_wins(self) -> bool:
+        """True si la dernière pièce posée aligne ``connect`` pièces (détection incrémentale)."""
+        last = self.last
+        if last is None:
+            return False
+        return self.wins_at(last, 0 if self.bitboards[0] >> last & 1 else 1)
+
+    def has_won(self, player: int) -> bool:
+        """Vérifie si le joueur ``player`` a aligné ``connect`` pièces (tout le plateau)."""
+        return has_alignment(self.bitboards[player], self.spec)
+
+    # === Lecture ===
+
+    def is_full(self) -> bool:
+        """Retourne True si le plateau est rempli (match nul)."""
+        return self.moves == self.spec.size
+
+    def is_column_full(self, col: int) -> bool:
+        """Retourne True si la colonne ne peut plus recevoir de pièce."""
+        return self.heights[col] >= self.spec.rows
+
+    def cell(self, row: int, col: int) -> int | None:
+        """Retourne le joueur occupant la case (ligne 0 = haut), ou None."""
+        bit = 1 << (col * self.spec.bit_height + self.spec.rows - 1 - row)
+        if self.bitboards[0] & bit:
+            return 0
+        if self.bitboards[1] & bit:
+            return 1
+        return None
+
+    def position(self, player: int) -> tuple[int, int]:
+        """Retourne le couple (pièces de ``player``, masque des pièces posées)."""
+        return self.bitboards[player], self.bitboards[0] | self.bitboards[1]
@@ -0,0 +1,298 @@
+"""Recherche negamax / alpha-beta pour jouer contre BotRonron.
+
+La recherche tourne dans un pool de processus (voir ``best_move``) afin
+qu'une analyse profonde ne bloque jamais la boucle asyncio du bot.
+"""
+
+import os
+import time
+import random
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+from engine.board import (
+    COLS, SIZE, Board,
+    column_mask, possible_moves, winning_cells,
+)
+
+# =========================================
+# Constantes
+# =========================================
+
+WIN_SCORE: int = 1000
+TT_SIZE: int = (1 << 19) - 1  # nombre premier : ~500k entrées au maximum
+
+# Colonnes explorées du centre vers les bords
+MOVE_ORDER: tuple[int, ...] = tuple(COLS // 2 + (1 - 2 * (i % 2)) * (i + 1) // 2 for i in range(COLS))
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+@dataclass(frozen=True)
+class Difficulty:
+    """Paramètres de recherche associés à un niveau de difficulté."""
+
+    label: str
+    max_depth: int
+    time_budget: float
+    randomness: float = 0.0
+
+
+DIFFICULTIES: dict[str, Difficulty] = {
+    "facile": Difficulty("😺 Facile", max_depth=2, time_budget=0.2, randomness=0.35),
+    "moyen": Difficulty("😼 Moyen", max_depth=6, time_budget=0.5),
+    "difficile": Difficulty("😾 Difficile", max_depth=12, time_budget=1.5),
+    "expert": Difficulty("🐯 Expert", max_depth=SIZE, time_budget=2.5),
+}
+
+# Recherche courte utilisée par le bouton « meilleur coup » hors de la base de positions
+HINT_DIFFICULTY = Difficulty("💡 Indice", max_depth=5, time_budget=0.1)
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    """Résultat d'une recherche : coup choisi et statistiques."""
+
+    col: int
+    score: int
+    depth: int
+    nodes: int
+    elapsed: float
+
+
+class SearchTimeout(Exception):
+    """Levée lorsque le budget de temps d'un coup est épuisé."""
+
+
+# =========================================
+# Table de transposition
+# =========================================
+
+class TranspositionTable:
+    """Table de transposition bornée, indexée par ``clé % taille``.
+
+    Une nouvelle entrée écrase simplement l'ancienne à la même adresse : la
+    mémoire reste fixe quel que soit le nombre de positions explorées.
+    """
+
+    __slots__ = ("size", "keys", "entries")
+
+    def __init__(self, size: int = TT_SIZE):
+        self.size = size
+        self.keys: list[int] = [0] * size
+        self.entries: list[Optional[tuple[int, int, int, int]]] = [None] * size
+
+    def get(self, key: int) -> Optional[tuple[int, int, int, int]]:
+        """Retourne (profondeur, type de borne, valeur, coup) ou None."""
+        i = key % self.size
+        if self.keys[i] == key:
+            return self.entries[i]
+        return None
+
+    def put(self, key: int, depth: int, flag: int, value: int, move: int) -> None:
+        i = key % self.size
+        self.keys[i] = key
+        self.entries[i] = (depth, flag, value, move)
+
+
+# =========================================
+# Recherche
+# =========================================
+
+def _popcount(x: int) -> int:
+    return x.bit_count()
+
+
+def evaluate(position: int, mask: int) -> int:
+    """Heuristique : différence de cases gagnantes ouvertes entre les joueurs."""
+    mine = winning_cells(position, mask)
+    theirs = winning_cells(position ^ mask, mask)
+    return _popcount(mine) - _popcount(theirs)
+
+
+class Searcher:
+    """Negamax avec élagage alpha-beta, ordre des coups et approfondissement itératif."""
+
+    def __init__(self, tt_size: int = TT_SIZE):
+        self.tt = TranspositionTable(tt_size)
+        self.nodes = 0
+        self.deadline = float("inf")
+
+    def negamax(self, position: int, mask: int, moves: int, depth: int, alpha: int, beta: int) -> int:
+        """Score de la position pour le joueur au trait (``position``)."""
+        self.nodes += 1
+        if not self.nodes & 1023 and time.perf_counter() > self.deadline:
+            raise SearchTimeout
+
+        possible = possible_moves(mask)
+        if winning_cells(position, mask) & possible:
+            return WIN_SCORE - moves - 1
+        if moves >= SIZE - 1:
+            return 0
+
+        # Coups qui ne perdent pas immédiatement
+        opponent_wins = winning_cells(position ^ mask, mask)
+        forced = possible & opponent_wins
+        if forced:
+            if forced & (forced - 1):
+                return -(WIN_SCORE - moves - 2)
+            possible = forced
+        possible &= ~(opponent_wins >> 1)
+        if not possible:
+            return -(WIN_SCORE - moves - 2)
+
+        if depth <= 0:
+            return evaluate(position, mask)
+
+        key = position + mask
+        tt_move = -1
+        entry = self.tt.get(key)
+        if entry is not None:
+            entry_depth, flag, value, tt_move = entry
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return value
+                if flag == LOWER:
+                    alpha = max(alpha, value)
+                elif flag == UPPER:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        alpha_orig = alpha
+        best_value = -WIN_SCORE
+        best_col = -1
+        for col in self._ordered_moves(position, mask, possible, tt_move):
+            move = possible & column_mask(col)
+            value = -self.negamax(position ^ mask, mask | move, moves + 1, depth - 1, -beta, -alpha)
+            if value > best_value:
+                best_value, best_col = value, col
+            if value > alpha:
+                alpha = value
+                if alpha >= beta:
+                    break
+
+        if best_value <= alpha_orig:
+            flag = UPPER
+        elif best_value >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.tt.put(key, depth, flag, best_value, best_col)
+        return best_value
+
+    @staticmethod
+    def _ordered_moves(position: int, mask: int, possible: int, first: int = -1) -> list[int]:
+        """Trie les colonnes jouables : coup de la table, puis menaces créées, puis centre."""
+        scored = []
+        for rank, col in enumerate(MOVE_ORDER):
+            move = possible & column_mask(col)
+            if not move:
+                continue
+            if col == first:
+                score = 1 << 10
+            else:
+                score = _popcount(winning_cells(position | move, mask))
+            scored.append((-score, rank, col))
+        scored.sort()
+        return [col for _, _, col in scored]
+
+    def search(self, position: int, mask: int, moves: int, difficulty: Difficulty) -> SearchResult:
+        """Approfondissement itératif jusqu'à ``max_depth`` ou l'épuisement du budget."""
+        start = time.perf_counter()
+        self.nodes = 0
+        self.deadline = start + difficulty.time_budget
+
+        possible = possible_moves(mask)
+        legal = [col for col in MOVE_ORDER if possible & column_mask(col)]
+
+        # Victoire immédiate : inutile de chercher
+        wins = winning_cells(position, mask) & possible
+        for col in legal:
+            if wins & column_mask(col):
+                return SearchResult(col, WIN_SCORE - moves - 1, 0, 1, time.perf_counter() - start)
+
+        if difficulty.randomness and random.random() < difficulty.randomness:
+            opponent_wins = winning_cells(position ^ mask, mask)
+            safe = [
+                col for col in legal
+                if not (possible & column_mask(col) & (opponent_wins >> 1))
+            ] or legal
+            return SearchResult(random.choice(safe), 0, 0, 0, time.perf_counter() - start)
+
+        best_col, best_score, completed = legal[0], 0, 0
+        max_depth = min(difficulty.max_depth, SIZE - moves)
+        try:
+            for depth in range(1, max_depth + 1):
+                col, score = self._search_root(position, mask, moves, depth, legal, best_col)
+                best_col, best_score, completed = col, score, depth
+                if abs(score) >= WIN_SCORE - SIZE:
+                    break
+        except SearchTimeout:
+            pass
+
+        return SearchResult(best_col, best_score, completed, self.nodes, time.perf_counter() - start)
+
+    def _search_root(self, position: int, mask: int, moves: int, depth: int,
+                     legal: list[int], previous_best: int) -> tuple[int, int]:
+        possible = possible_moves(mask)
+        alpha, beta = -WIN_SCORE, WIN_SCORE
+        best_col, best_score = previous_best, -WIN_SCORE
+        ordered = [previous_best] + [col for col in legal if col != previous_best]
+        for col in ordered:
+            move = possible & column_mask(col)
+            score = -self.negamax(position ^ mask, mask | move, moves + 1, depth - 1, -beta, -alpha)
+            if score > best_score:
+                best_col, best_score = col, score
+            alpha = max(alpha, score)
+        return best_col, best_score
+
+
+# =========================================
+# Pool de processus
+# =========================================
+
+_searcher: Optional[Searcher] = None
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def search_position(position: int, mask: int, moves: int, difficulty: Difficulty) -> SearchResult:
+    """Point d'entrée exécuté dans un worker ; la table de transposition y est conservée."""
+    global _searcher
+    if _searcher is None:
+        _searcher = Searcher()
+    return _searcher.search(position, mask, moves, difficulty)
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """Crée le pool de recherche à la première utilisation."""
+    global _pool
+    if _pool is None:
+        workers = int(os.getenv("SOLVER_WORKERS", "1"))
+        _pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_pool() -> None:
+    """Arrête le pool de recherche s'il a été démarré."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def best_move(board: Board, player: int, difficulty: str | Difficulty) -> SearchResult:
+    """Calcule le coup du joueur ``player`` sans bloquer la boucle d'événements."""
+    if isinstance(difficulty, str):
+        difficulty = DIFFICULTIES[difficulty]
+    position, mask = board.position(player)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_pool(), search_position, position, mask, board.moves, difficulty
+    )
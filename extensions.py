@@ -1,3 +1,30 @@
+"""Liste des extensions (cogs) du bot, chargement isolé et rechargement à chaud.
+
+Chaque extension est chargée indépendamment : une extension en échec est
+journalisée avec son erreur, sans empêcher le chargement des suivantes. Les
+``cog_load`` qui attendent MongoDB (restauration des parties, index) tournent
+en parallèle. L'empreinte SHA-256 du fichier source de chaque extension est
+gardée pour ``reload_changed`` : seules les extensions modifiées depuis leur
+chargement sont rechargées, sans redémarrer le bot ni se réidentifier auprès
+de la passerelle.
+
+Seul le module de l'extension est rechargé : une modification d'un module
+partagé (``db.py``, ``engine/``…) demande toujours un redémarrage.
+"""
+
+import asyncio
+import hashlib
+import importlib
+import importlib.util
+import logging
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from discord.ext import commands
+
+logger = logging.getLogger(__name__)
+
 # Liste des modules de commandes à charger
 EXTENSIONS = [
     "commands.status",
@@ -5,6 +32,96 @@ EXTENSIONS = [
     "commands.avatar",
     "commands.menu",
     "commands.sync_cmds",
+    "commands.diagnostic",
     "commands.modal",
     "commands.puissance4",
+    "commands.classement",
 ]
+
+# Empreinte du fichier source de chaque extension chargée (conservée par
+# importlib.reload, qui relit EXTENSIONS dans reload_changed)
+source_hashes: dict[str, str] = globals().get("source_hashes", {})
+
+
+@dataclass
+class LoadReport:
+    name: str
+    action: str  # "chargée", "rechargée", "déchargée"
+    seconds: float
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __str__(self) -> str:
+        if self.ok:
+            return f"{self.name} {self.action} ({self.seconds * 1000:.0f} ms)"
+        return f"{self.name} en échec ({self.seconds * 1000:.0f} ms) : {self.error}"
+
+
+def source_hash(name: str) -> Optional[str]:
+    """SHA-256 du fichier source de l'extension, None s'il est introuvable."""
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.origin:
+        return None
+    try:
+        with open(spec.origin, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+async def _timed(bot: commands.Bot, name: str, action: str) -> LoadReport:
+    digest = source_hash(name)
+    start = time.perf_counter()
+    try:
+        if action == "rechargée":
+            await bot.reload_extension(name)
+        elif action == "déchargée":
+            await bot.unload_extension(name)
+        else:
+            await bot.load_extension(name)
+    except Exception as e:
+        report = LoadReport(name, action, time.perf_counter() - start, e)
+        logger.error(f"❌ Extension {report}", exc_info=e)
+        return report
+    if action == "déchargée":
+        source_hashes.pop(name, None)
+    elif digest:
+        source_hashes[name] = digest
+    report = LoadReport(name, action, time.perf_counter() - start)
+    logger.info(f"Extension {report}")
+    return report
+
+
+async def load_all(bot: commands.Bot, names: Optional[list[str]] = None) -> list[LoadReport]:
+    """Charge les extensions en parallèle ; chaque échec reste isolé.
+
+    Les imports restent séquentiels (ils sont synchrones) ; seules les attentes
+    des ``setup`` / ``cog_load`` se chevauchent. La durée de chaque extension
+    est donc son temps de chargement, attentes d'E/S comprises.
+    """
+    names = EXTENSIONS if names is None else names
+    return list(await asyncio.gather(*(_timed(bot, name, "chargée") for name in names)))
+
+
+async def reload_changed(bot: commands.Bot) -> list[LoadReport]:
+    """Recharge les extensions dont le fichier source a changé.
+
+    La liste ``EXTENSIONS`` est relue : les extensions ajoutées sont chargées,
+    les extensions retirées déchargées. ``bot.reload_extension`` restaure
+    l'ancienne version si la nouvelle échoue à se charger.
+    """
+    importlib.reload(importlib.import_module(__name__))
+
+    loaded = set(bot.extensions)
+    todo = [(name, "chargée") for name in EXTENSIONS if name not in loaded]
+    todo += [(name, "rechargée") for name in EXTENSIONS
+             if name in loaded and source_hash(name) != source_hashes.get(name)]
+    todo += [(name, "déchargée") for name in sorted(loaded - set(EXTENSIONS)) if name.startswith("commands.")]
+    # Séquentiel : un rechargement retire puis rajoute des commandes de l'arbre
+    return [await _timed(bot, name, action) for name, action in todo]
@@ -0,0 +1,100 @@
+"""Boîte de réception des feedbacks (/feedback), insérés dans MongoDB par lots.
+
+Un envoi accepté ne fait qu'ajouter un document à une file en mémoire ; une
+tâche unique l'insère par lots (un ``bulk_write`` d'``InsertOne``), comme
+l'historique des parties. Avant la file, chaque utilisateur est limité à
+``RATE_LIMIT`` envois par fenêtre de ``RATE_WINDOW`` secondes, et un envoi
+identique (même sujet et même message, à la casse et aux espaces près) est
+refusé. L'empreinte du texte est aussi stockée, sous un index unique
+``(user_id, digest)`` : un doublon qui échappe à la mémoire (redémarrage,
+autre processus) n'est qu'une clé en double, ignorée à l'insertion.
+
+``/feedback_list`` parcourt la boîte par pagination « keyset » sur l'index
+``(created_at, _id)`` (voir ``db.load_feedback_page``) : chaque page coûte
+le même prix, quelle que soit sa position.
+"""
+
+import os
+import time
+import hashlib
+import logging
+import datetime
+from collections import deque
+from typing import Optional
+
+from bson import ObjectId
+
+import db
+
+logger = logging.getLogger(__name__)
+
+# Délai maximal (s) entre un envoi et son insertion
+FLUSH_INTERVAL: float = float(os.getenv("FEEDBACK_FLUSH", "5"))
+# Envois par bulk_write ; un lot plein déclenche une écriture immédiate
+MAX_BATCH: int = 100
+# Au-delà (MongoDB injoignable), les envois les plus anciens sont perdus
+MAX_PENDING: int = 5_000
+# Envois acceptés par utilisateur et par fenêtre glissante (secondes)
+RATE_LIMIT: int = int(os.getenv("FEEDBACK_RATE_LIMIT", "3"))
+RATE_WINDOW: float = float(os.getenv("FEEDBACK_RATE_WINDOW", "600"))
+
+
+def feedback_digest(subject: str, message: str) -> str:
+    """Empreinte d'un envoi, insensible à la casse et aux espaces."""
+    normalized = " ".join(f"{subject}\n{message}".casefold().split())
+    return hashlib.blake2b(normalized.encode(), digest_size=12).hexdigest()
+
+
+class FeedbackInbox(db.BatchQueue[dict]):
+    """File des feedbacks à insérer par lots (``db.BatchQueue``), avec limite de débit et dédoublonnage par utilisateur."""
+
+    def __init__(self):
+        super().__init__(db.insert_feedback, "feedbacks", MAX_BATCH, MAX_PENDING, FLUSH_INTERVAL)
+        # Envois récents par utilisateur : (horodatage, empreinte), du plus ancien au plus récent
+        self._recent: dict[int, deque[tuple[float, str]]] = {}
+        self.stats.update({"duplicates": 0, "rate_limited": 0})
+
+    def _recent_of(self, user_id: int, now: float) -> deque[tuple[float, str]]:
+        recent = self._recent.setdefault(user_id, deque())
+        while recent and recent[0][0] <= now - RATE_WINDOW:
+            recent.popleft()
+        return recent
+
+    def submit(
+        self, user_id: int, guild_id: Optional[int], subject: str, message: str
+    ) -> Optional[str]:
+        """Met un feedback en file ; retourne le motif du refus (message pour l'utilisateur), ou None."""
+        now = time.time()
+        digest = feedback_digest(subject, message)
+        recent = self._recent_of(user_id, now)
+        if any(d == digest for _, d in recent):
+            self.stats["duplicates"] += 1
+            return "📨 Tu as déjà envoyé ce feedback, merci !"
+        if len(recent) >= RATE_LIMIT:
+            self.stats["rate_limited"] += 1
+            retry = int(recent[0][0] + RATE_WINDOW)
+            return f"⏳ Trop de feedbacks envoyés, réessaie <t:{retry}:R>."
+        recent.append((now, digest))
+
+        self.enqueue({
+            "_id": ObjectId(),
+            "created_at": datetime.datetime.now(datetime.timezone.utc),
+            "user_id": user_id,
+            "guild_id": guild_id,
+            "subject": subject,
+            "message": message,
+            "digest": digest,
+        })
+        return None
+
+    def prune(self) -> None:
+        """Oublie les utilisateurs sans envoi dans la fenêtre courante."""
+        now = time.time()
+        for user_id in [u for u, recent in self._recent.items() if not self._recent_of(u, now)]:
+            del self._recent[user_id]
+
+    def on_flushed(self) -> None:
+        self.prune()
+
+
+inbox = FeedbackInbox()
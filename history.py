@@ -0,0 +1,122 @@
+"""Historique des parties de Puissance 4 terminées, inséré dans MongoDB par lots.
+
+Chaque partie terminée devient un document de ``game_history`` : ses coups
+tiennent dans une chaîne d'octets (un indice de colonne par coup, 42 octets
+au plus), avec les joueurs, celui qui a commencé, le résultat et les dates.
+La fin d'une partie ne fait qu'ajouter le document à une file en mémoire ;
+une tâche unique l'insère par lots (un ``bulk_write`` d'``InsertOne``). Le
+``_id`` est fixé à la création : une insertion rejouée depuis le journal
+local n'est qu'un doublon, ignoré.
+
+``export_ndjson`` parcourt le curseur MongoDB d'un serveur et écrit une
+ligne JSON par partie au fil de la lecture : l'export n'est jamais chargé
+entièrement en mémoire.
+"""
+
+import os
+import json
+import logging
+import datetime
+from typing import IO, Optional
+
+from bson import ObjectId
+
+import db
+from engine.grid import CONNECT_FOUR, GridSpec
+
+logger = logging.getLogger(__name__)
+
+# Délai maximal (s) entre la fin d'une partie et son insertion
+FLUSH_INTERVAL: float = float(os.getenv("HISTORY_FLUSH", "5"))
+# Parties par bulk_write ; un lot plein déclenche une écriture immédiate
+MAX_BATCH: int = 500
+# Au-delà (MongoDB injoignable), les parties les plus anciennes sont perdues
+MAX_PENDING: int = 50_000
+
+# Coups stockés en octets 0–9 (colonnes), exportés en chiffres « 0 »–« 9 »
+_DIGITS = bytes.maketrans(bytes(range(10)), b"0123456789")
+
+
+def moves_to_text(moves: bytes) -> str:
+    """Journal de coups lisible : un chiffre (colonne, à partir de 0) par coup."""
+    return bytes(moves).translate(_DIGITS).decode("ascii")
+
+
+def history_doc(
+    game_id: str,
+    guild_id: Optional[int],
+    channel_id: Optional[int],
+    players: tuple[int, ...],
+    first: int,
+    moves: bytes,
+    winner: Optional[int],
+    timeout: bool,
+    difficulty: Optional[str],
+    started: float,
+    spec: GridSpec = CONNECT_FOUR,
+) -> dict:
+    """Document ``game_history`` d'une partie qui vient de se terminer.
+
+    ``grid`` (lignes, colonnes, alignement) n'est présent que pour un Puissance N.
+    """
+    doc = {
+        "_id": ObjectId(),
+        "game_id": game_id,
+        "guild_id": guild_id,
+        "channel_id": channel_id,
+        "players": list(players),
+        "first": first,
+        "moves": bytes(moves),
+        "winner": winner,
+        "draw": winner is None,
+        "timeout": timeout,
+        "difficulty": difficulty,
+        "started": datetime.datetime.fromtimestamp(started, datetime.timezone.utc),
+        "ended": datetime.datetime.now(datetime.timezone.utc),
+    }
+    if spec != CONNECT_FOUR:
+        doc["grid"] = [spec.rows, spec.cols, spec.connect]
+    return doc
+
+
+def ndjson_line(doc: dict) -> str:
+    """Ligne NDJSON d'une partie (IDs en chaînes : ils dépassent les entiers sûrs de JavaScript)."""
+    return json.dumps({
+        "id": str(doc["_id"]),
+        "game_id": doc.get("game_id"),
+        "guild_id": str(doc["guild_id"]) if doc.get("guild_id") else None,
+        "channel_id": str(doc["channel_id"]) if doc.get("channel_id") else None,
+        "players": [str(p) for p in doc["players"]],
+        "grid": doc.get("grid", [CONNECT_FOUR.rows, CONNECT_FOUR.cols, CONNECT_FOUR.connect]),
+        "first": doc.get("first", 0),
+        "moves": moves_to_text(doc["moves"]),
+        "winner": doc.get("winner"),
+        "draw": doc.get("draw", False),
+        "timeout": doc.get("timeout", False),
+        "difficulty": doc.get("difficulty"),
+        "started": doc["started"].isoformat() if doc.get("started") else None,
+        "ended": doc["ended"].isoformat() if doc.get("ended") else None,
+    }, ensure_ascii=False) + "\n"
+
+
+async def export_ndjson(guild_id: int, out: IO[bytes]) -> int:
+    """Écrit l'historique du serveur dans ``out``, une partie par ligne ; retourne le nombre de parties."""
+    count = 0
+    async for doc in db.iter_guild_history(guild_id):
+        out.write(ndjson_line(doc).encode())
+        count += 1
+    return count
+
+
+class GameHistory(db.BatchQueue[dict]):
+    """File de parties terminées à insérer par lots (``db.BatchQueue``)."""
+
+    def __init__(self):
+        super().__init__(db.insert_history, "historique", MAX_BATCH, MAX_PENDING, FLUSH_INTERVAL)
+
+    def record(self, doc: dict) -> None:
+        """Ajoute une partie terminée à la file, sans attendre MongoDB."""
+        self.enqueue(doc)
+
+
+history = GameHistory()
@@ -1,42 +1,156 @@
+"""Serveur HTTP de santé (keep-alive Render / UptimeRobot), sur la boucle asyncio du bot.
+
+Démarré depuis ``setup_hook`` : aucune thread, aucun serveur de développement.
+``/`` répond toujours (keep-alive) ; ``/ping`` et ``/status`` décrivent l'état
+réel du bot et répondent 503 tant que la passerelle Discord n'est pas prête ;
+``/metrics`` expose les métriques Prometheus de ``metrics.py``.
+
+Si le port ne peut pas être ouvert, le serveur retente avec un délai
+exponentiel (``KEEP_ALIVE_MAX_RESTARTS`` tentatives), puis abandonne sans
+arrêter le bot.
+"""
+
 import os
-from flask import Flask
-from threading import Thread
-import logging
+import math
 import time
+import asyncio
+import logging
+from typing import Optional
+
+from aiohttp import web
+from discord.ext import commands
+
+import db
+import metrics
+from loop_watchdog import watchdog
+
+logger = logging.getLogger(__name__)
+
+PORT: int = int(os.getenv("PORT", "8080"))
+MAX_RESTARTS: int = int(os.getenv("KEEP_ALIVE_MAX_RESTARTS", "5"))
+BACKOFF_BASE: float = 1.0
+BACKOFF_MAX: float = 60.0
+START_TIME = time.time()
+
+
+def _ms(seconds: float) -> Optional[float]:
+    """Latence en ms, None tant qu'elle n'est pas connue (``nan``/``inf`` avant connexion)."""
+    return round(seconds * 1000, 1) if math.isfinite(seconds) else None
+
+
+class HealthServer:
+    """Serveur aiohttp sur la boucle courante, avec reprise bornée si le port est pris.
+
+    Les sous-classes ajoutent leurs routes à ``self.app`` ; ``/`` répond toujours.
+    """
+
+    def __init__(self, host: str = "0.0.0.0", port: int = PORT):
+        self.host = host
+        self.port = port
+        self._task: Optional[asyncio.Task] = None
+        self.app = web.Application()
+        self.app.add_routes([web.get("/", self.home)])
+
+    async def home(self, request: web.Request) -> web.Response:
+        return web.Response(text="BotRonron est en vie ! 🐱")
+
+    # === Cycle de vie ===
+
+    def start(self) -> None:
+        """Lance le serveur sur la boucle courante."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._serve())
+
+    async def stop(self) -> None:
+        """Ferme le port et arrête le serveur."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _serve(self) -> None:
+        runner = web.AppRunner(self.app, access_log=None)
+        await runner.setup()
+        try:
+            for attempt in range(MAX_RESTARTS + 1):
+                try:
+                    await web.TCPSite(runner, self.host, self.port).start()
+                except OSError as e:
+                    if attempt == MAX_RESTARTS:
+                        logger.error(f"❌ Serveur keep-alive abandonné après {attempt + 1} tentatives : {e}")
+                        return
+                    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt)
+                    logger.warning(f"⚠️ Serveur keep-alive indisponible ({e}), nouvel essai dans {delay:.0f} s.")
+                    await asyncio.sleep(delay)
+                    continue
+                logger.info(f"🔥 Serveur keep-alive démarré sur le port {self.port}")
+                await asyncio.Event().wait()  # jusqu'à stop()
+        finally:
+            await runner.cleanup()
+
+
+class KeepAliveServer(HealthServer):
+    """État d'un processus bot ; en cluster, ``/status`` inclut l'instantané du lanceur."""
+
+    def __init__(self, bot: commands.Bot, host: str = "0.0.0.0", port: int = PORT):
+        super().__init__(host, port)
+        self.bot = bot
+        self.app.add_routes([
+            web.get("/ping", self.ping),
+            web.get("/status", self.status),
+            web.get("/metrics", self.prometheus),
+        ])
+
+    # === Routes ===
+
+    async def ping(self, request: web.Request) -> web.Response:
+        latency = _ms(self.bot.latency)
+        if not self.connected() or latency is None:
+            return web.Response(text="gateway down", status=503)
+        return web.Response(text=f"pong {latency} ms")
+
+    async def status(self, request: web.Request) -> web.Response:
+        mongo = db.mongo.metrics()
+        cluster = getattr(self.bot, "cluster", None)
+        connected = self.connected()
+        if not connected:
+            state = "starting" if not self.bot.is_closed() else "offline"
+        else:
+            state = "online" if mongo["healthy"] else "degraded"
+        return web.json_response({
+            "status": state,
+            "bot": "BotRonron",
+            "user": str(self.bot.user) if self.bot.user else None,
+            "latency_ms": _ms(self.bot.latency),
+            "shards": self.shards(),
+            "guilds": len(self.bot.guilds),
+            "loop_lag": watchdog.metrics(),
+            "db": mongo,
+            "cluster": cluster.snapshot if cluster else None,
+            "uptime_s": int(time.time() - START_TIME),
+            "timestamp": int(time.time()),
+        }, status=200 if connected else 503)
+
+    async def prometheus(self, request: web.Request) -> web.Response:
+        """Métriques au format texte Prometheus (voir ``metrics.py``)."""
+        return web.Response(text=metrics.render(), content_type="text/plain", charset="utf-8",
+                            headers={"X-Prometheus-Format": "0.0.4"})
+
+    # === État du bot ===
+
+    def connected(self) -> bool:
+        return self.bot.is_ready() and not self.bot.is_closed()
 
-app = Flask('')
-
-# Désactive les logs Flask pour éviter le spam
-log = logging.getLogger('werkzeug')
-log.setLevel(logging.ERROR)
-
-@app.route('/')
-def home():
-    return "BotRonron est en vie ! 🐱"
-
-@app.route('/ping')
-def ping():
-    return "pong"
-
-@app.route('/status')
-def status():
-    return {
-        "status": "online",
-        "bot": "BotRonron",
-        "timestamp": int(time.time())
-    }
-
-def run():
-    try:
-        port = int(os.environ.get("PORT", 8080))
-        app.run(host='0.0.0.0', port=port, debug=False)
-    except Exception as e:
-        print(f"Erreur serveur Flask: {e}")
-        time.sleep(5)
-        run()  # Redémarre en cas d'erreur
-
-def keep_alive():
-    print("🔥 Serveur keep-alive démarré")
-    t = Thread(target=run)
-    t.daemon = True
-    t.start()
+    def shards(self) -> dict[str, dict]:
+        """Latence et état de chaque shard (un seul sans ``AutoShardedBot``)."""
+        shards = getattr(self.bot, "shards", None)
+        if shards is not None:
+            return {
+                str(shard_id): {"latency_ms": _ms(info.latency), "closed": info.is_closed()}
+                for shard_id, info in shards.items()
+            }
+        ws = self.bot.ws
+        return {str(self.bot.shard_id or 0): {"latency_ms": _ms(self.bot.latency), "closed": ws is None or not ws.open}}
@@ -0,0 +1,233 @@
+"""Lanceur multi-processus : répartit les shards du bot entre plusieurs workers.
+
+Chaque worker est un processus ``AutoShardedBot`` (``bot.create_bot``) qui fait
+tourner une plage contiguë de shards et envoie son état au lanceur
+(``cluster.py``). Le lanceur sert le port ``PORT`` (Render / UptimeRobot) avec
+une vue globale : serveurs, latence de chaque shard, mémoire de chaque
+processus. Les workers écoutent en local sur ``PORT + 1 + cluster`` pour
+leurs propres ``/status`` et ``/metrics``.
+
+Un worker qui s'arrête est relancé avec un délai exponentiel ; SIGTERM arrête
+proprement tous les workers (leurs écritures différées sont vidées).
+
+Usage :
+    python launcher.py [--clusters 2] [--shards 8]      # SHARD_COUNT / CLUSTERS
+    python launcher.py --standin --clusters 2 --shards 4 --guilds 200   # faux Discord local
+"""
+
+import os
+import signal
+import asyncio
+import logging
+import argparse
+import multiprocessing
+from typing import Optional
+
+import discord
+from aiohttp import web
+from dotenv import load_dotenv
+
+# Avant les modules du projet : ils lisent leur configuration à l'import
+load_dotenv()
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+from cluster import ClusterHub, shard_ranges  # noqa: E402
+from keep_alive import HealthServer, PORT  # noqa: E402
+
+RESTART_BACKOFF_MAX: float = 60.0
+# Un worker resté en vie plus longtemps repart d'un délai de relance minimal
+RESTART_RESET_AFTER: float = 300.0
+STOP_TIMEOUT: float = 30.0
+
+
+def worker_main(cluster_id: int, shard_ids: list[int], shard_count: int, standin_url: Optional[str]) -> None:
+    """Point d'entrée d'un processus worker (contexte ``spawn``)."""
+    if standin_url:
+        from benchmarks.standin_gateway import point_discord_to
+
+        os.environ.setdefault("TOKEN", "standin")
+        point_discord_to(standin_url)
+
+    import bot
+
+    bot.run(bot.create_bot(
+        shard_ids=shard_ids,
+        shard_count=shard_count,
+        cluster_id=cluster_id,
+        http_host="127.0.0.1",
+        http_port=PORT + 1 + cluster_id,
+    ))
+
+
+async def recommended_shard_count(token: str) -> int:
+    """Nombre de shards recommandé par Discord (``GET /gateway/bot``)."""
+    http = discord.http.HTTPClient(asyncio.get_running_loop())
+    try:
+        await http.static_login(token)
+        shards, _, _ = await http.get_bot_gateway()
+        return shards
+    finally:
+        await http.close()
+
+
+class ClusterHealthServer(HealthServer):
+    """Santé du cluster entier, à partir des rapports des workers."""
+
+    def __init__(self, launcher: "Launcher", host: str = "0.0.0.0", port: int = PORT):
+        super().__init__(host, port)
+        self.launcher = launcher
+        self.app.add_routes([
+            web.get("/ping", self.ping),
+            web.get("/status", self.status),
+        ])
+
+    async def ping(self, request: web.Request) -> web.Response:
+        snapshot = self.launcher.hub.snapshot()
+        ready = sum(c["ready"] for c in snapshot["clusters"].values())
+        expected = len(self.launcher.ranges)
+        if ready < expected:
+            return web.Response(text=f"clusters prêts : {ready}/{expected}", status=503)
+        return web.Response(text=f"pong ({expected} clusters, {snapshot['guilds']} serveurs)")
+
+    async def status(self, request: web.Request) -> web.Response:
+        snapshot = self.launcher.hub.snapshot()
+        ready = sum(c["ready"] for c in snapshot["clusters"].values())
+        expected = len(self.launcher.ranges)
+        state = "online" if ready == expected else "starting" if ready == 0 else "degraded"
+        return web.json_response({
+            "status": state,
+            "bot": "BotRonron",
+            "shard_count": self.launcher.shard_count,
+            "clusters_expected": expected,
+            "clusters_ready": ready,
+            "restarts": self.launcher.restarts,
+            **snapshot,
+        }, status=200 if ready == expected else 503)
+
+
+class Launcher:
+    def __init__(self, shard_count: int, clusters: int, standin_url: Optional[str] = None):
+        self.shard_count = shard_count
+        self.ranges = shard_ranges(shard_count, clusters)
+        self.standin_url = standin_url
+        self.hub = ClusterHub()
+        self.health = ClusterHealthServer(self)
+        self.processes: dict[int, multiprocessing.process.BaseProcess] = {}
+        self.restarts: dict[int, int] = {cluster_id: 0 for cluster_id in range(len(self.ranges))}
+        self._started: dict[int, float] = {}
+        self._stopping = asyncio.Event()
+        self._context = multiprocessing.get_context("spawn")
+
+    def spawn(self, cluster_id: int) -> None:
+        shard_ids = self.ranges[cluster_id]
+        process = self._context.Process(
+            target=worker_main,
+            args=(cluster_id, shard_ids, self.shard_count, self.standin_url),
+            name=f"cluster-{cluster_id}",
+        )
+        # Hérité par le worker dès son démarrage, avant tout import (``db`` via ``keep_alive``) :
+        # son journal MongoDB et son état de synchronisation portent son numéro (``cluster.local_path``)
+        os.environ["CLUSTER_ID"] = str(cluster_id)
+        process.start()
+        self.processes[cluster_id] = process
+        self._started[cluster_id] = asyncio.get_running_loop().time()
+        logger.info(f"🚀 Cluster {cluster_id} lancé (pid {process.pid}, shards {shard_ids[0]}–{shard_ids[-1]})")
+
+    async def supervise(self, cluster_id: int) -> None:
+        """Relance le worker s'il s'arrête, avec un délai exponentiel."""
+        loop = asyncio.get_running_loop()
+        while not self._stopping.is_set():
+            process = self.processes[cluster_id]
+            await loop.run_in_executor(None, process.join)
+            if self._stopping.is_set():
+                return
+            self.hub.forget(cluster_id)
+            if loop.time() - self._started[cluster_id] > RESTART_RESET_AFTER:
+                self.restarts[cluster_id] = 0
+            delay = min(RESTART_BACKOFF_MAX, 2 ** self.restarts[cluster_id])
+            self.restarts[cluster_id] += 1
+            logger.error(f"❌ Cluster {cluster_id} arrêté (code {process.exitcode}), relance dans {delay} s.")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), delay)
+                return
+            except asyncio.TimeoutError:
+                self.spawn(cluster_id)
+
+    async def stop(self) -> None:
+        """Arrête les workers (SIGTERM, puis SIGKILL après ``STOP_TIMEOUT``)."""
+        self._stopping.set()
+        for process in self.processes.values():
+            if process.is_alive():
+                process.terminate()
+        loop = asyncio.get_running_loop()
+        for cluster_id, process in self.processes.items():
+            await loop.run_in_executor(None, process.join, STOP_TIMEOUT)
+            if process.is_alive():
+                logger.warning(f"⚠️ Cluster {cluster_id} ne répond pas à SIGTERM, arrêt forcé.")
+                process.kill()
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, self._stopping.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+        await self.hub.start()
+        self.health.start()
+        logger.info(f"[Lanceur] {self.shard_count} shards sur {len(self.ranges)} processus.")
+        for cluster_id in range(len(self.ranges)):
+            self.spawn(cluster_id)
+        supervisors = [asyncio.create_task(self.supervise(c)) for c in range(len(self.ranges))]
+
+        await self._stopping.wait()
+        logger.info("[Lanceur] Arrêt des clusters…")
+        await self.stop()
+        for task in supervisors:
+            task.cancel()
+        await self.health.stop()
+        await self.hub.stop()
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    standin = None
+    standin_url = None
+    if args.standin:
+        from benchmarks.standin_gateway import StandinDiscord
+
+        standin = StandinDiscord(args.shards or 4, args.guilds)
+        standin_url = await standin.start()
+
+    shard_count = args.shards
+    if shard_count is None:
+        token = os.getenv("TOKEN")
+        if not token:
+            logger.error("❌ TOKEN non trouvé : impossible de demander le nombre de shards à Discord.")
+            return
+        shard_count = await recommended_shard_count(token)
+        logger.info(f"[Lanceur] Discord recommande {shard_count} shard(s).")
+
+    try:
+        await Launcher(shard_count, args.clusters, standin_url).run()
+    finally:
+        if standin:
+            await standin.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clusters", type=int, default=int(os.getenv("CLUSTERS", os.cpu_count() or 1)),
+                        help="processus workers (CLUSTERS, un par cœur par défaut)")
+    shards = os.getenv("SHARD_COUNT")
+    parser.add_argument("--shards", type=int, default=int(shards) if shards else None,
+                        help="nombre total de shards (SHARD_COUNT ; sinon recommandé par Discord)")
+    parser.add_argument("--standin", action="store_true", help="faux Discord local (benchmarks/standin_gateway.py)")
+    parser.add_argument("--guilds", type=int, default=200, help="serveurs du faux Discord")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Classement Elo du Puissance 4 par serveur, écrit en différé dans MongoDB.
+
+La fin d'une partie ne fait qu'ajouter son résultat à une file en mémoire.
+Une tâche unique vide la file : elle lit l'Elo des joueurs concernés, calcule
+les variations dans l'ordre des parties puis les applique en un seul
+``bulk_write`` de ``$inc``. Un lot en échec est remis en tête de file et
+retenté tel quel : son identifiant, tiré des résultats qui le composent,
+est inscrit dans chaque document modifié, et un lot déjà appliqué (rejeu du
+journal, nouvel essai après une coupure) n'est pas compté deux fois.
+
+Le top-N de chaque serveur consulté est gardé en cache et rafraîchi
+périodiquement, seulement si de nouveaux résultats ont été écrits.
+"""
+
+import os
+import time
+import hashlib
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Optional
+
+from bson import ObjectId
+
+import db
+
+logger = logging.getLogger(__name__)
+
+INITIAL_RATING: float = 1200.0
+K_FACTOR: float = 32.0
+
+# Délai maximal (s) entre la fin d'une partie et son écriture
+FLUSH_INTERVAL: float = float(os.getenv("LEADERBOARD_FLUSH", "5"))
+# Résultats par bulk_write ; un lot plein déclenche une écriture immédiate
+MAX_BATCH: int = 500
+# Au-delà (MongoDB injoignable), les résultats les plus anciens sont perdus
+MAX_PENDING: int = 50_000
+
+TOP_SIZE: int = 10
+# Un serveur dont le classement n'est plus consulté sort du cache
+TOP_TTL: float = 30 * 60.0
+
+
+@dataclass(frozen=True, slots=True)
+class GameResult:
+    guild_id: int
+    player1: int
+    player2: int
+    score: float  # 1 = victoire du joueur 1, 0.5 = nul, 0 = victoire du joueur 2
+    result_id: ObjectId = field(default_factory=ObjectId)
+
+
+def batch_id(batch: list[GameResult]) -> str:
+    """Identifiant d'un lot, stable tant que sa composition l'est."""
+    return hashlib.blake2b(b"".join(r.result_id.binary for r in batch), digest_size=12).hexdigest()
+
+
+def expected_score(rating: float, opponent: float) -> float:
+    """Probabilité de victoire attendue de ``rating`` contre ``opponent``."""
+    return 1 / (1 + 10 ** ((opponent - rating) / 400))
+
+
+def elo_delta(rating1: float, rating2: float, score: float, k: float = K_FACTOR) -> float:
+    """Variation d'Elo du joueur 1 (le joueur 2 reçoit l'opposé)."""
+    return k * (score - expected_score(rating1, rating2))
+
+
+class Leaderboard(db.BatchQueue[GameResult]):
+    """File de résultats à écriture différée (``db.BatchQueue``) et cache du top-N par serveur."""
+
+    def __init__(self):
+        super().__init__(self._write, "classement", MAX_BATCH, MAX_PENDING, FLUSH_INTERVAL)
+        self._top: dict[int, list[dict]] = {}
+        self._top_used: dict[int, float] = {}
+        self._dirty: set[int] = set()
+
+    # === File de résultats ===
+
+    def record(self, guild_id: int, player1: int, player2: int, score: float) -> None:
+        """Ajoute le résultat d'une partie à la file, sans attendre MongoDB."""
+        self.enqueue(GameResult(guild_id, player1, player2, score))
+
+    async def _write(self, batch: list[GameResult]) -> bool:
+        keys = {(r.guild_id, p) for r in batch for p in (r.player1, r.player2)}
+        ratings = await db.load_ratings(keys)
+        if ratings is None:
+            return False
+        new_ratings = {key: INITIAL_RATING for key in keys if key not in ratings}
+        ratings.update(new_ratings)
+
+        changes: dict[db.RatingKey, dict[str, float]] = defaultdict(lambda: defaultdict(int))
+        for r in batch:
+            key1, key2 = (r.guild_id, r.player1), (r.guild_id, r.player2)
+            delta = elo_delta(ratings[key1], ratings[key2], r.score)
+            ratings[key1] += delta
+            ratings[key2] -= delta
+            for key, score, sign in ((key1, r.score, 1), (key2, 1 - r.score, -1)):
+                inc = changes[key]
+                inc["rating"] += sign * delta
+                inc["games"] += 1
+                inc["wins" if score == 1 else "losses" if score == 0 else "draws"] += 1
+
+        ok = await db.update_ratings({key: dict(inc) for key, inc in changes.items()}, new_ratings, batch_id(batch))
+        if ok:
+            self._dirty.update(r.guild_id for r in batch)
+        return ok
+
+    # === Top-N en cache ===
+
+    def cached_top(self, guild_id: int) -> Optional[list[dict]]:
+        """Top-N en cache du serveur, ou None s'il n'a pas encore été chargé."""
+        top = self._top.get(guild_id)
+        if top is not None:
+            self._top_used[guild_id] = time.monotonic()
+        return top
+
+    async def top(self, guild_id: int) -> list[dict]:
+        """Top-N du serveur : cache, sinon lecture MongoDB (indexée)."""
+        top = self.cached_top(guild_id)
+        if top is None:
+            top = await db.load_top_ratings(guild_id, TOP_SIZE)
+            if top is None:
+                return []  # erreur MongoDB : rien n'est mis en cache
+            self._top[guild_id] = top
+            self._top_used[guild_id] = time.monotonic()
+        return top
+
+    async def refresh(self) -> int:
+        """Recharge le top-N des serveurs en cache modifiés depuis le dernier passage."""
+        now = time.monotonic()
+        for guild_id, used in list(self._top_used.items()):
+            if now - used > TOP_TTL:
+                self._top.pop(guild_id, None)
+                del self._top_used[guild_id]
+
+        stale = self._dirty & self._top.keys()
+        self._dirty.clear()
+        for guild_id in stale:
+            top = await db.load_top_ratings(guild_id, TOP_SIZE)
+            if top is None:
+                self._dirty.add(guild_id)
+            else:
+                self._top[guild_id] = top
+        return len(stale)
+
+
+leaderboard = Leaderboard()
@@ -0,0 +1,193 @@
+"""Surveillance de la boucle asyncio : retard, blocages et profilage par échantillonnage.
+
+Une tâche de la boucle bat toutes les ``WATCHDOG_INTERVAL`` secondes et mesure
+son propre retard. Un thread de surveillance vérifie ces battements : s'ils
+s'arrêtent plus de ``WATCHDOG_STALL`` secondes, un rappel bloque la boucle
+(appel synchrone, calcul trop long…). La pile du thread de la boucle est alors
+capturée et journalisée, une fois par blocage.
+
+``Watchdog.profile`` échantillonne la pile de la boucle pendant N secondes et
+retourne un rapport des frames les plus chaudes, sans redémarrer le bot.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import threading
+import traceback
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Optional
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+INTERVAL: float = float(os.getenv("WATCHDOG_INTERVAL", "0.1"))
+STALL_THRESHOLD: float = float(os.getenv("WATCHDOG_STALL", "0.25"))
+PROFILE_INTERVAL: float = 0.005
+MAX_STALLS: int = 20
+TOP_FRAMES: int = 15
+
+
+@dataclass(slots=True)
+class Stall:
+    at: float           # time.time() à la détection
+    duration: float     # s, mis à jour jusqu'à la reprise de la boucle
+    stack: str
+
+
+def _short_path(path: str) -> str:
+    """Chemin raccourci au dossier du bot ou au dossier des paquets installés."""
+    for root in (os.getcwd(), *(p for p in sys.path if p.endswith("-packages"))):
+        if root and path.startswith(root):
+            return os.path.relpath(path, root)
+    return path
+
+
+def _where(frame) -> str:
+    """``fichier:ligne fonction`` de la frame."""
+    return f"{_short_path(frame.f_code.co_filename)}:{frame.f_lineno} {frame.f_code.co_name}"
+
+
+def _is_idle(frame) -> bool:
+    """La boucle attend des événements (``select``) : rien à profiler."""
+    return frame.f_code.co_name == "select" and frame.f_code.co_filename.endswith("selectors.py")
+
+
+class Watchdog:
+    def __init__(self, interval: float = INTERVAL, threshold: float = STALL_THRESHOLD):
+        self.interval = interval
+        self.threshold = threshold
+        self.stalls: deque[Stall] = deque(maxlen=MAX_STALLS)
+        self.stats: dict[str, float] = {"stalls": 0, "max_stall_ms": 0.0}
+        self._lags: deque[float] = deque(maxlen=int(60 / interval))  # ~1 min
+        self._beat = time.monotonic()
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    # === Cycle de vie ===
+
+    def start(self) -> None:
+        """Lance le battement (sur la boucle courante) et le thread de surveillance."""
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._heartbeat())
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._watch, name="watchdog", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    # === Battement et retard ===
+
+    async def _heartbeat(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - start - self.interval)
+            self._beat = time.monotonic()
+            self._lags.append(lag)
+            metrics.loop_lag.observe(lag)
+
+    def metrics(self) -> dict[str, float]:
+        """Dernier retard, retard maximal sur ~1 min et blocages détectés (ms)."""
+        last = self._lags[-1] if self._lags else 0.0
+        peak = max(self._lags) if self._lags else 0.0
+        return {
+            "last_ms": round(last * 1000, 1),
+            "max_ms": round(peak * 1000, 1),
+            "stalls": self.stats["stalls"],
+            "max_stall_ms": round(self.stats["max_stall_ms"], 1),
+        }
+
+    # === Détection des blocages (thread de surveillance) ===
+
+    def _watch(self) -> None:
+        current: Optional[Stall] = None
+        while not self._stopping.wait(self.interval):
+            silent = time.monotonic() - self._beat - self.interval
+            if silent <= self.threshold:
+                current = None
+                continue
+            if current is None:
+                current = Stall(time.time(), silent, self._loop_stack())
+                self.stalls.append(current)
+                self.stats["stalls"] += 1
+                metrics.loop_stalls.inc()
+                logger.warning(
+                    f"⚠️ Boucle asyncio bloquée depuis {silent * 1000:.0f} ms, pile du rappel en cours :\n"
+                    f"{current.stack}"
+                )
+            current.duration = silent
+            self.stats["max_stall_ms"] = max(self.stats["max_stall_ms"], silent * 1000)
+
+    def _loop_stack(self) -> str:
+        """Pile du thread de la boucle, à partir du rappel exécuté par asyncio."""
+        frame = sys._current_frames().get(self._loop_thread) if self._loop_thread else None
+        if frame is None:
+            return "(pile indisponible)"
+        entries = traceback.extract_stack(frame)
+        starts = [i for i, entry in enumerate(entries) if entry.filename.endswith(os.path.join("asyncio", "events.py"))]
+        return "".join(traceback.format_list(entries[starts[-1] + 1:] if starts else entries))
+
+    # === Profilage par échantillonnage ===
+
+    def _sample(self, duration: float) -> str:
+        """Échantillonne la pile de la boucle pendant ``duration`` s (thread à part)."""
+        own: Counter[str] = Counter()
+        inclusive: Counter[str] = Counter()
+        samples = idle = 0
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            frame = sys._current_frames().get(self._loop_thread) if self._loop_thread else None
+            if frame is not None:
+                samples += 1
+                if _is_idle(frame):
+                    idle += 1
+                else:
+                    own[_where(frame)] += 1
+                    # Une seule fois par fonction et par échantillon (récursion), hors asyncio
+                    functions = {
+                        (f.f_code.co_filename, f.f_code.co_name)
+                        for f, _ in traceback.walk_stack(frame) if "asyncio" not in f.f_code.co_filename
+                    }
+                    inclusive.update(f"{_short_path(path)} {name}" for path, name in functions)
+            time.sleep(PROFILE_INTERVAL)
+        return self._report(duration, samples, idle, own, inclusive)
+
+    def _report(self, duration: float, samples: int, idle: int, own: Counter, inclusive: Counter) -> str:
+        busy = samples - idle
+        lines = [
+            f"Profil de la boucle asyncio sur {duration:g} s : {samples} échantillons "
+            f"(toutes les {PROFILE_INTERVAL * 1000:.0f} ms), occupée {busy / max(samples, 1):.1%}.",
+            "",
+            "Frames les plus chaudes (temps propre, % du temps occupé) :",
+        ]
+        lines += [f"  {count / max(busy, 1):6.1%}  {where}" for where, count in own.most_common(TOP_FRAMES)]
+        lines += ["", "Fonctions les plus présentes dans la pile (temps cumulé) :"]
+        lines += [f"  {count / max(busy, 1):6.1%}  {where}" for where, count in inclusive.most_common(TOP_FRAMES)]
+        if self.stalls:
+            lines += ["", f"Derniers blocages (seuil {self.threshold * 1000:.0f} ms) :"]
+            for stall in list(self.stalls)[-5:]:
+                when = time.strftime("%H:%M:%S", time.localtime(stall.at))
+                lines += [f"--- {when}, {stall.duration * 1000:.0f} ms ---", stall.stack]
+        return "\n".join(lines)
+
+    async def profile(self, duration: float) -> str:
+        """Rapport de profilage de la boucle sur ``duration`` secondes."""
+        return await asyncio.to_thread(self._sample, duration)
+
+
+watchdog = Watchdog()
@@ -0,0 +1,65 @@
+"""Politique de cache des membres Discord et chargement paresseux par serveur.
+
+Par défaut, comme avant, tous les membres de tous les serveurs sont demandés
+à la passerelle au démarrage (« chunking ») et gardés en mémoire. En mode
+mémoire réduite (``LOW_MEMORY=1``), aucun serveur n'est chargé au démarrage
+et le cache ne garde que les membres reçus au fil des événements ; un serveur
+n'est chargé entièrement qu'au premier besoin, via ``ensure_chunked``.
+
+Variables d'environnement :
+    LOW_MEMORY        1 pour activer le mode mémoire réduite (0 par défaut)
+    MEMBER_CACHE      all | none | liste de drapeaux ``MemberCacheFlags``
+                      séparés par des virgules (``joined``, ``voice``) ;
+                      ``none`` par défaut en mode mémoire réduite, ``all`` sinon
+    CHUNK_AT_STARTUP  1/0 ; par défaut 0 en mode mémoire réduite, 1 sinon
+"""
+
+import os
+import asyncio
+import logging
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+LOW_MEMORY: bool = os.getenv("LOW_MEMORY", "0") == "1"
+MEMBER_CACHE: str = os.getenv("MEMBER_CACHE", "none" if LOW_MEMORY else "all").strip().lower()
+CHUNK_AT_STARTUP: bool = os.getenv("CHUNK_AT_STARTUP", "0" if LOW_MEMORY else "1") == "1"
+
+# Au-delà, le chargement d'un serveur est abandonné (l'appelant se rabat sur l'API)
+CHUNK_TIMEOUT: float = float(os.getenv("CHUNK_TIMEOUT", "30"))
+
+
+def member_cache_flags() -> discord.MemberCacheFlags:
+    """Drapeaux de cache correspondant à ``MEMBER_CACHE`` (``all`` si invalide)."""
+    if MEMBER_CACHE == "all":
+        return discord.MemberCacheFlags.all()
+    flags = discord.MemberCacheFlags.none()
+    if MEMBER_CACHE == "none":
+        return flags
+    for name in filter(None, (part.strip() for part in MEMBER_CACHE.split(","))):
+        if name not in discord.MemberCacheFlags.VALID_FLAGS:
+            logger.error(f"❌ MEMBER_CACHE : drapeau inconnu « {name} », cache complet utilisé.")
+            return discord.MemberCacheFlags.all()
+        setattr(flags, name, True)
+    return flags
+
+
+def has_full_member_cache() -> bool:
+    """Vrai si tous les membres de tous les serveurs sont en mémoire (configuration par défaut)."""
+    return CHUNK_AT_STARTUP and MEMBER_CACHE == "all"
+
+
+async def ensure_chunked(guild: discord.Guild) -> bool:
+    """Charge les membres du serveur s'ils ne le sont pas encore ; retourne ``guild.chunked``.
+
+    discord.py regroupe déjà les demandes simultanées pour un même serveur.
+    """
+    if guild.chunked:
+        return True
+    logger.info(f"[Membres] Chargement paresseux du serveur {guild.id} ({guild.member_count} membres).")
+    try:
+        await asyncio.wait_for(guild.chunk(cache=True), CHUNK_TIMEOUT)
+    except (asyncio.TimeoutError, discord.ClientException) as e:
+        logger.warning(f"⚠️ Chargement des membres du serveur {guild.id} impossible : {e!r}")
+    return guild.chunked
@@ -0,0 +1,308 @@
+"""Métriques du bot au format texte Prometheus, servies par ``keep_alive`` sur ``/metrics``.
+
+Séries :
+    botronron_app_command_duration_seconds{command}      durée des commandes slash
+    botronron_app_command_errors_total{command,error}    erreurs des commandes slash
+    botronron_interaction_ack_seconds{kind,view}         délai d'acquittement des composants et modals
+    botronron_active_views{view}                         vues actives par type
+    botronron_mongo_command_duration_seconds{command}    latence des commandes MongoDB
+    botronron_mongo_command_failures_total{command}      commandes MongoDB en échec
+    botronron_gateway_latency_seconds{shard}             latence de la passerelle Discord
+    botronron_event_loop_lag_seconds                     retard de la boucle asyncio (loop_watchdog)
+    botronron_event_loop_stalls_total                    blocages de la boucle détectés
+
+Le chemin chaud n'est fait que d'opérations sur des dicts et des listes, sans
+verrou : tout tourne sur la boucle asyncio du bot, sauf
+``event_loop_stalls_total``, écrit par le seul thread de ``loop_watchdog``.
+Les jauges sont calculées au moment de la lecture de ``/metrics`` seulement.
+"""
+
+import math
+import time
+import logging
+import functools
+from bisect import bisect_left
+from typing import Any, Callable
+
+import discord
+from discord import app_commands
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "botronron_"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ACK_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0)  # limite Discord : 3 s
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+MONGO_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 3.0)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+# =========================================
+# Types de métriques
+# =========================================
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name, self.help, self.labelnames = PREFIX + name, help, labelnames
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels: Any, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in self._values.items():
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    """Histogramme à seaux fixes ; ``observe`` coûte une recherche dichotomique."""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.name, self.help, self.labelnames = PREFIX + name, help, labelnames
+        self.buckets = buckets
+        # labels -> [compte par seau (+Inf en dernier), somme]
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels: Any) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in self._series.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """Jauge calculée à la lecture : ``collect()`` retourne ``{labels: valeur}``."""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...], collect: Callable[[], dict[tuple, float]]):
+        self.name, self.help, self.labelnames = PREFIX + name, help, labelnames
+        self.collect = collect
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        try:
+            values = self.collect()
+        except Exception:
+            logger.exception(f"❌ Lecture de la jauge {self.name} impossible.")
+            return lines
+        for labels, value in values.items():
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, Any] = {}
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+app_command_duration = registry.register(Histogram(
+    "app_command_duration_seconds", "Durée d'exécution des commandes slash.", ("command",)))
+app_command_errors = registry.register(Counter(
+    "app_command_errors_total", "Commandes slash terminées par une erreur.", ("command", "error")))
+interaction_ack = registry.register(Histogram(
+    "interaction_ack_seconds", "Délai entre la création d'une interaction et son acquittement.",
+    ("kind", "view"), ACK_BUCKETS))
+mongo_duration = registry.register(Histogram(
+    "mongo_command_duration_seconds", "Latence des commandes MongoDB.", ("command",), MONGO_BUCKETS))
+mongo_failures = registry.register(Counter(
+    "mongo_command_failures_total", "Commandes MongoDB en échec.", ("command",)))
+loop_lag = registry.register(Histogram(
+    "event_loop_lag_seconds", "Retard de réveil de la boucle asyncio.", (), LAG_BUCKETS))
+loop_stalls = registry.register(Counter(
+    "event_loop_stalls_total", "Blocages de la boucle asyncio au-delà du seuil du watchdog."))
+
+
+# =========================================
+# Commandes slash
+# =========================================
+
+class InstrumentedTree(app_commands.CommandTree):
+    """``CommandTree`` qui mesure la durée et les erreurs de chaque commande.
+
+    Le début est noté dans ``interaction.extras`` par ``interaction_check`` ;
+    la fin est relevée par ``on_app_command_completion`` (voir ``install``)
+    ou par ``on_error``.
+    """
+
+    async def interaction_check(self, interaction: discord.Interaction, /) -> bool:
+        interaction.extras["metrics_start"] = time.perf_counter()
+        return True
+
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError, /) -> None:
+        command = interaction.command.qualified_name if interaction.command else "inconnue"
+        cause = getattr(error, "original", error)
+        app_command_errors.inc(command, type(cause).__name__)
+        _observe_command(interaction, command)
+        await super().on_error(interaction, error)
+
+
+def _observe_command(interaction: discord.Interaction, command: str) -> None:
+    start = interaction.extras.pop("metrics_start", None)
+    if start is not None:
+        app_command_duration.observe(time.perf_counter() - start, command)
+
+
+async def _on_app_command_completion(interaction: discord.Interaction, command) -> None:
+    _observe_command(interaction, command.qualified_name)
+
+
+# =========================================
+# Acquittement des composants et modals
+# =========================================
+
+# Méthodes de ``InteractionResponse`` qui acquittent une interaction
+ACK_METHODS = ("defer", "send_message", "edit_message", "send_modal")
+
+_ACK_KINDS = {
+    discord.InteractionType.component: "component",
+    discord.InteractionType.modal_submit: "modal",
+}
+
+
+def _view_name(interaction: discord.Interaction) -> str:
+    """Type de la vue (ou du modal) visée, retrouvé dans le ViewStore de discord.py."""
+    data: dict = interaction.data or {}  # type: ignore[assignment]
+    custom_id = str(data.get("custom_id", ""))
+    store = getattr(interaction._state, "_view_store", None)
+    try:
+        if interaction.type is discord.InteractionType.modal_submit:
+            modal = store._modals.get(custom_id) if store else None
+            return type(modal).__name__ if modal else "Modal"
+        key = (data.get("component_type"), custom_id)
+        message_id = interaction.message.id if interaction.message else None
+        for entity_id in (message_id, None):
+            item = store._views.get(entity_id, {}).get(key) if store else None
+            if item is not None and item.view is not None:
+                return type(item.view).__name__
+    except AttributeError:
+        pass  # structure interne de discord.py différente : repli sur le custom_id
+    # custom_id « préfixe:id:action » (Puissance 4) : l'ID de partie n'est pas gardé
+    parts = custom_id.split(":")
+    return f"{parts[0]}:{parts[2]}" if len(parts) > 2 else "inconnue"
+
+
+def _observe_ack(interaction: discord.Interaction) -> None:
+    kind = _ACK_KINDS.get(interaction.type)
+    if kind is None:
+        return
+    # Horloge de Discord (snowflake) : c'est elle qui applique la limite de 3 s
+    elapsed = time.time() - interaction.created_at.timestamp()
+    interaction_ack.observe(max(0.0, elapsed), kind, _view_name(interaction))
+
+
+def _instrument_ack(method):
+    @functools.wraps(method)
+    async def wrapper(self: discord.InteractionResponse, *args, **kwargs):
+        result = await method(self, *args, **kwargs)
+        _observe_ack(self._parent)
+        return result
+
+    wrapper.__metrics_wrapped__ = True
+    return wrapper
+
+
+# =========================================
+# MongoDB
+# =========================================
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Latence de chaque commande MongoDB (``find``, ``update``, ``bulkWrite``…)."""
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        mongo_duration.observe(event.duration_micros / 1e6, event.command_name)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        mongo_duration.observe(event.duration_micros / 1e6, event.command_name)
+        mongo_failures.inc(event.command_name)
+
+
+# =========================================
+# Jauges liées au bot
+# =========================================
+
+def _active_views(bot: discord.Client) -> dict[tuple, float]:
+    store = bot._connection._view_store
+    views = {id(item.view): item.view for items in store._views.values() for item in items.values() if item.view}
+    views.update((id(view), view) for view in store._synced_message_views.values())
+    counts: dict[tuple, float] = {}
+    for view in views.values():
+        if not view.is_finished():
+            key = (type(view).__name__,)
+            counts[key] = counts.get(key, 0) + 1
+    for modal in store._modals.values():
+        key = (type(modal).__name__,)
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def _gateway_latency(bot: discord.Client) -> dict[tuple, float]:
+    shards = getattr(bot, "shards", None)
+    if shards is not None:
+        latencies = {(str(shard_id),): info.latency for shard_id, info in shards.items()}
+    else:
+        latencies = {(str(bot.shard_id or 0),): bot.latency}
+    return {labels: value for labels, value in latencies.items() if math.isfinite(value)}
+
+
+def install(bot: discord.Client) -> None:
+    """Branche les mesures sur le bot (à appeler une fois, depuis ``setup_hook``)."""
+    for name in ACK_METHODS:
+        method = getattr(discord.InteractionResponse, name)
+        if not getattr(method, "__metrics_wrapped__", False):
+            setattr(discord.InteractionResponse, name, _instrument_ack(method))
+    bot.add_listener(_on_app_command_completion, "on_app_command_completion")
+    registry.register(Gauge("active_views", "Vues et modals actifs, par type.", ("view",),
+                            functools.partial(_active_views, bot)))
+    registry.register(Gauge("gateway_latency_seconds", "Latence de la passerelle Discord.", ("shard",),
+                            functools.partial(_gateway_latency, bot)))
+
+
+def render() -> str:
+    return registry.render()
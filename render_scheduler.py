@@ -0,0 +1,184 @@
+"""Planificateur d'éditions de messages tenant compte des limites de Discord.
+
+Une seule tâche par message envoie les éditions dans l'ordre. Les éditions
+en attente sont fusionnées (seul l'état le plus récent part), les éditions
+sans changement sont ignorées et chaque salon a son propre seau de jetons,
+calqué sur la limite de la route ``PATCH /channels/{channel_id}/messages/{id}``.
+"""
+
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Optional, Union
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+EditableMessage = Union[discord.Message, discord.PartialMessage]
+
+# Limite par salon des éditions de messages (5 éditions / 5 secondes)
+EDITS_PER_BUCKET: int = 5
+BUCKET_PERIOD: float = 5.0
+
+# Nombre de messages dont on garde le dernier rendu envoyé
+MAX_TRACKED_MESSAGES: int = 10_000
+
+# Nouvelles tentatives d'une édition refusée temporairement (429, erreur 5xx)
+MAX_RETRIES: int = 3
+
+
+class TokenBucket:
+    """Seau de jetons : ``rate`` éditions par ``per`` secondes."""
+
+    __slots__ = ("rate", "per", "tokens", "updated")
+
+    def __init__(self, rate: int = EDITS_PER_BUCKET, per: float = BUCKET_PERIOD):
+        self.rate = rate
+        self.per = per
+        self.tokens = float(rate)
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate / self.per)
+        self.updated = now
+
+    def wait_time(self) -> float:
+        """Secondes à attendre avant qu'un jeton soit disponible."""
+        self._refill()
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) * self.per / self.rate
+
+    def consume(self) -> None:
+        self.tokens -= 1
+
+    def block_for(self, seconds: float) -> None:
+        """Vide le seau suite à un 429 : aucun envoi pendant ``seconds``."""
+        self._refill()
+        self.tokens = -seconds * self.rate / self.per
+
+
+def _fingerprint(kwargs: dict[str, Any]) -> dict[str, Any]:
+    """Représentation comparable des arguments d'une édition."""
+    result: dict[str, Any] = {}
+    for key, value in kwargs.items():
+        if isinstance(value, discord.Embed):
+            result[key] = value.to_dict()
+        elif isinstance(value, discord.ui.View):
+            # Les vues sont reconstruites à chaque rendu : seuls les composants comptent
+            result[key] = value.to_components()
+        else:
+            result[key] = value
+    return result
+
+
+class RenderScheduler:
+    """File d'éditions par message, fusionnées et limitées par salon."""
+
+    def __init__(self, rate: int = EDITS_PER_BUCKET, per: float = BUCKET_PERIOD):
+        self.rate = rate
+        self.per = per
+        self._pending: dict[int, tuple[EditableMessage, dict[str, Any]]] = {}
+        self._workers: dict[int, asyncio.Task] = {}
+        self._sent: OrderedDict[int, dict[str, Any]] = OrderedDict()
+        self._buckets: dict[int, TokenBucket] = {}
+        self.stats: dict[str, int] = {"sent": 0, "coalesced": 0, "skipped": 0, "failed": 0}
+
+    def submit(self, message: EditableMessage, **kwargs: Any) -> None:
+        """Programme une édition ; remplace celle en attente pour le même message."""
+        key = message.id
+        pending = self._pending.get(key)
+        if pending is not None:
+            pending[1].update(kwargs)
+            self.stats["coalesced"] += 1
+        else:
+            self._pending[key] = (message, dict(kwargs))
+
+        if key not in self._workers:
+            self._workers[key] = asyncio.create_task(self._run(key, message.channel.id))
+
+    def discard(self, message: Optional[EditableMessage]) -> None:
+        """Oublie les éditions en attente d'un message modifié par un autre chemin.
+
+        À appeler avant ``interaction.response.edit_message`` pour qu'un ancien
+        rendu en attente n'écrase pas le nouveau.
+        """
+        if message is None:
+            return
+        if self._pending.pop(message.id, None) is not None:
+            self.stats["coalesced"] += 1
+        self._sent.pop(message.id, None)
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    def _bucket(self, channel_id: int) -> TokenBucket:
+        bucket = self._buckets.get(channel_id)
+        if bucket is None:
+            bucket = self._buckets[channel_id] = TokenBucket(self.rate, self.per)
+        return bucket
+
+    def _is_unchanged(self, key: int, fingerprint: dict[str, Any]) -> bool:
+        last = self._sent.get(key)
+        return last is not None and all(k in last and last[k] == v for k, v in fingerprint.items())
+
+    def _remember(self, key: int, fingerprint: dict[str, Any]) -> None:
+        last = self._sent.pop(key, {})
+        last.update(fingerprint)
+        self._sent[key] = last
+        while len(self._sent) > MAX_TRACKED_MESSAGES:
+            self._sent.popitem(last=False)
+
+    async def _run(self, key: int, channel_id: int) -> None:
+        """Envoie les éditions d'un message une par une, jusqu'à épuisement."""
+        bucket = self._bucket(channel_id)
+        retries = 0
+        try:
+            while key in self._pending:
+                fingerprint = _fingerprint(self._pending[key][1])
+                if self._is_unchanged(key, fingerprint):
+                    del self._pending[key]
+                    self.stats["skipped"] += 1
+                    continue
+
+                wait = bucket.wait_time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                    continue  # l'état en attente a pu changer entre-temps
+
+                pending = self._pending.pop(key, None)
+                if pending is None:
+                    continue
+                message, kwargs = pending
+                bucket.consume()
+                try:
+                    await message.edit(**kwargs)
+                except discord.HTTPException as e:
+                    self.stats["failed"] += 1
+                    if e.status == 429:
+                        retry_after = float(getattr(e, "retry_after", 0) or self.per)
+                        bucket.block_for(retry_after)
+                    elif e.status >= 500:
+                        bucket.block_for(self.per / self.rate)
+                    logger.warning(f"Erreur en éditant le message {key} : {e}")
+                    if (e.status == 429 or e.status >= 500) and retries < MAX_RETRIES:
+                        # Sinon le message resterait sur un état périmé : on renvoie l'état
+                        # refusé, complété par les éditions arrivées entre-temps
+                        retries += 1
+                        newer = self._pending.get(key)
+                        self._pending[key] = (message, {**kwargs, **newer[1]} if newer else kwargs)
+                else:
+                    retries = 0
+                    self.stats["sent"] += 1
+                    self._remember(key, fingerprint)
+        except Exception:
+            logger.exception(f"Erreur inattendue du planificateur pour le message {key}")
+        finally:
+            self._workers.pop(key, None)
+
+
+scheduler = RenderScheduler()
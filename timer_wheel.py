@@ -0,0 +1,95 @@
+"""Roue temporelle : une seule tâche asyncio pour des milliers d'échéances.
+
+Chaque échéance (timestamp UNIX, tel que stocké dans MongoDB) est rangée
+dans la case ``int(échéance / tick) % slots`` d'une roue à ``slots`` cases.
+Programmer, reprogrammer ou annuler une échéance ne touche qu'un dictionnaire
+de case : O(1), sans objet ``TimerHandle`` par échéance ni tas à réordonner.
+Une tâche unique avance d'une case par ``tick`` et déclenche les échéances
+atteintes ; celles qui tombent plusieurs tours plus tard restent dans leur
+case jusqu'au bon tour. Une échéance se déclenche au plus un ``tick`` après
+son heure, jamais avant. La tâche s'arrête quand la roue est vide.
+"""
+
+import time
+import asyncio
+import logging
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+# Résolution (secondes) et nombre de cases : un tour couvre TICK * SLOTS secondes
+TICK: float = 1.0
+SLOTS: int = 512
+
+K = TypeVar("K", bound=Hashable)
+
+
+class TimerWheel(Generic[K]):
+    """Échéances indexées par clé ; ``callback(clé)`` est appelé à l'échéance."""
+
+    def __init__(self, callback: Callable[[K], None], tick: float = TICK, slots: int = SLOTS):
+        self.callback = callback
+        self.tick = tick
+        self.slots = slots
+        self.fired = 0
+        self._buckets: list[dict[K, float]] = [{} for _ in range(slots)]
+        self._where: dict[K, int] = {}
+        self._cursor = int(time.time() // tick)  # prochain tick à traiter
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._where
+
+    def schedule(self, key: K, when: float) -> None:
+        """Programme (ou reprogramme) l'échéance de ``key`` au timestamp ``when``."""
+        self.cancel(key)
+        if self._task is None or self._task.done():
+            self._cursor = int(time.time() // self.tick)
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="timer-wheel")
+        # Échéance déjà passée : déclenchée au prochain tick
+        slot = max(int(when // self.tick), self._cursor) % self.slots
+        self._buckets[slot][key] = when
+        self._where[key] = slot
+
+    def cancel(self, key: K) -> None:
+        slot = self._where.pop(key, None)
+        if slot is not None:
+            del self._buckets[slot][key]
+
+    def stop(self) -> None:
+        """Annule toutes les échéances et arrête la tâche."""
+        for bucket in self._buckets:
+            bucket.clear()
+        self._where.clear()
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def advance(self, now: float) -> int:
+        """Déclenche les échéances atteintes à ``now`` ; retourne leur nombre."""
+        due = int(now // self.tick)
+        # Après une longue pause, chaque case n'a besoin d'être parcourue qu'une fois
+        self._cursor = max(self._cursor, due - self.slots)
+        fired = 0
+        while self._cursor < due:
+            bucket = self._buckets[self._cursor % self.slots]
+            for key in [k for k, when in bucket.items() if when <= now]:
+                del bucket[key]
+                del self._where[key]
+                fired += 1
+                try:
+                    self.callback(key)
+                except Exception:
+                    logger.exception(f"❌ Échéance {key!r} : erreur dans le rappel.")
+            self._cursor += 1
+        self.fired += fired
+        return fired
+
+    async def _run(self) -> None:
+        while self._where:
+            now = time.time()
+            self.advance(now)
+            await asyncio.sleep((int(now // self.tick) + 1) * self.tick - now)